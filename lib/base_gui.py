@@ -196,12 +196,13 @@ class BaseAudioGUI:
         return self.process_manager.run_in_thread(target_func, args, kwargs)
     
     def build_ffmpeg_command(self, input_file, output_file, audio_filters=None, 
-                           video_filters=None, audio_codec='mp3', audio_bitrate='192k'):
+                           video_filters=None, audio_codec='mp3', audio_bitrate='192k',
+                           sample_rate=44100, codec_args=None):
         """Build FFmpeg command."""
         return self.process_manager.build_ffmpeg_command(
             self.get_ffmpeg_command(),
             input_file, output_file, audio_filters, video_filters,
-            audio_codec, audio_bitrate
+            audio_codec, audio_bitrate, sample_rate, codec_args=codec_args
         )
     
     def run_ffmpeg_command(self, cmd):
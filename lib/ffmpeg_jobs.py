@@ -0,0 +1,718 @@
+"""
+Parallel ffmpeg batch jobs, incremental batch manifests and speed/pitch
+filters for the audio tools.
+
+Copyright 2025 Andre Lorbach
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .video_utils import probe_sample_rate, resolve_ffprobe_cmd
+
+DEFAULT_JOB_WORKERS = max(1, os.cpu_count() or 1)
+MAX_JOB_WORKERS = max(32, DEFAULT_JOB_WORKERS)
+DEFAULT_JOB_TIMEOUT_S = 30 * 60
+DEFAULT_SAMPLE_RATE = 44100
+BATCH_MANIFEST_FILE = ".batch_manifest.json"
+MANIFEST_SAVE_INTERVAL_S = 5.0
+
+SPEED_RANGE = (-50.0, 100.0)
+PITCH_RANGE = (-12.0, 12.0)
+DEFAULT_VARIANT_SET = "-10:0, 10:0, 0:-1, 0:+1"  # Same as the Quick Preset buttons
+
+# Audio conversion targets shared by the MP3/WAV to FLAC converter, the
+# unified app's download pipeline and yt-dlp audio extraction
+AUDIO_TARGET_FORMATS = ('FLAC', 'WAV', 'MP3')
+TARGET_SAMPLE_RATE = 44100
+TARGET_CHANNELS = 2
+FLAC_COMPRESSION_LEVEL = 5
+MP3_TARGET_BITRATE = '320k'
+# Target format -> ffmpeg codec name of an input that can be stream-copied into it
+AUDIO_TARGET_CODECS = {'FLAC': 'flac', 'WAV': 'pcm_s16le', 'MP3': 'mp3'}
+AUDIO_TARGET_EXTENSIONS = {'FLAC': '.flac', 'WAV': '.wav', 'MP3': '.mp3'}
+# Encoder arguments per target; the MP3 bitrate is chosen by the caller
+AUDIO_TARGET_CODEC_ARGS = {
+    'FLAC': ['-acodec', 'flac', '-compression_level', str(FLAC_COMPRESSION_LEVEL)],
+    'WAV': ['-acodec', 'pcm_s16le'],
+    'MP3': ['-acodec', 'libmp3lame'],
+}
+
+JobResult = Dict[str, Any]
+Variant = Tuple[float, float, str]  # (speed_percent, pitch_semitones, audio_bitrate)
+
+_TIME_RE = re.compile(r'time=\s*(\d+):(\d{2}):(\d{2}(?:\.\d+)?)')
+
+
+def _subprocess_flags():
+    return subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+
+
+def _atempo_chain(factor: float) -> List[str]:
+    """atempo filters for factor, each kept within atempo's 0.5-2.0 range."""
+    filters = []
+    while factor > 2.0:
+        filters.append("atempo=2.0")
+        factor /= 2.0
+    while factor < 0.5:
+        filters.append("atempo=0.5")
+        factor /= 0.5
+    if abs(factor - 1.0) > 1e-9:
+        filters.append(f"atempo={factor:.6g}")
+    return filters
+
+
+def speed_pitch_filters(
+    speed_percent: float,
+    pitch_semitones: float,
+    source_rate: int = DEFAULT_SAMPLE_RATE,
+    output_rate: Optional[int] = None,
+    rubberband: bool = False,
+) -> List[str]:
+    """
+    ffmpeg audio filters for the Audio Modifier speed (tempo) and pitch settings.
+
+    Without rubberband the pitch is shifted by relabelling the sample rate
+    (asetrate at the real source rate) and resampling back; the tempo change
+    that causes is compensated in the same atempo chain as the speed setting.
+    Pass output_rate when the encoder will write a different rate than the
+    source, so the one resample goes straight to it. With rubberband no
+    resampling happens at all.
+    """
+    output_rate = output_rate or source_rate
+    speed_factor = 1.0 + (speed_percent / 100.0)
+    pitch_factor = 2 ** (pitch_semitones / 12.0)
+    filters = []
+
+    if pitch_semitones != 0 and rubberband:
+        filters.append(f"rubberband=pitch={pitch_factor:.6g}")
+        filters.extend(_atempo_chain(speed_factor))
+    elif pitch_semitones != 0:
+        filters.append(f"asetrate={round(source_rate * pitch_factor)}")
+        filters.append(f"aresample={output_rate}")
+        filters.extend(_atempo_chain(speed_factor / pitch_factor))
+    else:
+        filters.extend(_atempo_chain(speed_factor))
+
+    return filters
+
+
+def speed_pitch_suffix(speed_percent: float, pitch_semitones: float) -> str:
+    """Output filename suffix describing a speed/pitch change, e.g. '_speed+10pct_pitch-1st'."""
+    suffix_parts = []
+    if speed_percent != 0:
+        suffix_parts.append(f"speed{speed_percent:+.0f}pct")
+    if pitch_semitones != 0:
+        suffix_parts.append(f"pitch{pitch_semitones:+.0f}st")
+
+    return "_" + "_".join(suffix_parts) if suffix_parts else "_modified"
+
+
+class PitchEngine:
+    """Probe-driven speed/pitch filters for one ffmpeg build.
+
+    Reads each input's real sample rate with ffprobe (cached per path) and
+    detects once whether the build includes the rubberband filter.
+    """
+
+    def __init__(self, ffmpeg_path: str, use_rubberband: bool = True):
+        self.ffmpeg_path = ffmpeg_path
+        self.ffprobe_path = resolve_ffprobe_cmd(ffmpeg_path)
+        self._lock = threading.Lock()
+        self._rates: Dict[str, Optional[int]] = {}
+        self.rubberband = use_rubberband and self._has_filter('rubberband')
+
+    def _has_filter(self, name: str) -> bool:
+        try:
+            result = subprocess.run(
+                [self.ffmpeg_path, '-hide_banner', '-filters'],
+                capture_output=True, text=True, encoding='utf-8', errors='replace',
+                creationflags=_subprocess_flags(), timeout=30,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        return any(len(line.split()) > 1 and line.split()[1] == name for line in (result.stdout or '').splitlines())
+
+    @property
+    def name(self) -> str:
+        return "rubberband" if self.rubberband else "asetrate (sample-rate aware)"
+
+    def sample_rate(self, input_file: str) -> Optional[int]:
+        """Sample rate of input_file's first audio stream, or None if it cannot be probed."""
+        with self._lock:
+            if input_file in self._rates:
+                return self._rates[input_file]
+        rate = probe_sample_rate(self.ffmpeg_path, input_file, self.ffprobe_path)
+        with self._lock:
+            self._rates[input_file] = rate
+        return rate
+
+    def prefetch(self, input_files: Sequence[str], max_workers: int = DEFAULT_JOB_WORKERS) -> None:
+        """Probe many files in parallel so building a batch does not wait on them one by one."""
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='ffprobe') as pool:
+            list(pool.map(self.sample_rate, input_files))
+
+    def filters(
+        self,
+        input_file: str,
+        speed_percent: float,
+        pitch_semitones: float,
+        output_rate: Optional[int] = None,
+    ) -> Tuple[List[str], int]:
+        """
+        Filters for input_file and the sample rate to encode at.
+
+        The output keeps the source rate unless output_rate is given, so no
+        resample is added beyond the one asetrate needs.
+        """
+        if pitch_semitones == 0 and output_rate:
+            # Tempo-only chains do not depend on the source rate
+            return speed_pitch_filters(speed_percent, 0), output_rate
+        source_rate = self.sample_rate(input_file) or DEFAULT_SAMPLE_RATE
+        rate = output_rate or source_rate
+        return speed_pitch_filters(speed_percent, pitch_semitones, source_rate, rate, self.rubberband), rate
+
+
+def parse_variant_set(text: str, default_bitrate: str) -> List[Variant]:
+    """
+    Parse a variant set like "-10:0, 10:0, 0:-1:320k" (speed%:pitch[:bitrate]).
+
+    Raises:
+        ValueError: with a user-facing message for malformed or out-of-range entries
+    """
+    variants: List[Variant] = []
+    for entry in (text or '').replace(';', ',').split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        parts = [p.strip() for p in entry.split(':')]
+        if len(parts) not in (2, 3):
+            raise ValueError(f"Invalid variant '{entry}' (expected speed:pitch or speed:pitch:bitrate)")
+        try:
+            speed_percent = float(parts[0])
+            pitch_semitones = float(parts[1])
+        except ValueError:
+            raise ValueError(f"Invalid speed or pitch in variant '{entry}'")
+        if not SPEED_RANGE[0] <= speed_percent <= SPEED_RANGE[1]:
+            raise ValueError(f"Speed in variant '{entry}' must be between -50% and +100%")
+        if not PITCH_RANGE[0] <= pitch_semitones <= PITCH_RANGE[1]:
+            raise ValueError(f"Pitch in variant '{entry}' must be between -12 and +12 semitones")
+        bitrate = parts[2] if len(parts) == 3 and parts[2] else default_bitrate
+        if not re.fullmatch(r'\d+k', bitrate):
+            raise ValueError(f"Invalid bitrate in variant '{entry}' (e.g. 192k)")
+        variant = (speed_percent, pitch_semitones, bitrate)
+        if variant not in variants:
+            variants.append(variant)
+    if not variants:
+        raise ValueError("Enter at least one variant (speed:pitch)")
+    return variants
+
+
+def variant_output_paths(input_file: str, variants: Sequence[Variant], output_folder: str) -> List[str]:
+    """Output path per variant using the speed/pitch suffix; the bitrate is appended only when needed to keep names unique."""
+    stem, extension = os.path.splitext(os.path.basename(input_file))
+    suffixes = [speed_pitch_suffix(speed, pitch) for speed, pitch, _ in variants]
+    paths = []
+    for (speed, pitch, bitrate), suffix in zip(variants, suffixes):
+        if suffixes.count(suffix) > 1:
+            suffix = f"{suffix}_{bitrate}"
+        paths.append(os.path.join(output_folder, f"{stem}{suffix}{extension}"))
+    return paths
+
+
+def build_variant_command(
+    ffmpeg_path: str,
+    input_file: str,
+    variants: Sequence[Variant],
+    output_files: Sequence[str],
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    channels: int = 2,
+    rubberband: bool = False,
+) -> List[str]:
+    """
+    One ffmpeg command that decodes input_file once and writes every variant.
+
+    The decoded audio is fanned out with ``asplit``; each branch gets its own
+    speed/pitch chain and encoder settings. sample_rate is the source rate,
+    which every output keeps.
+    """
+    count = len(variants)
+    graph = []
+    if count > 1:
+        graph.append(f"[0:a]asplit={count}" + ''.join(f"[s{i}]" for i in range(count)))
+        sources = [f"[s{i}]" for i in range(count)]
+    else:
+        sources = ["[0:a]"]
+    for i, (speed, pitch, _) in enumerate(variants):
+        chain = ','.join(speed_pitch_filters(speed, pitch, sample_rate, sample_rate, rubberband)) or 'anull'
+        graph.append(f"{sources[i]}{chain}[v{i}]")
+
+    cmd = [ffmpeg_path, '-y', '-i', str(input_file), '-filter_complex', ';'.join(graph)]
+    for i, ((_, _, bitrate), output_file) in enumerate(zip(variants, output_files)):
+        cmd.extend([
+            '-map', f"[v{i}]",
+            '-vn',
+            '-ar', str(sample_rate),
+            '-ac', str(channels),
+            '-b:a', bitrate,
+            str(output_file),
+        ])
+    return cmd
+
+
+def parse_output_seconds(stderr: str) -> Optional[float]:
+    """Duration of audio written, from the last ``time=`` of ffmpeg's stats output."""
+    matches = _TIME_RE.findall(stderr or '')
+    if not matches:
+        return None
+    hours, minutes, seconds = matches[-1]
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def batch_throughput(results: Sequence[JobResult], elapsed: float) -> Dict[str, float]:
+    """Aggregate throughput of finished jobs: files/min and audio seconds per wall second."""
+    done = [r for r in results if r.get('ok')]
+    audio_seconds = sum(r.get('media_seconds') or 0.0 for r in done)
+    elapsed = max(elapsed, 1e-6)
+    return {
+        'files': len(done),
+        'elapsed': elapsed,
+        'files_per_min': len(done) * 60.0 / elapsed,
+        'audio_seconds': audio_seconds,
+        'audio_seconds_per_s': audio_seconds / elapsed,
+    }
+
+
+def format_throughput(stats: Dict[str, float]) -> str:
+    """e.g. '12 files in 45.2s: 15.9 files/min, 38.1 audio-s/s'"""
+    text = f"{stats['files']} files in {stats['elapsed']:.1f}s: {stats['files_per_min']:.1f} files/min"
+    if stats['audio_seconds']:
+        text += f", {stats['audio_seconds_per_s']:.1f} audio-s/s"
+    return text
+
+
+def _job_outputs(job: Dict[str, Any]) -> List[str]:
+    output = job.get('output')
+    return list(output) if isinstance(output, (list, tuple)) else [output]
+
+
+def input_fingerprint(path: str) -> Optional[Dict[str, int]]:
+    """Size and modification time of path, or None if it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def job_settings_hash(job: Dict[str, Any]) -> str:
+    """
+    Hash of everything in a job's ffmpeg command except the executable and the file paths.
+
+    Any change to codec, bitrate, filters, sample rate or trim length gives a
+    different hash, without each tool having to list its settings.
+    """
+    paths = {str(job['input']): '{input}'}
+    for output in _job_outputs(job):
+        paths[str(output)] = '{output}'
+    args = [paths.get(str(arg), str(arg)) for arg in list(job['cmd'])[1:]]
+    return hashlib.sha256(json.dumps(args).encode('utf-8')).hexdigest()
+
+
+class BatchManifest:
+    """Sidecar record of finished batch jobs for incremental re-runs.
+
+    One JSON file per output folder maps each output file name to the input
+    fingerprint (size, mtime) and settings hash it was produced from. A job
+    is skipped while its input is unchanged, its settings hash matches and
+    every output still exists with the recorded size. Writes are batched;
+    call ``flush`` when a batch finishes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._folders: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._dirty = set()
+        self._last_save = time.monotonic()
+
+    def _entries(self, folder: str) -> Dict[str, Dict[str, Any]]:
+        if folder not in self._folders:
+            entries: Dict[str, Dict[str, Any]] = {}
+            try:
+                with open(os.path.join(folder, BATCH_MANIFEST_FILE), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    entries = data
+            except (OSError, ValueError):
+                pass
+            self._folders[folder] = entries
+        return self._folders[folder]
+
+    def _save(self) -> None:
+        for folder in self._dirty:
+            path = os.path.join(folder, BATCH_MANIFEST_FILE)
+            tmp_path = path + '.tmp'
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._folders[folder], f, indent=1)
+                os.replace(tmp_path, path)
+            except OSError:
+                pass
+        self._dirty = set()
+        self._last_save = time.monotonic()
+
+    @staticmethod
+    def _key(job: Dict[str, Any]) -> Tuple[str, str]:
+        first = os.path.abspath(_job_outputs(job)[0])
+        return os.path.dirname(first), os.path.basename(first)
+
+    def is_current(self, job: Dict[str, Any]) -> bool:
+        """True if the job's outputs are up to date for its input and settings."""
+        folder, name = self._key(job)
+        with self._lock:
+            entry = self._entries(folder).get(name)
+        if not entry:
+            return False
+        if entry.get('input') != os.path.abspath(job['input']):
+            return False
+        if entry.get('fingerprint') != input_fingerprint(job['input']):
+            return False
+        if entry.get('settings') != job_settings_hash(job):
+            return False
+        for output in _job_outputs(job):
+            try:
+                if os.path.getsize(output) != entry.get('outputs', {}).get(os.path.basename(output)):
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def split(self, jobs: Sequence[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Partition jobs into (pending, unchanged)."""
+        pending, unchanged = [], []
+        for job in jobs:
+            (unchanged if self.is_current(job) else pending).append(job)
+        return pending, unchanged
+
+    def record(self, job: Dict[str, Any]) -> None:
+        """Remember a successfully finished job."""
+        fingerprint = input_fingerprint(job['input'])
+        try:
+            outputs = {os.path.basename(o): os.path.getsize(o) for o in _job_outputs(job)}
+        except OSError:
+            return
+        if fingerprint is None:
+            return
+        entry = {
+            'input': os.path.abspath(job['input']),
+            'fingerprint': fingerprint,
+            'settings': job_settings_hash(job),
+            'outputs': outputs,
+            'completed_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        folder, name = self._key(job)
+        with self._lock:
+            self._entries(folder)[name] = entry
+            self._dirty.add(folder)
+            if time.monotonic() - self._last_save >= MANIFEST_SAVE_INTERVAL_S:
+                self._save()
+
+    def flush(self) -> None:
+        """Write pending entries to disk."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+
+class FFmpegJobExecutor:
+    """Run a batch of ffmpeg commands on a bounded pool of worker threads.
+
+    Every job is its own ffmpeg process, so ``max_workers`` jobs keep that
+    many cores busy (a single FLAC/MP3 encode is effectively single-threaded).
+    A job that runs longer than ``timeout`` seconds is killed. ``cancel``
+    stops queued jobs and terminates the running ffmpeg processes.
+
+    Results are plain dicts with index, input, output, ok, error, seconds,
+    media_seconds (audio written, parsed from ffmpeg's stats), timed_out and
+    cancelled. ``on_result`` is called in submission order so logs read like
+    a sequential run; ``on_progress`` is called as soon as any job finishes.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_JOB_WORKERS, timeout: Optional[float] = DEFAULT_JOB_TIMEOUT_S):
+        self.max_workers = max(1, int(max_workers))
+        self.timeout = timeout if timeout and timeout > 0 else None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._processes = set()
+        self.started = None  # time.monotonic() when run() started
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        """Skip jobs that have not started and terminate running ffmpeg processes."""
+        self._cancel.set()
+        with self._lock:
+            processes = list(self._processes)
+        for process in processes:
+            try:
+                process.terminate()
+            except OSError:
+                pass
+
+    def _run_command(self, cmd: Sequence[str]) -> JobResult:
+        started = time.monotonic()
+        result = {'ok': False, 'error': '', 'timed_out': False, 'cancelled': False}
+        process = subprocess.Popen(
+            list(cmd),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            creationflags=_subprocess_flags(),
+        )
+        with self._lock:
+            self._processes.add(process)
+        try:
+            try:
+                _, stderr = process.communicate(timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                _, stderr = process.communicate()
+                result['timed_out'] = True
+        finally:
+            with self._lock:
+                self._processes.discard(process)
+
+        result['seconds'] = time.monotonic() - started
+        result['media_seconds'] = parse_output_seconds(stderr)
+        if self.cancelled:
+            result['cancelled'] = True
+            result['error'] = 'Cancelled'
+        elif result['timed_out']:
+            result['error'] = f"Timed out after {self.timeout:.0f}s"
+        elif process.returncode == 0:
+            result['ok'] = True
+        else:
+            result['error'] = (stderr or 'Unknown error').strip()[-500:]
+        return result
+
+    def elapsed(self) -> float:
+        """Wall time since run() started."""
+        return time.monotonic() - self.started if self.started is not None else 0.0
+
+    def run(
+        self,
+        jobs: Sequence[Dict[str, Any]],
+        on_result: Optional[Callable[[JobResult, int], None]] = None,
+        on_progress: Optional[Callable[[int, int, List[JobResult]], None]] = None,
+    ) -> List[JobResult]:
+        """
+        Run jobs and wait for all of them.
+
+        Args:
+            jobs: dicts with 'cmd' (ffmpeg command list), 'input' and 'output'
+                (a path, or a list of paths for multi-output commands)
+            on_result: called as (result, total) in job order
+            on_progress: called as (finished_count, total, results so far) when any job ends
+
+        Returns:
+            list of results in job order
+        """
+        total = len(jobs)
+        self.started = time.monotonic()
+        results: List[Optional[JobResult]] = [None] * total
+        state = {'finished': 0, 'next': 0}
+
+        def run_job(index: int) -> None:
+            job = jobs[index]
+            base = {'index': index, 'input': job.get('input'), 'output': job.get('output')}
+            if self.cancelled:
+                result = dict(base, ok=False, error='Cancelled', seconds=0.0, media_seconds=None, timed_out=False, cancelled=True)
+            else:
+                try:
+                    result = dict(base, **self._run_command(job['cmd']))
+                except Exception as e:
+                    result = dict(base, ok=False, error=str(e), seconds=0.0, media_seconds=None, timed_out=False, cancelled=False)
+
+            # Emit in job order: flush every consecutive result that is ready
+            with self._lock:
+                results[index] = result
+                state['finished'] += 1
+                finished = state['finished']
+                done = [r for r in results if r is not None]
+                ready = []
+                while state['next'] < total and results[state['next']] is not None:
+                    ready.append(results[state['next']])
+                    state['next'] += 1
+                if on_result:
+                    for item in ready:
+                        on_result(item, total)
+            if on_progress:
+                on_progress(finished, total, done)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, max(1, total)), thread_name_prefix='ffmpeg-job') as pool:
+            for index in range(total):
+                pool.submit(run_job, index)
+
+        return [r for r in results if r is not None]
+
+
+def create_job_executor(workers: Any, timeout: Optional[float] = None) -> FFmpegJobExecutor:
+    """Executor for a worker count typed in the UI; invalid values fall back to DEFAULT_JOB_WORKERS."""
+    try:
+        max_workers = max(1, min(MAX_JOB_WORKERS, int(workers)))
+    except (ValueError, TypeError):
+        max_workers = DEFAULT_JOB_WORKERS
+    return FFmpegJobExecutor(max_workers=max_workers, timeout=timeout)
+
+
+def prepare_pitch_engine(
+    ffmpeg_path: str, use_rubberband: bool, input_files: Sequence[str], max_workers: int = DEFAULT_JOB_WORKERS
+) -> PitchEngine:
+    """Pitch engine for a batch, with every input's sample rate probed up front."""
+    engine = PitchEngine(ffmpeg_path, use_rubberband)
+    engine.prefetch(input_files, max_workers)
+    return engine
+
+
+def speed_pitch_jobs(
+    input_files: Sequence[str],
+    output_folder: str,
+    speed_percent: float,
+    pitch_semitones: float,
+    engine: PitchEngine,
+    build_command: Callable[[str, str, List[str], int], List[str]],
+) -> List[Dict[str, Any]]:
+    """
+    One job per input file for a single speed/pitch setting.
+
+    build_command(input_file, output_file, audio_filters, sample_rate)
+    returns the ffmpeg command, so each tool keeps its own encoder options.
+    """
+    suffix = speed_pitch_suffix(speed_percent, pitch_semitones)
+    jobs = []
+    for input_file in input_files:
+        stem, extension = os.path.splitext(os.path.basename(input_file))
+        output_file = os.path.join(output_folder, f"{stem}{suffix}{extension}")
+        # Keep the source rate so the only resample is the one asetrate needs
+        filters, sample_rate = engine.filters(input_file, speed_percent, pitch_semitones)
+        jobs.append({
+            'input': input_file,
+            'output': output_file,
+            'cmd': build_command(input_file, output_file, filters, sample_rate),
+        })
+    return jobs
+
+
+def variant_set_jobs(
+    ffmpeg_path: str,
+    input_files: Sequence[str],
+    variants: Sequence[Variant],
+    output_folder: str,
+    engine: PitchEngine,
+) -> List[Dict[str, Any]]:
+    """One job per input file that renders every variant from a single decode."""
+    jobs = []
+    for input_file in input_files:
+        output_files = variant_output_paths(input_file, variants, output_folder)
+        source_rate = engine.sample_rate(input_file) or DEFAULT_SAMPLE_RATE
+        jobs.append({
+            'input': input_file,
+            'output': output_files,
+            'cmd': build_variant_command(ffmpeg_path, input_file, variants, output_files,
+                                         sample_rate=source_rate, rubberband=engine.rubberband),
+        })
+    return jobs
+
+
+def run_modification_jobs(
+    executor: FFmpegJobExecutor,
+    jobs: Sequence[Dict[str, Any]],
+    incremental: bool,
+    log: Callable[[str], None],
+    on_progress: Optional[Callable[[int, int, float], None]] = None,
+) -> Dict[str, int]:
+    """
+    Run speed/pitch jobs for the Audio Modifier tools and log them in queue order.
+
+    With incremental, jobs whose outputs are current in the batch manifest
+    are skipped. log(message) and on_progress(finished, total, files_per_min)
+    are called from worker threads; callers marshal them to the UI thread.
+
+    Returns:
+        dict with succeeded, failed, cancelled and skipped counts
+    """
+    manifest = None
+    skipped_count = 0
+    if incremental:
+        manifest = BatchManifest()
+        jobs, unchanged = manifest.split(jobs)
+        skipped_count = len(unchanged)
+        for job in unchanged:
+            log(f"[INFO] Unchanged, skipped: {os.path.basename(job['input'])}")
+    if on_progress:
+        on_progress(0, len(jobs), 0.0)
+
+    def on_result(result: JobResult, total: int) -> None:
+        name = os.path.basename(result['input'])
+        if result['ok'] and manifest is not None:
+            manifest.record(jobs[result['index']])
+        if result['ok']:
+            outputs = result['output'] if isinstance(result['output'], list) else [result['output']]
+            saved = ", ".join(os.path.basename(out) for out in outputs)
+            log(f"[SUCCESS] ({result['index'] + 1}/{total}) Saved: {saved} ({result['seconds']:.1f}s)")
+        elif result['cancelled']:
+            log(f"[INFO] ({result['index'] + 1}/{total}) Cancelled: {name}")
+        else:
+            log(f"[ERROR] ({result['index'] + 1}/{total}) Modification failed for {name}: {result['error'][-200:]}")
+
+    def report_progress(finished: int, total: int, done: List[JobResult]) -> None:
+        on_progress(finished, total, batch_throughput(done, executor.elapsed())['files_per_min'])
+
+    try:
+        results = executor.run(jobs, on_result=on_result, on_progress=report_progress if on_progress else None)
+    except Exception as e:
+        log(f"[ERROR] Exception: {e}")
+        results = []
+    if manifest is not None:
+        manifest.flush()
+
+    counts = {
+        'succeeded': sum(1 for r in results if r['ok']),
+        'cancelled': sum(1 for r in results if r['cancelled']),
+        'skipped': skipped_count,
+    }
+    counts['failed'] = len(results) - counts['succeeded'] - counts['cancelled']
+
+    log(f"[INFO] Throughput: {format_throughput(batch_throughput(results, executor.elapsed()))}")
+    if executor.cancelled:
+        log(f"\n[CANCELLED] Modification stopped: {counts['succeeded']} succeeded, "
+            f"{counts['failed']} failed, {counts['cancelled']} cancelled")
+    else:
+        log(f"\n[COMPLETE] Modification finished: {counts['succeeded']} succeeded, "
+            f"{counts['failed']} failed, {counts['skipped']} skipped (unchanged)")
+    return counts
@@ -121,7 +121,7 @@ class ProcessManager:
     def build_ffmpeg_command(self, ffmpeg_path, input_file, output_file, 
                            audio_filters=None, video_filters=None, 
                            audio_codec='mp3', audio_bitrate='192k',
-                           sample_rate=44100, channels=2):
+                           sample_rate=44100, channels=2, codec_args=None):
         """
         Build FFmpeg command for audio/video processing.
         
@@ -135,6 +135,7 @@ class ProcessManager:
             audio_bitrate: Audio bitrate
             sample_rate: Sample rate
             channels: Number of channels
+            codec_args: Extra encoder arguments placed before the output file
             
         Returns:
             list: FFmpeg command as list of strings
@@ -157,6 +158,10 @@ class ProcessManager:
             '-ar', str(sample_rate),
             '-ac', str(channels),
             '-b:a', audio_bitrate,
+        ])
+        if codec_args:
+            cmd.extend(codec_args)
+        cmd.extend([
             '-y',  # Overwrite output file
             str(output_file)
         ])
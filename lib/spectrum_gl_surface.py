@@ -8,6 +8,7 @@ Licensed under the Apache License, Version 2.0.
 
 from __future__ import annotations
 
+import ctypes
 import math
 import sys
 import time
@@ -48,7 +49,10 @@ try:
         glLineWidth,
         glLoadIdentity,
         glMatrixMode,
+        glPopMatrix,
+        glPushMatrix,
         glShadeModel,
+        glTranslatef,
         glVertex3f,
         glVertexPointer,
         glViewport,
@@ -62,6 +66,26 @@ try:
 except ImportError:
     pass
 
+VBO_AVAILABLE = False
+
+if GL_AVAILABLE:
+    try:
+        from OpenGL.GL import (
+            GL_ARRAY_BUFFER,
+            GL_DYNAMIC_DRAW,
+            GL_ELEMENT_ARRAY_BUFFER,
+            GL_STATIC_DRAW,
+            glBindBuffer,
+            glBufferData,
+            glBufferSubData,
+            glDeleteBuffers,
+            glGenBuffers,
+        )
+
+        VBO_AVAILABLE = True
+    except ImportError:
+        pass
+
 # Center tone: ignore energy above this when finding centroid (reduces HF scroll jitter).
 _CENTER_TONE_MAX_HZ = 3200.0
 _CENTER_TONE_WIN_COLS = 12
@@ -112,23 +136,14 @@ def _build_triangle_indices(nr_e: int, nc_e: int) -> np.ndarray:
     quads_j = nc_e - 1
     if quads_i < 1 or quads_j < 1:
         return np.zeros(0, dtype=np.uint32)
-    ntri = quads_i * quads_j * 6
-    out = np.empty(ntri, dtype=np.uint32)
-    t = 0
-    for a in range(quads_i):
-        for b in range(quads_j):
-            i00 = a * nc_e + b
-            i10 = (a + 1) * nc_e + b
-            i01 = a * nc_e + b + 1
-            i11 = (a + 1) * nc_e + b + 1
-            out[t] = i00
-            out[t + 1] = i10
-            out[t + 2] = i01
-            out[t + 3] = i10
-            out[t + 4] = i11
-            out[t + 5] = i01
-            t += 6
-    return out
+    a = np.arange(quads_i, dtype=np.uint32)[:, np.newaxis]
+    b = np.arange(quads_j, dtype=np.uint32)[np.newaxis, :]
+    i00 = a * nc_e + b
+    i10 = (a + 1) * nc_e + b
+    i01 = i00 + 1
+    i11 = i10 + 1
+    out = np.stack([i00, i10, i01, i10, i11, i01], axis=-1)
+    return np.ascontiguousarray(out.reshape(-1), dtype=np.uint32)
 
 
 if GL_AVAILABLE:
@@ -163,17 +178,36 @@ if GL_AVAILABLE:
             self._sx = 2.25
             self._sy = 1.15
             self._sz = 0.6
-            self._row_idx = subsample_axis(nr, mesh_stride)
-            self._col_idx = subsample_axis(nc, mesh_stride)
+            # Time columns live in a ring of slots (one slot per sampled column,
+            # slot = (abs_col // stride) % n_slots) stored slot-major, so a new
+            # column only rewrites its own slot. Slot n_slots mirrors slot 0 so
+            # the wrap-around quads can be drawn from one contiguous index run.
+            self._stride = max(1, int(mesh_stride))
+            self._row_idx = subsample_axis(nr, self._stride)
             self._nr_e = len(self._row_idx)
-            self._nc_e = len(self._col_idx)
-            nv = self._nr_e * self._nc_e
+            self._n_slots = max(1, -(-nc // self._stride))
+            nv = (self._n_slots + 1) * self._nr_e
             self._verts = np.zeros((nv, 3), dtype=np.float32)
             self._colors = np.zeros((nv, 3), dtype=np.float32)
-            self._indices = np.ascontiguousarray(
-                _build_triangle_indices(self._nr_e, self._nc_e), dtype=np.uint32
-            )
+            self._slot_verts = self._verts.reshape(self._n_slots + 1, self._nr_e, 3)
+            self._slot_colors = self._colors.reshape(self._n_slots + 1, self._nr_e, 3)
+            self._slot_abs = np.full(self._n_slots, -2, dtype=np.int64)
+            self._slot_zmin = np.zeros(self._n_slots, dtype=np.float32)
+            self._slot_zmax = np.zeros(self._n_slots, dtype=np.float32)
+            self._geom_key = None
+            self._y_lo = 0.0
+            self._y_hi = 0.0
+            self._indices = _build_triangle_indices(self._n_slots + 1, self._nr_e)
             self._ni = len(self._indices)
+            self._slot_ni = (self._nr_e - 1) * 6
+            self._draw_ranges = []
+            # GL-side buffers (vertices, colors, indices); None = client arrays.
+            self._vbo_ids = None
+            self._vbo_ok = VBO_AVAILABLE
+            self._vbo_stale = True
+            self._dirty_all = True
+            self._dirty_slots = []
+            self._bounds = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
             self._default_az = 0.62
             self._default_el = 0.28
             self._default_dist = 3.85
@@ -209,6 +243,9 @@ if GL_AVAILABLE:
             glDisable(GL_CULL_FACE)
             glShadeModel(GL_SMOOTH)
             self._use_glut_text = _ensure_glut_bitmap()
+            # pyopengltk calls initgl on map and resize, possibly with a fresh
+            # context, so buffers are (re)created lazily on the next redraw.
+            self._vbo_stale = True
 
         def _on_button1(self, event):
             try:
@@ -300,31 +337,93 @@ if GL_AVAILABLE:
             except Exception:
                 pass
 
-        def _update_mesh_from_gui(self):
-            spec = self._gui._spec
-            freqs = self._gui._disp_freqs
-            log_scale = bool(self._gui._log_scale_var.get())
-            track = bool(
-                getattr(self._gui, "_gl_track_tone_var", None)
-                and self._gui._gl_track_tone_var.get()
+        def _update_static_geometry(self, freqs, log_scale: bool):
+            key = (log_scale, self._nr, self._nc, self._stride)
+            if key == self._geom_key:
+                return
+            nc1 = max(self._nc - 1, 1)
+            x_slot = np.arange(self._n_slots + 1, dtype=np.float64) * (
+                self._stride / nc1 * self._sx
             )
-            sub = spec[np.ix_(self._row_idx, self._col_idx)].astype(np.float64, copy=False)
-            rng = self._vmax - self._vmin
-            if rng <= 1e-9:
-                t = np.zeros_like(sub)
-            else:
-                t = (sub - self._vmin) / rng
-            np.clip(t, 0.0, 1.0, out=t)
-            xc = (self._col_idx.astype(np.float64) / max(self._nc - 1, 1) - 0.5) * self._sx
-            x_grid = np.broadcast_to(xc, sub.shape).astype(np.float32)
             if log_scale:
                 fr = np.maximum(freqs[self._row_idx].astype(np.float64), self._f_min)
                 y_norm = (np.log10(fr) - math.log10(self._f_min)) / self._log_den
             else:
                 y_norm = self._row_idx.astype(np.float64) / max(self._nr - 1, 1)
             y_row = (y_norm - 0.5) * self._sy
-            y_grid = np.broadcast_to(y_row[:, np.newaxis], sub.shape).astype(np.float32)
-
+            self._slot_verts[:, :, 0] = x_slot[:, np.newaxis]
+            self._slot_verts[:, :, 1] = y_row[np.newaxis, :]
+            self._y_lo = float(y_row.min())
+            self._y_hi = float(y_row.max())
+            self._geom_key = key
+            self._dirty_all = True
+
+        def _update_columns(self, spec):
+            """Write only slots whose time column changed; return window layout."""
+            start = getattr(self._gui, "_view_abs_start", None)
+            width = getattr(self._gui, "_view_width", None)
+            if start is None or width is None:
+                # No history bookkeeping from the GUI: treat every frame as new data.
+                self._slot_abs.fill(-2)
+                start = 0
+                width = self._nc
+            stride = self._stride
+            a0 = -(-int(start) // stride) * stride
+            abs_cols = np.arange(a0, int(start) + self._nc, stride, dtype=np.int64)
+            if abs_cols.size == 0:
+                abs_cols = np.array([a0], dtype=np.int64)
+            slots = (abs_cols // stride) % self._n_slots
+            keys = np.where(abs_cols < int(start) + int(width), abs_cols, -1)
+            changed = np.nonzero(self._slot_abs[slots] != keys)[0]
+            if changed.size:
+                ch_slots = slots[changed]
+                live = keys[changed] >= 0
+                t = np.zeros((self._nr_e, changed.size), dtype=np.float64)
+                if np.any(live):
+                    cols = abs_cols[changed][live] - int(start)
+                    sub = spec[np.ix_(self._row_idx, cols)].astype(np.float64, copy=False)
+                    rng = self._vmax - self._vmin
+                    if rng > 1e-9:
+                        tl = (sub - self._vmin) / rng
+                        np.clip(tl, 0.0, 1.0, out=tl)
+                        t[:, live] = tl
+                tt = t.T
+                self._slot_verts[ch_slots, :, 2] = tt * self._sz
+                li = (tt * 255.999).astype(np.int32)
+                np.clip(li, 0, 255, out=li)
+                self._slot_colors[ch_slots] = self._lut[li]
+                self._slot_zmin[ch_slots] = tt.min(axis=1) * self._sz
+                self._slot_zmax[ch_slots] = tt.max(axis=1) * self._sz
+                self._slot_abs[ch_slots] = keys[changed]
+                self._dirty_slots.append(ch_slots)
+                if np.any(ch_slots == 0):
+                    self._slot_verts[self._n_slots, :, 2] = self._slot_verts[0, :, 2]
+                    self._slot_colors[self._n_slots] = self._slot_colors[0]
+                    self._dirty_slots.append(np.array([self._n_slots], dtype=np.int64))
+            return int(start), abs_cols, slots
+
+        def _update_draw_ranges(self, start: int, abs_cols, slots):
+            nc1 = max(self._nc - 1, 1)
+            m = len(abs_cols)
+            p0 = int(slots[0])
+            a0 = int(abs_cols[0])
+            x_a = ((a0 - p0 * self._stride - start) / nc1 - 0.5) * self._sx
+            last = p0 + m - 1
+            q = self._slot_ni
+            if last < self._n_slots:
+                ranges = [(p0 * q, (m - 1) * q, x_a)]
+            else:
+                ranges = [(p0 * q, (self._n_slots - p0) * q, x_a)]
+                tail = last - self._n_slots
+                if tail > 0:
+                    x_b = x_a + self._n_slots * self._stride / nc1 * self._sx
+                    ranges.append((0, tail * q, x_b))
+            self._draw_ranges = [r for r in ranges if r[1] > 0]
+            xm = ((a0 - start) / nc1 - 0.5) * self._sx
+            xM = ((int(abs_cols[-1]) - start) / nc1 - 0.5) * self._sx
+            return xm, xM
+
+        def _update_tone_shift(self, spec, freqs, log_scale: bool, track: bool):
             if track:
                 nw = min(_CENTER_TONE_WIN_COLS, spec.shape[1])
                 col = np.mean(spec[:, -nw:], axis=1).astype(np.float64, copy=False)
@@ -369,7 +468,6 @@ if GL_AVAILABLE:
                     _CENTER_TONE_DISPLAY_SMOOTH * self._track_y_display
                     + (1.0 - _CENTER_TONE_DISPLAY_SMOOTH) * self._track_y_smooth
                 )
-                y_shift = self._track_y_display
             else:
                 self._track_y_smooth *= 0.94
                 self._track_y_display *= 0.94
@@ -377,17 +475,144 @@ if GL_AVAILABLE:
                     self._track_y_smooth = 0.0
                 if abs(self._track_y_display) < 1e-4:
                     self._track_y_display = 0.0
-                y_shift = self._track_y_display
-            self._last_y_shift = float(y_shift)
-            y_grid = y_grid - np.float32(y_shift)
-
-            z_grid = (t * self._sz).astype(np.float32)
-            self._verts[:, 0] = x_grid.ravel()
-            self._verts[:, 1] = y_grid.ravel()
-            self._verts[:, 2] = z_grid.ravel()
-            li = (t * 255.999).astype(np.int32)
-            np.clip(li, 0, 255, out=li)
-            self._colors[:] = self._lut[li].reshape(-1, 3)
+            self._last_y_shift = float(self._track_y_display)
+
+        def _update_mesh_from_gui(self):
+            spec = self._gui._spec
+            freqs = self._gui._disp_freqs
+            log_scale = bool(self._gui._log_scale_var.get())
+            track = bool(
+                getattr(self._gui, "_gl_track_tone_var", None)
+                and self._gui._gl_track_tone_var.get()
+            )
+            self._update_static_geometry(freqs, log_scale)
+            start, abs_cols, slots = self._update_columns(spec)
+            xm, xM = self._update_draw_ranges(start, abs_cols, slots)
+            self._update_tone_shift(spec, freqs, log_scale, track)
+            ys = self._last_y_shift
+            self._bounds = (
+                xm,
+                xM,
+                self._y_lo - ys,
+                self._y_hi - ys,
+                float(self._slot_zmin[slots].min()),
+                float(self._slot_zmax[slots].max()),
+            )
+
+        def _release_vbos(self):
+            if self._vbo_ids is None:
+                return
+            try:
+                glDeleteBuffers(len(self._vbo_ids), self._vbo_ids)
+            except Exception:
+                pass
+            self._vbo_ids = None
+
+        def _create_vbos(self):
+            self._release_vbos()
+            ids = glGenBuffers(3)
+            ids = [int(i) for i in np.atleast_1d(ids)]
+            if len(ids) != 3 or not all(ids):
+                raise RuntimeError("glGenBuffers returned no buffers")
+            self._vbo_ids = ids
+            glBindBuffer(GL_ARRAY_BUFFER, ids[0])
+            glBufferData(GL_ARRAY_BUFFER, self._verts.nbytes, self._verts, GL_DYNAMIC_DRAW)
+            glBindBuffer(GL_ARRAY_BUFFER, ids[1])
+            glBufferData(GL_ARRAY_BUFFER, self._colors.nbytes, self._colors, GL_DYNAMIC_DRAW)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ids[2])
+            glBufferData(
+                GL_ELEMENT_ARRAY_BUFFER, self._indices.nbytes, self._indices, GL_STATIC_DRAW
+            )
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+        def _dirty_slot_runs(self):
+            """Merge the slots touched since the last upload into contiguous runs."""
+            if not self._dirty_slots:
+                return []
+            touched = np.unique(np.concatenate(self._dirty_slots))
+            breaks = np.nonzero(np.diff(touched) != 1)[0] + 1
+            return [(int(r[0]), int(r[-1]) + 1) for r in np.split(touched, breaks)]
+
+        def _upload_dirty_slots(self):
+            if self._dirty_all:
+                runs = [(0, self._n_slots + 1)]
+            else:
+                runs = self._dirty_slot_runs()
+            self._dirty_all = False
+            self._dirty_slots = []
+            if not runs:
+                return
+            slot_bytes = self._nr_e * 3 * 4
+            for buf, data in ((self._vbo_ids[0], self._slot_verts), (self._vbo_ids[1], self._slot_colors)):
+                glBindBuffer(GL_ARRAY_BUFFER, buf)
+                for lo, hi in runs:
+                    chunk = np.ascontiguousarray(data[lo:hi])
+                    glBufferSubData(GL_ARRAY_BUFFER, lo * slot_bytes, chunk.nbytes, chunk)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+        def _draw_surface_vbo(self):
+            if self._vbo_stale or self._vbo_ids is None:
+                self._create_vbos()
+                self._vbo_stale = False
+                self._dirty_all = False
+                self._dirty_slots = []
+            else:
+                self._upload_dirty_slots()
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glEnableClientState(GL_COLOR_ARRAY)
+            try:
+                glBindBuffer(GL_ARRAY_BUFFER, self._vbo_ids[0])
+                glVertexPointer(3, GL_FLOAT, 0, None)
+                glBindBuffer(GL_ARRAY_BUFFER, self._vbo_ids[1])
+                glColorPointer(3, GL_FLOAT, 0, None)
+                glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self._vbo_ids[2])
+                for first, count, x_off in self._draw_ranges:
+                    glPushMatrix()
+                    glTranslatef(x_off, -self._last_y_shift, 0.0)
+                    glDrawElements(
+                        GL_TRIANGLES, count, GL_UNSIGNED_INT, ctypes.c_void_p(first * 4)
+                    )
+                    glPopMatrix()
+            finally:
+                glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+                glBindBuffer(GL_ARRAY_BUFFER, 0)
+                glDisableClientState(GL_COLOR_ARRAY)
+                glDisableClientState(GL_VERTEX_ARRAY)
+
+        def _draw_surface_client(self):
+            self._dirty_all = False
+            self._dirty_slots = []
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glEnableClientState(GL_COLOR_ARRAY)
+            glVertexPointer(3, GL_FLOAT, 0, self._verts)
+            glColorPointer(3, GL_FLOAT, 0, self._colors)
+            for first, count, x_off in self._draw_ranges:
+                glPushMatrix()
+                glTranslatef(x_off, -self._last_y_shift, 0.0)
+                glDrawElements(
+                    GL_TRIANGLES,
+                    count,
+                    GL_UNSIGNED_INT,
+                    self._indices[first : first + count],
+                )
+                glPopMatrix()
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+
+        def _draw_surface(self):
+            if self._vbo_ok:
+                try:
+                    self._draw_surface_vbo()
+                    return
+                except Exception as e:
+                    # Drivers without usable buffer objects: stay on client arrays.
+                    self._vbo_ok = False
+                    self._release_vbos()
+                    log = getattr(self._gui, "log", None)
+                    if callable(log):
+                        log(f"[INFO] 3D view: vertex buffers unavailable ({e}), using client arrays")
+            self._draw_surface_client()
 
         def redraw(self):
             w = max(1, self.winfo_width())
@@ -424,26 +649,12 @@ if GL_AVAILABLE:
                 self._orbit_az += self._spin_rad_s * dt
 
             self._update_mesh_from_gui()
-
-            xm = float(self._verts[:, 0].min())
-            xM = float(self._verts[:, 0].max())
-            ym = float(self._verts[:, 1].min())
-            yM = float(self._verts[:, 1].max())
-            zm = float(self._verts[:, 2].min())
-            zM = float(self._verts[:, 2].max())
+            xm, xM, ym, yM, zm, zM = self._bounds
 
             glEnable(GL_DEPTH_TEST)
             self._draw_axis_background_grids(xm, xM, ym, yM, zm)
-
-            glEnableClientState(GL_VERTEX_ARRAY)
-            glEnableClientState(GL_COLOR_ARRAY)
-            glVertexPointer(3, GL_FLOAT, 0, self._verts)
-            glColorPointer(3, GL_FLOAT, 0, self._colors)
-            glDrawElements(GL_TRIANGLES, self._ni, GL_UNSIGNED_INT, self._indices)
-            glDisableClientState(GL_COLOR_ARRAY)
-            glDisableClientState(GL_VERTEX_ARRAY)
-
-            self._draw_axis_lines()
+            self._draw_surface()
+            self._draw_axis_lines(xm, xM, ym, yM, zm, zM)
             self._draw_axis_labels_3d(xm, xM, ym, yM, zm)
 
         def _row_world_y(self, row_idx: int, freqs, log_scale: bool) -> float:
@@ -520,13 +731,7 @@ if GL_AVAILABLE:
                 self._draw_glut_label(xw - 0.04, y_bot, zt, lab)
             glEnable(GL_DEPTH_TEST)
 
-        def _draw_axis_lines(self):
-            xm = float(self._verts[:, 0].min())
-            xM = float(self._verts[:, 0].max())
-            ym = float(self._verts[:, 1].min())
-            yM = float(self._verts[:, 1].max())
-            zm = float(self._verts[:, 2].min())
-            zM = float(self._verts[:, 2].max())
+        def _draw_axis_lines(self, xm, xM, ym, yM, zm, zM):
             eps = 0.012
             glDisable(GL_DEPTH_TEST)
             glLineWidth(1.8)
@@ -66,6 +66,17 @@ UPSCALE_METHOD_HIGH = 'high'
 UPSCALE_METHOD_MAXIMUM = 'maximum'
 UPSCALE_METHOD_AI = 'ai'
 
+# Still-image videos: a static frame needs very few frames per second; the
+# long GOP keeps one keyframe every STILL_IMAGE_GOP_S seconds for seeking.
+STILL_IMAGE_FPS = 1
+STILL_IMAGE_GOP_S = 10
+# Merges with transitions: every input is resampled to this rate before xfade
+TRANSITION_FPS = 30
+
+# Batch encodes: total encoder threads shared by all parallel ffmpeg jobs
+DEFAULT_THREAD_BUDGET = max(1, os.cpu_count() or 1)
+DEFAULT_PARALLEL_ENCODES = max(1, min(4, DEFAULT_THREAD_BUDGET // 2))
+
 _LANCZOS_FLAGS = 'flags=lanczos+accurate_rnd+full_chroma_int'
 _LANCZOS_SIMPLE = 'flags=lanczos'
 
@@ -391,6 +402,113 @@ def probe_has_audio(
         return False
 
 
+_SAMPLE_RATE_RE = re.compile(r'Audio:[^\n]*?(\d+) Hz')
+
+
+def probe_sample_rate(
+    ffmpeg_cmd: str,
+    input_path: str,
+    ffprobe_cmd: Optional[str] = None,
+) -> Optional[int]:
+    """Return the sample rate (Hz) of the first audio stream, or None."""
+    probe = ffprobe_cmd or resolve_ffprobe_cmd(ffmpeg_cmd)
+    if probe:
+        try:
+            result = subprocess.run(
+                [
+                    probe, '-v', 'error', '-select_streams', 'a:0',
+                    '-show_entries', 'stream=sample_rate',
+                    '-of', 'default=noprint_wrappers=1:nokey=1', input_path,
+                ],
+                capture_output=True,
+                creationflags=_subprocess_flags(),
+                timeout=60,
+                **_subprocess_text_kwargs(),
+            )
+            if result.returncode == 0 and result.stdout.strip():
+                value = int(result.stdout.strip().splitlines()[0])
+                if value > 0:
+                    return value
+        except (subprocess.TimeoutExpired, ValueError, FileNotFoundError, OSError):
+            pass
+    try:
+        result = subprocess.run(
+            [ffmpeg_cmd, '-i', input_path],
+            capture_output=True,
+            creationflags=_subprocess_flags(),
+            timeout=60,
+            **_subprocess_text_kwargs(),
+        )
+        match = _SAMPLE_RATE_RE.search(result.stderr or '')
+        return int(match.group(1)) if match else None
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        return None
+
+
+_AUDIO_STREAM_RE = re.compile(r'Audio: (\w+)[^\n]*?(\d+) Hz, ([^,\n]+)')
+
+
+def _parse_channel_layout(layout: str) -> Optional[int]:
+    layout = layout.strip()
+    if layout == 'mono':
+        return 1
+    if layout == 'stereo':
+        return 2
+    match = re.match(r'(\d+) channels', layout)
+    return int(match.group(1)) if match else None
+
+
+def probe_audio_stream(
+    ffmpeg_cmd: str,
+    input_path: str,
+    ffprobe_cmd: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Return codec_name, sample_rate and channels of the first audio stream, or None."""
+    probe = ffprobe_cmd or resolve_ffprobe_cmd(ffmpeg_cmd)
+    if probe:
+        try:
+            result = subprocess.run(
+                [
+                    probe, '-v', 'error', '-select_streams', 'a:0',
+                    '-show_entries', 'stream=codec_name,sample_rate,channels',
+                    '-of', 'default=noprint_wrappers=1', input_path,
+                ],
+                capture_output=True,
+                creationflags=_subprocess_flags(),
+                timeout=60,
+                **_subprocess_text_kwargs(),
+            )
+            if result.returncode == 0 and result.stdout.strip():
+                fields = dict(
+                    line.split('=', 1) for line in result.stdout.strip().splitlines() if '=' in line
+                )
+                return {
+                    'codec_name': fields.get('codec_name'),
+                    'sample_rate': int(fields['sample_rate']),
+                    'channels': int(fields['channels']),
+                }
+        except (subprocess.TimeoutExpired, ValueError, KeyError, FileNotFoundError, OSError):
+            pass
+    try:
+        result = subprocess.run(
+            [ffmpeg_cmd, '-i', input_path],
+            capture_output=True,
+            creationflags=_subprocess_flags(),
+            timeout=60,
+            **_subprocess_text_kwargs(),
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        return None
+    match = _AUDIO_STREAM_RE.search(result.stderr or '')
+    if not match:
+        return None
+    return {
+        'codec_name': match.group(1),
+        'sample_rate': int(match.group(2)),
+        'channels': _parse_channel_layout(match.group(3)),
+    }
+
+
 def build_upscale_vf(
     target_w: int,
     target_h: int,
@@ -1150,6 +1268,18 @@ def build_segment_command(
     return cmd
 
 
+def split_thread_budget(thread_budget: int, parallel_jobs: int, job_count: int) -> Tuple[int, int]:
+    """(parallel jobs, -threads per job) so that all jobs together stay within thread_budget."""
+    thread_budget = max(1, thread_budget)
+    jobs = max(1, min(parallel_jobs, job_count, thread_budget))
+    return jobs, max(1, thread_budget // jobs)
+
+
+def with_thread_limit(cmd: List[str], threads: int) -> List[str]:
+    """Copy of cmd with ``-threads`` set as an output option (just before the output path)."""
+    return cmd[:-1] + ['-threads', str(threads), cmd[-1]]
+
+
 def run_ffmpeg(cmd: List[str], timeout: int = 600) -> Tuple[bool, str]:
     try:
         result = subprocess.run(
@@ -1323,6 +1453,116 @@ def build_audio_segment_command(
     ]
 
 
+def build_still_image_prescale_command(
+    ffmpeg_cmd: str,
+    image_path: str,
+    output_path: str,
+    scale_filter: Optional[str] = None,
+) -> List[str]:
+    """Scale an image once to the output frame size (written as a single PNG frame)."""
+    cmd = [ffmpeg_cmd, '-y', '-i', image_path]
+    if scale_filter:
+        cmd.extend(['-vf', scale_filter])
+    cmd.extend(['-frames:v', '1', output_path])
+    return cmd
+
+
+def still_image_encode_args(video_codec: str, fps: int = STILL_IMAGE_FPS) -> List[str]:
+    """Encoder options for a video that shows one unchanging image."""
+    args = ['-r', str(fps), '-g', str(fps * STILL_IMAGE_GOP_S), '-pix_fmt', 'yuv420p']
+    if video_codec == 'libx264':
+        args.extend(['-tune', 'stillimage'])
+    return args
+
+
+def build_visual_loop_mux_command(
+    ffmpeg_cmd: str,
+    visual_path: str,
+    audio_path: str,
+    output_path: str,
+    audio_bitrate: str = '192k',
+) -> List[str]:
+    """Loop a pre-rendered video track (stream copy) under an audio file, cut at the audio's end."""
+    return [
+        ffmpeg_cmd, '-y',
+        '-stream_loop', '-1', '-i', visual_path,
+        '-i', audio_path,
+        '-map', '0:v:0', '-map', '1:a:0',
+        '-c:v', 'copy',
+        '-c:a', 'aac', '-b:a', audio_bitrate,
+        '-shortest',
+        output_path,
+    ]
+
+
+def build_loop_unit_filter(
+    video_duration: float,
+    transition: str,
+    transition_duration: float,
+    scale_filter: str,
+) -> str:
+    """
+    filter_complex for one loop unit of a video with a transition back to its start.
+
+    Inputs 0 and 1 are the same video. The unit plays from transition_duration
+    to the end and crossfades into the first transition_duration seconds, so
+    it lasts video_duration - transition_duration and units can be
+    concatenated back to back without a visible seam.
+    """
+    offset = video_duration - 2 * transition_duration
+    return (
+        f"[0:v]trim=start={transition_duration},setpts=PTS-STARTPTS,{scale_filter}[a];"
+        f"[1:v]trim=duration={transition_duration},setpts=PTS-STARTPTS,{scale_filter}[b];"
+        f"[a][b]xfade=transition={transition}:duration={transition_duration}:offset={offset:.3f}[vout]"
+    )
+
+
+def transition_input_filter(width: int, height: int, fps: int = TRANSITION_FPS) -> str:
+    """
+    Video filters that fit one merge input to the output frame and a common frame rate.
+
+    xfade needs both inputs at the same frame rate and time base. Videos made
+    from a still image are encoded at STILL_IMAGE_FPS, which would also leave
+    a transition only a frame or two long, so every input is resampled.
+    """
+    return (
+        f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={fps}"
+    )
+
+
+def build_loop_intro_filter(transition_duration: float, scale_filter: str) -> str:
+    """filter_complex for the first transition_duration seconds that precede the loop units."""
+    return f"[0:v]trim=duration={transition_duration},setpts=PTS-STARTPTS,{scale_filter}[vout]"
+
+
+def loop_unit_count(audio_duration: float, video_duration: float, transition_duration: float) -> int:
+    """Loop units needed after the intro to cover audio_duration."""
+    unit_duration = video_duration - transition_duration
+    return max(1, math.ceil((audio_duration - transition_duration) / unit_duration))
+
+
+def build_concat_mux_command(
+    ffmpeg_cmd: str,
+    concat_file: str,
+    audio_path: str,
+    output_path: str,
+    duration: float,
+    audio_bitrate: str = '192k',
+) -> List[str]:
+    """Concat pre-rendered video pieces (stream copy) under an audio file, trimmed to duration."""
+    return [
+        ffmpeg_cmd, '-y',
+        '-f', 'concat', '-safe', '0', '-i', concat_file,
+        '-i', audio_path,
+        '-map', '0:v:0', '-map', '1:a:0',
+        '-c:v', 'copy',
+        '-c:a', 'aac', '-b:a', audio_bitrate,
+        '-t', f"{duration:.3f}",
+        output_path,
+    ]
+
+
 def companion_mp3_path(media_path: str) -> str:
     """MP3 path with same basename as a video/audio chunk file."""
     return os.path.splitext(media_path)[0] + '.mp3'
@@ -0,0 +1,1126 @@
+"""
+yt-dlp helpers shared by the downloader GUI and the headless CLI
+(URL/CSV parsing, command options, quality sorting, audio-only targets,
+in-process engine, metadata cache, download archive, client selection,
+download scheduling).
+
+Copyright 2025 Andre Lorbach
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import unquote_plus, urlparse
+
+from .ffmpeg_jobs import FLAC_COMPRESSION_LEVEL, MP3_TARGET_BITRATE, TARGET_CHANNELS, TARGET_SAMPLE_RATE
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_PER_HOST_LIMIT = 2
+DEFAULT_PREFETCH_AHEAD = 2
+PROGRESS_LOG_INTERVAL_S = 1.0
+OUTPUT_TAIL_LINES = 200  # yt-dlp output kept for error reporting
+# Player clients in the order they are tried when nothing has been learned yet
+PLAYER_CLIENTS = ('web', 'ios', 'android', 'tv')
+METADATA_CACHE_FILE = ".ytdlp_metadata_cache.json"
+DEFAULT_METADATA_TTL_S = 6 * 3600
+METADATA_SAVE_INTERVAL_S = 2.0
+DOWNLOAD_ARCHIVE_FILE = ".download_archive.json"
+AUDIO_TARGETS = ('MP3', 'FLAC', 'WAV', 'Original')
+
+# Audio target -> (yt-dlp --audio-format, --audio-quality, ffmpeg output args),
+# with the same encoder settings as the MP3/WAV to FLAC converter
+_TARGET_LAYOUT_ARGS = ['-ar', str(TARGET_SAMPLE_RATE), '-ac', str(TARGET_CHANNELS)]
+_AUDIO_TARGET_OPTIONS = {
+    'MP3': ('mp3', MP3_TARGET_BITRATE.upper(), _TARGET_LAYOUT_ARGS),
+    'FLAC': ('flac', None, _TARGET_LAYOUT_ARGS + ['-compression_level', str(FLAC_COMPRESSION_LEVEL)]),
+    'WAV': ('wav', None, _TARGET_LAYOUT_ARGS),
+}
+
+# Only what the stream list, quality sorting and filename patterns read
+_CACHED_INFO_KEYS = ('id', 'title', 'uploader', 'duration', 'view_count', 'description')
+_CACHED_FORMAT_KEYS = (
+    'format_id', 'ext', 'resolution', 'width', 'height', 'fps', 'vcodec', 'acodec',
+    'abr', 'tbr', 'asr', 'filesize', 'filesize_approx', 'format_note',
+)
+_PROGRESS_RE = re.compile(
+    r'^\[download\]\s+(?P<percent>[\d.]+)%\s+of\s+~?\s*(?P<total>[\d.]+\s*[KMGTP]?i?B|\?)'
+    r'(?:\s+in\s+\S+)?'
+    r'(?:\s+at\s+(?P<speed>[\d.]+\s*[KMGTP]?i?B/s|\S+\s*B?/s|Unknown speed))?'
+    r'(?:\s+ETA\s+(?P<eta>[\d:]+|\S+))?'
+)
+_SIZE_RE = re.compile(r'^([\d.]+)\s*([KMGTP]?)(i?)B')
+_VIDEO_ID_RE = re.compile(
+    r'(?:youtube\.com/(?:watch\?(?:.*&)?v=|shorts/|embed/|live/|v/)|youtu\.be/)([A-Za-z0-9_-]{11})'
+)
+_FORBIDDEN_RE = re.compile(r'HTTP Error 403|\bForbidden\b')
+_SEARCH_QUERY_RE = re.compile(r'youtube\.com/results\?(?:.*&)?search_query=([^&\s]+)')
+
+
+def url_host(url: str) -> str:
+    """Host used for per-host limits; search queries and bare ids count as one host."""
+    if not url:
+        return ''
+    host = urlparse(url).hostname or ''
+    host = host.lower()
+    if host.startswith('www.') or host.startswith('m.'):
+        host = host.split('.', 1)[1]
+    if host == 'youtu.be':
+        host = 'youtube.com'
+    return host or 'youtube.com'
+
+
+def extract_youtube_url(text: str, log_fn: Optional[Callable[[str], None]] = None) -> Optional[str]:
+    """
+    YouTube URL (or search query) from a CSV 'Video Link' cell.
+
+    Supports markdown links [URL](URL), plain watch URLs and search result
+    URLs, whose decoded query is returned as yt-dlp input.
+    """
+    if not text:
+        return None
+    log = log_fn or (lambda _msg: None)
+
+    log(f"[DEBUG] Extracting URL from: {text[:100]}...")
+
+    # Pattern 1: Markdown format [URL](URL)
+    markdown_pattern = r'\[(https://www\.youtube\.com/watch\?v=[\w-]+)\]\(https://www\.youtube\.com/watch\?v=[\w-]+\)'
+    match = re.search(markdown_pattern, text)
+    if match:
+        url = match.group(1)
+        log(f"[DEBUG] Extracted URL (markdown): {url}")
+        return url
+
+    # Pattern 2: Direct YouTube video URL
+    url_pattern = r'https://www\.youtube\.com/watch\?v=[\w-]+'
+    match = re.search(url_pattern, text)
+    if match:
+        url = match.group(0)
+        log(f"[DEBUG] Extracted URL (direct): {url}")
+        return url
+
+    # Pattern 3: YouTube search URL - extract search query and use it directly
+    search_pattern = r'https://www\.youtube\.com/results\?search_query=([^&\s]+)'
+    match = re.search(search_pattern, text)
+    if match:
+        decoded_query = unquote_plus(match.group(1))
+        log(f"[DEBUG] Extracted search query: {decoded_query}")
+        log(f"[INFO] Using search query as yt-dlp input: {decoded_query}")
+        return decoded_query
+
+    log("[ERROR] No supported URL pattern found in text")
+    return None
+
+
+def load_csv_rows(
+    path: str,
+    required_columns: Sequence[str] = ('Video Link',),
+    encoding: str = 'utf-8',
+) -> List[Dict[str, str]]:
+    """
+    Read a downloader CSV into a list of row dicts.
+
+    Raises:
+        UnicodeDecodeError: If the file is not valid in the given encoding
+        ValueError: If the file has no data rows or lacks a required column
+    """
+    with open(path, 'r', encoding=encoding) as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        raise ValueError("CSV file is empty or has no data rows")
+    missing = [col for col in required_columns if col not in rows[0].keys()]
+    if missing:
+        raise ValueError(
+            f"CSV missing required columns: {', '.join(missing)}. "
+            f"Found columns: {', '.join(rows[0].keys())}"
+        )
+    return rows
+
+
+def generate_user_agent() -> str:
+    """Randomized Chrome user agent string"""
+    # Randomize Chrome version (120-130 range)
+    chrome_major = random.randint(120, 130)
+    chrome_minor = random.randint(0, 9)
+    chrome_patch = random.randint(0, 9)
+
+    # Randomize WebKit version slightly (537.30 - 537.40); Safari version matches WebKit
+    webkit_major = 537
+    webkit_minor = random.randint(30, 40)
+
+    return (
+        f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        f"AppleWebKit/{webkit_major}.{webkit_minor} (KHTML, like Gecko) "
+        f"Chrome/{chrome_major}.{chrome_minor}.{chrome_patch}.0 "
+        f"Safari/{webkit_major}.{webkit_minor}"
+    )
+
+
+def stealth_args(
+    user_agent: str,
+    cookie_file: Optional[str] = None,
+    client_type: str = 'web',
+    stealth_mode: bool = True,
+) -> List[str]:
+    """yt-dlp options that reduce 403 errors (user agent, cookies, player client, headers)."""
+    args = ['--user-agent', user_agent]
+
+    if cookie_file and os.path.isfile(cookie_file):
+        args.extend(['--cookies', cookie_file])
+
+    if stealth_mode:
+        # Set referer to YouTube
+        args.extend(['--referer', 'https://www.youtube.com/'])
+
+        # One --extractor-args for youtube: a second one replaces the first.
+        # Live chat is disabled to reduce requests; web is the default client.
+        youtube_args = 'include_live_chat=false'
+        if client_type in ('android', 'ios', 'tv'):
+            youtube_args = f'player_client={client_type};{youtube_args}'
+
+        args.extend([
+            '--extractor-args', f'youtube:{youtube_args}',
+            '--no-check-certificate',  # Skip certificate validation (may help with some proxies)
+        ])
+
+        # Add headers to mimic browser
+        args.extend([
+            '--add-header', 'Accept-Language:en-US,en;q=0.9',
+            '--add-header', 'Accept:text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            '--add-header', 'Accept-Encoding:gzip, deflate',
+            '--add-header', 'DNT:1',
+        ])
+    elif client_type == 'android':
+        # Minimal stealth when disabled
+        args.extend(['--extractor-args', 'youtube:player_client=android'])
+    return args
+
+
+def transfer_args(concurrent_fragments: int = 1, resume: bool = True, downloader: Optional[str] = None) -> List[str]:
+    """yt-dlp download options: parallel fragments, resume, external downloader."""
+    args = []
+    if concurrent_fragments > 1:
+        args.extend(['--concurrent-fragments', str(concurrent_fragments)])
+    # One progress line per update so the output can be read while it runs
+    args.append('--newline')
+    args.append('--continue' if resume else '--no-continue')
+    if downloader and downloader != 'none':
+        args.extend(['--downloader', downloader])
+        if downloader == 'aria2c':
+            connections = str(max(concurrent_fragments, 4))
+            args.extend(['--downloader-args', f'aria2c:-x {connections} -s {connections} -k 1M'])
+    return args
+
+
+def categorize_quality(height: Optional[int]) -> str:
+    """'low' (0-360p), 'medium' (480p-720p) or 'high' (1080p+)"""
+    if not height:
+        return 'low'
+    if height <= 360:
+        return 'low'
+    elif height <= 720:
+        return 'medium'
+    else:
+        return 'high'
+
+
+def is_video_only(fmt: Optional[Dict[str, Any]]) -> bool:
+    """True for streams without audio that need +bestaudio merged in"""
+    if not fmt:
+        return False
+    return fmt.get('acodec', 'none') == 'none' and fmt.get('vcodec', 'none') != 'none'
+
+
+def quality_sorted_format_ids(formats: Sequence[Dict[str, Any]]) -> List[str]:
+    """
+    Video format_ids sorted by quality priority: high -> medium -> low.
+
+    Within a category lower heights come first and combined (video+audio)
+    streams are preferred.
+    """
+    if not formats:
+        return []
+
+    video_streams = []
+    for fmt in formats:
+        if fmt.get('vcodec', 'none') == 'none':
+            continue
+        resolution = fmt.get('resolution', 'unknown')
+        height = fmt.get('height', 0)
+
+        # Extract numeric height if resolution is like "720p" or "480p"
+        if not height and resolution and resolution != 'unknown':
+            height_match = re.search(r'(\d+)p?', str(resolution))
+            if height_match:
+                height = int(height_match.group(1))
+
+        video_streams.append((
+            {'high': 0, 'medium': 1, 'low': 2}[categorize_quality(height)],
+            height or 0,
+            fmt.get('acodec', 'none') == 'none',
+            fmt.get('format_id'),
+        ))
+
+    video_streams.sort(key=lambda x: x[:3])
+    return [stream[3] for stream in video_streams]
+
+
+def audio_only_formats(formats: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Audio-only formats, best first (highest bitrate, then sample rate)."""
+    audio = [
+        fmt for fmt in formats or []
+        if fmt.get('vcodec', 'none') == 'none' and fmt.get('acodec', 'none') not in ('none', None)
+    ]
+    audio.sort(
+        key=lambda fmt: (fmt.get('abr') or fmt.get('tbr') or 0, fmt.get('asr') or 0),
+        reverse=True,
+    )
+    return audio
+
+
+def best_audio_format_id(formats: Sequence[Dict[str, Any]]) -> Optional[str]:
+    """format_id of the best audio-only stream, or None if there is none."""
+    audio = audio_only_formats(formats)
+    return audio[0].get('format_id') if audio else None
+
+
+def audio_target_args(target: str) -> List[str]:
+    """
+    yt-dlp arguments that turn a download into a single audio file.
+
+    'Original' only remuxes the downloaded stream into an audio container;
+    MP3/FLAC/WAV transcode with the converter's settings (yt-dlp stream-copies
+    when the source codec already matches).
+    """
+    if target not in _AUDIO_TARGET_OPTIONS:
+        return ['-x']
+    audio_format, quality, output_args = _AUDIO_TARGET_OPTIONS[target]
+    args = ['-x', '--audio-format', audio_format]
+    if quality:
+        args.extend(['--audio-quality', quality])
+    args.extend(['--postprocessor-args', 'ExtractAudio:' + ' '.join(output_args)])
+    return args
+
+
+def video_id_from_url(url: str) -> Optional[str]:
+    """YouTube video id for url, or None (e.g. search queries or other sites)."""
+    if not url:
+        return None
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+def media_key(url: str) -> Optional[str]:
+    """Cache/archive key for a download input.
+
+    The video id for YouTube video URLs. Search queries (the decoded text
+    extract_youtube_url returns for search result links, or the link itself)
+    get a ``query:`` key with case and whitespace normalized; other URLs get
+    a ``url:`` key.
+    """
+    if not url:
+        return None
+    video_id = video_id_from_url(url)
+    if video_id:
+        return video_id
+    match = _SEARCH_QUERY_RE.search(url)
+    if match:
+        url = unquote_plus(match.group(1))
+    elif '://' in url:
+        return 'url:' + url.strip()
+    query = ' '.join(url.split()).casefold()
+    return 'query:' + query if query else None
+
+
+def info_video_id(info: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Video id from ``-J`` info; the first entry's id for search/playlist results."""
+    if not info:
+        return None
+    entries = info.get('entries')
+    if entries:
+        first = next((e for e in entries if isinstance(e, dict)), None)
+        return first.get('id') if first else None
+    return info.get('id')
+
+
+class MetadataCache:
+    """TTL cache of parsed ``yt-dlp -J`` info keyed by video id, persisted as JSON.
+
+    Only the fields the downloader reads are stored, so the file stays small
+    even for large CSVs. Entries older than ``ttl`` seconds are ignored.
+    Writes are batched; call ``flush`` when a batch finishes.
+
+    Info fetched for another key (a search query, see ``media_key``) is stored
+    under the resolved video id, plus an alias entry from that key to the id,
+    so lookups by the original input hit the same entry.
+    """
+
+    def __init__(self, path: str, ttl: float = DEFAULT_METADATA_TTL_S):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty = False
+        self._last_save = 0.0
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            entries: Dict[str, Dict[str, Any]] = {}
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    entries = data
+            except (OSError, ValueError):
+                pass
+            self._entries = entries
+        return self._entries
+
+    def _save(self) -> None:
+        self._dirty = False
+        self._last_save = time.monotonic()
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def flush(self) -> None:
+        """Write pending entries to disk."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _resolve(self, entries: Dict[str, Dict[str, Any]], key: str) -> str:
+        entry = entries.get(key)
+        return entry['alias'] if entry and entry.get('alias') else key
+
+    def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Cached info for a video id or alias key, or None when missing or expired."""
+        if not key:
+            return None
+        now = time.time()
+        with self._lock:
+            entries = self._load()
+            alias = entries.get(key)
+            if alias and alias.get('alias') and now - alias.get('fetched_at', 0) > self.ttl:
+                return None
+            entry = entries.get(self._resolve(entries, key))
+        if not entry or now - entry.get('fetched_at', 0) > self.ttl:
+            return None
+        return entry.get('info')
+
+    def put(self, key: Optional[str], info: Dict[str, Any]) -> None:
+        """Store info under its video id, aliased from key when that differs."""
+        video_id = info_video_id(info) or key
+        if not video_id or not info:
+            return
+        if info.get('entries'):
+            # Search results: cache the video the download will resolve to
+            info = next((e for e in info['entries'] if isinstance(e, dict)), info)
+        slim = {k: info[k] for k in _CACHED_INFO_KEYS if k in info}
+        if isinstance(slim.get('description'), str):
+            slim['description'] = slim['description'][:500]
+        slim['formats'] = [
+            {k: f[k] for k in _CACHED_FORMAT_KEYS if k in f}
+            for f in info.get('formats') or []
+        ]
+        with self._lock:
+            entries = self._load()
+            now = time.time()
+            for stale in [k for k, e in entries.items() if now - e.get('fetched_at', 0) > self.ttl]:
+                del entries[stale]
+            entries[video_id] = {'fetched_at': now, 'info': slim}
+            if key and key != video_id:
+                entries[key] = {'fetched_at': now, 'alias': video_id}
+            self._dirty = True
+            if time.monotonic() - self._last_save >= METADATA_SAVE_INTERVAL_S:
+                self._save()
+
+    def invalidate(self, key: Optional[str]) -> None:
+        """Drop the entry for a video id or alias key (and the alias itself)."""
+        if not key:
+            return
+        with self._lock:
+            entries = self._load()
+            video_id = self._resolve(entries, key)
+            removed = entries.pop(key, None) is not None
+            removed = entries.pop(video_id, None) is not None or removed
+            if removed:
+                self._save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self._save()
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_reported_filepath(report_path: str) -> Optional[str]:
+    """Last path written by ``--print-to-file after_move:filepath``, or None."""
+    try:
+        with open(report_path, 'r', encoding='utf-8') as f:
+            lines = [line.strip() for line in f if line.strip()]
+    except OSError:
+        return None
+    return lines[-1] if lines else None
+
+
+class DownloadArchive:
+    """Per-folder record of finished downloads: video id -> path, format, size, hash.
+
+    Stored as JSON next to the downloads so a re-run of the same CSV can skip
+    completed rows without scanning the folder. An entry only counts as done
+    while its file still exists with the recorded size. Rows given as search
+    queries are recorded under the resolved video id when it is known, with an
+    alias from the query key (see ``media_key``), else under the query key.
+    """
+
+    def __init__(self, folder: str):
+        self.path = os.path.join(folder, DOWNLOAD_ARCHIVE_FILE)
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            entries: Dict[str, Dict[str, Any]] = {}
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    entries = data
+            except (OSError, ValueError):
+                pass
+            self._entries = entries
+        return self._entries
+
+    def _save(self) -> None:
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def completed(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Archive entry for a video id or alias key if its file is still present, else None."""
+        if not key:
+            return None
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry and entry.get('alias'):
+                entry = entries.get(entry['alias'])
+        if not entry:
+            return None
+        path = entry.get('path', '')
+        try:
+            if os.path.getsize(path) != entry.get('size'):
+                return None
+        except OSError:
+            return None
+        return entry
+
+    def record(
+        self, key: Optional[str], path: str, format_id: str, resolved_key: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Add a finished download under resolved_key (or key), aliased from key.
+
+        Hashes the file outside the lock.
+        """
+        video_id = resolved_key or key
+        if not video_id or not path or not os.path.isfile(path):
+            return None
+        try:
+            entry = {
+                'path': path,
+                'format': format_id,
+                'size': os.path.getsize(path),
+                'sha256': file_sha256(path),
+                'completed_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            }
+        except OSError:
+            return None
+        with self._lock:
+            entries = self._load()
+            entries[video_id] = entry
+            if key and key != video_id:
+                entries[key] = {'alias': video_id}
+            self._save()
+        return entry
+
+
+def is_forbidden_error(message: str) -> bool:
+    """True for the HTTP 403 errors that switching player client can fix.
+
+    Pass yt-dlp's error text (see ``error_output``), not its progress output:
+    sizes like "of 403.21MiB" are not errors.
+    """
+    return bool(message) and bool(_FORBIDDEN_RE.search(message))
+
+
+def error_output(lines: Sequence[str], returncode: int) -> str:
+    """The ``ERROR:`` lines of yt-dlp output, like the in-process engine reports.
+
+    A failed run that printed no error line is described by its exit code and
+    last output line instead.
+    """
+    errors = [line for line in lines if line.startswith('ERROR:')]
+    if errors or not returncode:
+        return '\n'.join(errors)
+    last = next((line for line in reversed(lines) if line), '')
+    return f"yt-dlp exited with code {returncode}" + (f": {last}" if last else '')
+
+
+def last_error_line(stderr: str) -> str:
+    """Last non-empty line of an error report (the line worth logging), or 'Unknown error'."""
+    lines = [line.strip() for line in (stderr or '').splitlines() if line.strip()]
+    return lines[-1] if lines else "Unknown error"
+
+
+class ClientSelector:
+    """Order yt-dlp player clients by how well they worked this session.
+
+    Each client is scored with a smoothed success rate, so a single early
+    failure does not rule it out. The client chosen in Settings wins ties;
+    once another client has proven better, it is tried first.
+    """
+
+    def __init__(self, clients: Sequence[str] = PLAYER_CLIENTS):
+        self.clients = tuple(clients)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, List[int]] = {c: [0, 0] for c in self.clients}
+
+    def record(self, client: str, success: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(client, [0, 0])
+            stats[0 if success else 1] += 1
+
+    def score(self, client: str) -> float:
+        with self._lock:
+            ok, failed = self._stats.get(client, (0, 0))
+        return (ok + 1.0) / (ok + failed + 2.0)
+
+    def order(self, preferred: Optional[str] = None) -> List[str]:
+        """Clients to try, best first; preferred first among equals."""
+        candidates = list(self.clients)
+        if preferred in candidates:
+            candidates.remove(preferred)
+            candidates.insert(0, preferred)
+        elif preferred:
+            candidates.insert(0, preferred)
+        rank = {c: i for i, c in enumerate(candidates)}
+        return sorted(candidates, key=lambda c: (-self.score(c), rank[c]))
+
+    def summary(self) -> str:
+        with self._lock:
+            parts = [f"{c} {ok}/{ok + failed}" for c, (ok, failed) in self._stats.items() if ok + failed]
+        return ', '.join(parts)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {c: [0, 0] for c in self.clients}
+
+
+def format_bytes(num: Optional[float]) -> str:
+    if not num:
+        return '?'
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if num < 1024.0 or unit == 'GiB':
+            return f"{num:.2f}{unit}"
+        num /= 1024.0
+    return f"{num:.2f}GiB"
+
+
+def parse_size(text: Optional[str]) -> Optional[float]:
+    """'12.3MiB' -> bytes; None when unknown."""
+    if not text:
+        return None
+    match = _SIZE_RE.match(text.strip())
+    if not match:
+        return None
+    number, prefix, binary = match.groups()
+    base = 1024.0 if binary else 1000.0
+    return float(number) * base ** ('KMGTP'.index(prefix) + 1 if prefix else 0)
+
+
+def parse_eta(text: Optional[str]) -> Optional[int]:
+    """'01:02:03' / '02:03' -> seconds; None when unknown."""
+    if not text or not re.match(r'^\d+(?::\d+)*$', text):
+        return None
+    seconds = 0
+    for part in text.split(':'):
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+def parse_progress_line(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a yt-dlp ``[download]  45.3% of ~12.34MiB at 1.23MiB/s ETA 00:10`` line.
+
+    Returns:
+        Dict with percent, total_bytes, speed (bytes/s) and eta (seconds),
+        unknown values being None; None for any other line
+    """
+    match = _PROGRESS_RE.match(line.strip())
+    if not match:
+        return None
+    speed = match.group('speed')
+    return {
+        'percent': float(match.group('percent')),
+        'total_bytes': parse_size(match.group('total')),
+        'speed': parse_size(speed[:-2]) if speed and speed.endswith('/s') else None,
+        'eta': parse_eta(match.group('eta')),
+    }
+
+
+def format_progress(progress: Dict[str, Any]) -> str:
+    """Short 'percent of size at speed, ETA' text for a parsed progress dict."""
+    text = f"{progress.get('percent', 0.0):.1f}%"
+    if progress.get('total_bytes'):
+        text += f" of {format_bytes(progress['total_bytes'])}"
+    if progress.get('speed'):
+        text += f" at {format_bytes(progress['speed'])}/s"
+    if progress.get('eta') is not None:
+        text += f", ETA {format_eta(progress['eta'])}"
+    return text
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return '--:--'
+    seconds = int(seconds)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours:d}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+class _CaptureLogger:
+    """YoutubeDL logger forwarding output lines and collecting errors."""
+
+    def __init__(self, line_fn: Optional[Callable[[str], None]] = None):
+        self.line_fn = line_fn
+        self.errors: List[str] = []
+
+    def _emit(self, msg: str) -> None:
+        if self.line_fn is not None and msg:
+            self.line_fn(msg)
+
+    def debug(self, msg: str) -> None:
+        # yt-dlp routes regular screen output through debug() as well
+        if not msg.startswith('[debug] '):
+            self._emit(msg)
+
+    def info(self, msg: str) -> None:
+        self._emit(msg)
+
+    def warning(self, msg: str) -> None:
+        self._emit(f"WARNING: {msg}")
+
+    def error(self, msg: str) -> None:
+        self.errors.append(msg)
+        self._emit(msg)
+
+
+class YtDlpEngine:
+    """Run yt-dlp command lines in-process through ``yt_dlp.YoutubeDL``.
+
+    Arguments are the same ones passed to ``python -m yt_dlp``; they are parsed
+    with yt-dlp's own option parser, so the subprocess path and the engine
+    share one command builder. ``run`` returns ``(returncode, stdout, stderr)``
+    like a finished subprocess, or None when yt-dlp cannot be imported or the
+    arguments cannot be parsed, in which case callers fall back to spawning
+    ``python -m yt_dlp``.
+    """
+
+    def __init__(self):
+        self._module = None
+        self._import_failed = False
+        self._lock = threading.Lock()
+
+    def _yt_dlp(self):
+        if self._module is None and not self._import_failed:
+            with self._lock:
+                if self._module is None and not self._import_failed:
+                    try:
+                        import yt_dlp
+                        self._module = yt_dlp
+                    except ImportError:
+                        self._import_failed = True
+        return self._module
+
+    @property
+    def available(self) -> bool:
+        return self._yt_dlp() is not None
+
+    def _progress_hook(self, yt_dlp, line_fn, is_cancelled):
+        cancelled_error = getattr(yt_dlp.utils, 'DownloadCancelled', yt_dlp.utils.DownloadError)
+        last_emit = [0.0]
+
+        def hook(d):
+            if is_cancelled is not None and is_cancelled():
+                raise cancelled_error('Download cancelled by user')
+            if line_fn is None:
+                return
+            status = d.get('status')
+            if status == 'downloading':
+                now = time.monotonic()
+                if now - last_emit[0] < PROGRESS_LOG_INTERVAL_S:
+                    return
+                last_emit[0] = now
+                total = d.get('total_bytes') or d.get('total_bytes_estimate')
+                done = d.get('downloaded_bytes') or 0
+                percent = f"{100.0 * done / total:5.1f}%" if total else '  ?.?%'
+                speed = d.get('speed')
+                line_fn(
+                    f"[download] {percent} of {format_bytes(total)} "
+                    f"at {format_bytes(speed)}/s ETA {format_eta(d.get('eta'))}"
+                )
+            elif status == 'finished':
+                line_fn(f"[download] Finished: {d.get('filename', '')}")
+
+        return hook
+
+    def run(
+        self,
+        args: Sequence[str],
+        line_fn: Optional[Callable[[str], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> Optional[Tuple[int, str, str]]:
+        """
+        Run one yt-dlp invocation in the calling thread.
+
+        ``-J``/``--dump-single-json`` invocations return the info JSON on
+        stdout; everything else downloads. Output lines and throttled progress
+        lines are passed to line_fn.
+        """
+        yt_dlp = self._yt_dlp()
+        if yt_dlp is None:
+            return None
+        args = list(args)
+        try:
+            parsed = yt_dlp.parse_options(args)
+        except (Exception, SystemExit):
+            return None
+        urls, ydl_opts = parsed[2], dict(parsed[3])
+        if not urls:
+            return None
+
+        dump_json = '-J' in args or '--dump-single-json' in args
+        ydl_opts.pop('dump_single_json', None)
+        logger = _CaptureLogger(line_fn)
+        ydl_opts['logger'] = logger
+        ydl_opts['noprogress'] = True
+        ydl_opts['progress_hooks'] = list(ydl_opts.get('progress_hooks') or []) + [
+            self._progress_hook(yt_dlp, line_fn, is_cancelled)
+        ]
+        stdout = ''
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                if dump_json:
+                    info = ydl.extract_info(urls[0], download=False)
+                    stdout = json.dumps(ydl.sanitize_info(info))
+                    returncode = 0
+                else:
+                    returncode = ydl.download(urls)
+        except Exception as e:
+            returncode = 1
+            msg = str(e)
+            if msg and msg not in logger.errors:
+                logger.errors.append(msg)
+        if returncode and not logger.errors:
+            logger.errors.append('Unknown error')
+        return returncode, stdout, '\n'.join(logger.errors)
+
+
+class YtDlpRunner:
+    """Run yt-dlp for the GUI and the headless CLI, without any UI.
+
+    Each call runs in-process through ``YtDlpEngine`` when enabled, falling
+    back to ``python -m yt_dlp`` for that call only when the engine cannot
+    handle it. Subprocesses are tracked so ``terminate_all`` can cancel them.
+    ``run_with_fallback`` retries 403 errors with the other player clients,
+    best known first (``ClientSelector``).
+
+    build_args(base_args, client_type) returns the full yt-dlp arguments
+    (stealth and transfer options). use_engine and is_cancelled are
+    callables so UI settings are read on every call.
+    """
+
+    def __init__(
+        self,
+        build_args: Callable[[List[str], Optional[str]], List[str]],
+        use_engine: Callable[[], bool] = lambda: True,
+        is_cancelled: Callable[[], bool] = lambda: False,
+        on_engine_fallback: Optional[Callable[[], None]] = None,
+        client_selector: Optional['ClientSelector'] = None,
+    ):
+        self.build_args = build_args
+        self.use_engine = use_engine
+        self.is_cancelled = is_cancelled
+        self.on_engine_fallback = on_engine_fallback
+        self.client_selector = client_selector or ClientSelector()
+        self.engine = YtDlpEngine()
+        self.active_processes = set()
+        self._lock = threading.Lock()
+        self._engine_fallback_reported = False
+
+    def run(
+        self,
+        base_args: List[str],
+        client_type: Optional[str] = None,
+        line_fn: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[int, str, str]:
+        """One yt-dlp invocation; returns (returncode, stdout, stderr)."""
+        args = self.build_args(base_args, client_type)
+        if self.use_engine():
+            result = self.engine.run(args, line_fn=line_fn, is_cancelled=self.is_cancelled)
+            if result is not None:
+                return result
+            if not self._engine_fallback_reported:
+                self._engine_fallback_reported = True
+                if self.on_engine_fallback is not None:
+                    self.on_engine_fallback()
+        return self.run_subprocess([sys.executable, '-m', 'yt_dlp'] + args, line_fn)
+
+    def run_subprocess(self, cmd: List[str], line_fn: Optional[Callable[[str], None]] = None) -> Tuple[int, str, str]:
+        """Run a yt-dlp command line as a tracked subprocess.
+
+        -J fetches capture stdout (the info JSON). Downloads are read line by
+        line as they run: stderr is merged into stdout and each line is passed
+        to line_fn. Only yt-dlp's ERROR: lines are returned as stderr (see
+        error_output), so progress lines such as "of 403.21MiB" never look
+        like a 403.
+        """
+        capture_stdout = '-J' in cmd
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE if capture_stdout else subprocess.STDOUT,
+            text=True,
+            errors='replace',
+            creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+        )
+        with self._lock:
+            self.active_processes.add(process)
+        try:
+            if self.is_cancelled():
+                process.terminate()
+            if capture_stdout:
+                stdout, stderr = process.communicate()
+                stderr = error_output((stderr or '').splitlines(), process.returncode)
+            else:
+                tail: deque = deque(maxlen=OUTPUT_TAIL_LINES)
+                for line in process.stdout:
+                    line_text = line.strip()
+                    if line_text:
+                        tail.append(line_text)
+                        if line_fn:
+                            line_fn(line_text)
+                process.wait()
+                stdout, stderr = '', error_output(list(tail), process.returncode)
+        finally:
+            with self._lock:
+                self.active_processes.discard(process)
+        return process.returncode, stdout or '', stderr or ''
+
+    def run_with_fallback(
+        self,
+        base_args: List[str],
+        preferred_client: Optional[str] = None,
+        on_retry: Optional[Callable[[str], None]] = None,
+        line_fn: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[int, str, str, Optional[str]]:
+        """
+        Run yt-dlp, retrying 403 errors with other player clients.
+
+        on_retry(client) is called before each retry. Returns
+        (returncode, stdout, stderr, client); on failure stderr is the first
+        error seen.
+        """
+        first_failure = None
+        client = None
+        for attempt, client in enumerate(self.client_selector.order(preferred_client)):
+            if attempt:
+                if self.is_cancelled():
+                    break
+                if on_retry is not None:
+                    on_retry(client)
+            returncode, stdout, stderr = self.run(base_args, client, line_fn)
+            if returncode == 0:
+                self.client_selector.record(client, True)
+                return returncode, stdout, stderr, client
+            if self.is_cancelled() or not is_forbidden_error(stderr):
+                return (returncode, stdout, stderr, client) if first_failure is None else first_failure + (client,)
+            self.client_selector.record(client, False)
+            if first_failure is None:
+                first_failure = (returncode, stdout, stderr)
+        return first_failure + (client,)
+
+    def terminate_all(self) -> int:
+        """Terminate running yt-dlp subprocesses; returns how many were signalled."""
+        with self._lock:
+            processes = list(self.active_processes)
+        for process in processes:
+            try:
+                process.terminate()
+            except Exception:
+                pass
+        return len(processes)
+
+
+class DownloadScheduler:
+    """Run download jobs on a worker pool with per-host concurrency limits.
+
+    Jobs are started in order. When a prefetch function is given (e.g. the
+    ``-J`` metadata fetch), it runs on a separate small pool a few jobs ahead
+    of the download workers, so metadata round trips overlap with downloads.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+        prefetch_ahead: int = DEFAULT_PREFETCH_AHEAD,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ):
+        self.max_workers = max(1, int(max_workers))
+        self.per_host_limit = max(1, int(per_host_limit))
+        self.prefetch_ahead = max(1, int(prefetch_ahead))
+        self._is_cancelled = is_cancelled or (lambda: False)
+        self._host_sems: Dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def cancelled(self) -> bool:
+        try:
+            return bool(self._is_cancelled())
+        except Exception:
+            return False
+
+    def _host_semaphore(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            sem = self._host_sems.get(host)
+            if sem is None:
+                sem = threading.Semaphore(self.per_host_limit)
+                self._host_sems[host] = sem
+            return sem
+
+    def _acquire(self, sem: threading.Semaphore) -> bool:
+        while not self.cancelled():
+            if sem.acquire(timeout=0.2):
+                return True
+        return False
+
+    def run(
+        self,
+        jobs: Sequence[Any],
+        download_fn: Callable[[Any, Any], Any],
+        prefetch_fn: Optional[Callable[[Any], Any]] = None,
+        host_fn: Optional[Callable[[Any], str]] = None,
+        after_job_fn: Optional[Callable[[Any], None]] = None,
+    ) -> List[Any]:
+        """
+        Process all jobs and return their results in job order.
+
+        download_fn(job, meta) receives the prefetch result for the job (or the
+        exception prefetch_fn raised; None without prefetch). Jobs skipped
+        because of cancellation have a result of None. after_job_fn(job) runs
+        on the worker after each download except the last (e.g. a polite delay).
+        """
+        jobs = list(jobs)
+        results: List[Any] = [None] * len(jobs)
+        if not jobs:
+            return results
+        meta_pool = None
+        meta_futures: Dict[int, Any] = {}
+        if prefetch_fn is not None:
+            meta_pool = ThreadPoolExecutor(
+                max_workers=self.prefetch_ahead, thread_name_prefix='ytdlp-meta'
+            )
+        lookahead = self.max_workers + self.prefetch_ahead
+        next_index = [0]
+        # Jobs below this index have had their prefetch submitted; futures are
+        # popped once consumed, so the -J results are not held until the run ends
+        next_prefetch = [0]
+
+        def _prefetch(job):
+            if self.cancelled():
+                return None
+            return prefetch_fn(job)
+
+        def _worker():
+            while not self.cancelled():
+                with self._lock:
+                    k = next_index[0]
+                    if k >= len(jobs):
+                        return
+                    next_index[0] = k + 1
+                    if meta_pool is not None:
+                        end = min(len(jobs), k + 1 + lookahead)
+                        for j in range(next_prefetch[0], end):
+                            meta_futures[j] = meta_pool.submit(_prefetch, jobs[j])
+                        next_prefetch[0] = max(next_prefetch[0], end)
+                        meta_future = meta_futures.pop(k)
+                job = jobs[k]
+                meta = None
+                if meta_pool is not None:
+                    try:
+                        meta = meta_future.result()
+                    except Exception as e:
+                        meta = e
+                    if self.cancelled():
+                        return
+                sem = self._host_semaphore(host_fn(job) if host_fn else '')
+                if not self._acquire(sem):
+                    return
+                try:
+                    results[k] = download_fn(job, meta)
+                finally:
+                    sem.release()
+                if after_job_fn is not None and k < len(jobs) - 1 and not self.cancelled():
+                    after_job_fn(job)
+
+        workers = [
+            threading.Thread(target=_worker, name=f'ytdlp-worker-{n}', daemon=True)
+            for n in range(min(self.max_workers, len(jobs)))
+        ]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        if meta_pool is not None:
+            meta_pool.shutdown(wait=False, cancel_futures=True)
+        return results
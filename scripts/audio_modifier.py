@@ -23,21 +23,25 @@ import os
 import sys
 import threading
 import subprocess
-from pathlib import Path
 
 # Import shared libraries
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from lib.base_gui import BaseAudioGUI
+from lib.ffmpeg_jobs import (
+    DEFAULT_JOB_WORKERS, DEFAULT_VARIANT_SET, MAX_JOB_WORKERS, create_job_executor, parse_variant_set,
+    prepare_pitch_engine, run_modification_jobs, speed_pitch_jobs, variant_set_jobs,
+)
 
 
 class AudioModifierGUI(BaseAudioGUI):
     def __init__(self, root):
         super().__init__(root, "Audio Modifier")
-        self.root.geometry("800x750")
+        self.root.geometry("800x880")
         
         self.selected_files = []
         self.modification_queue = []
         self.current_index = 0
+        self.job_executor = None  # FFmpegJobExecutor while a batch runs
         
         self.setup_ui()
     
@@ -122,6 +126,21 @@ class AudioModifierGUI(BaseAudioGUI):
         quality_combo['values'] = ('128k', '192k', '256k', '320k')
         quality_combo.grid(row=4, column=1, sticky='w', padx=5)
         
+        ttk.Label(settings_frame, text="Parallel Jobs:").grid(row=5, column=0, sticky='w', pady=5)
+        jobs_frame = ttk.Frame(settings_frame)
+        jobs_frame.grid(row=5, column=1, sticky='w', padx=5)
+        self.workers_var = tk.StringVar(value=str(DEFAULT_JOB_WORKERS))
+        ttk.Spinbox(jobs_frame, textvariable=self.workers_var, from_=1, to=MAX_JOB_WORKERS, width=10).pack(side='left')
+        ttk.Label(jobs_frame, text=" (files processed at the same time)").pack(side='left', padx=5)
+        
+        self.rubberband_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(settings_frame, text="Use rubberband for pitch (if FFmpeg has it)",
+                        variable=self.rubberband_var).grid(row=6, column=0, columnspan=2, sticky='w', pady=5)
+        
+        self.incremental_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text="Skip unchanged files (incremental re-runs)",
+                        variable=self.incremental_var).grid(row=7, column=0, columnspan=2, sticky='w', pady=5)
+        
         preset_frame = ttk.LabelFrame(self.root, text="Quick Presets", padding=10)
         preset_frame.pack(fill='x', padx=10, pady=10)
         
@@ -134,6 +153,15 @@ class AudioModifierGUI(BaseAudioGUI):
         ttk.Button(btn_preset_frame, text="Pitch +1", command=lambda: self.apply_preset(0, 1)).pack(side='left', padx=2)
         ttk.Button(btn_preset_frame, text="Reset", command=lambda: self.apply_preset(0, 0)).pack(side='left', padx=2)
         
+        # Variant set: several speed/pitch/bitrate versions per file from a single decode
+        variant_frame = ttk.LabelFrame(self.root, text="Variant Set", padding=10)
+        variant_frame.pack(fill='x', padx=10, pady=10)
+        
+        self.variant_set_var = tk.StringVar(value=DEFAULT_VARIANT_SET)
+        ttk.Entry(variant_frame, textvariable=self.variant_set_var, width=40).pack(side='left', padx=2)
+        ttk.Button(variant_frame, text="Render Variant Set", command=self.start_variant_set).pack(side='left', padx=5)
+        ttk.Label(variant_frame, text="speed%:pitch[:bitrate], comma separated", font=('Arial', 8)).pack(side='left', padx=5)
+        
         modify_frame = ttk.Frame(self.root)
         modify_frame.pack(fill='x', padx=10, pady=10)
         
@@ -143,6 +171,8 @@ class AudioModifierGUI(BaseAudioGUI):
         
         ttk.Button(batch_frame, text="Modify Selected Files", command=self.start_modification).pack(side='left', padx=5)
         ttk.Button(batch_frame, text="Modify All Files", command=self.modify_all_files).pack(side='left', padx=5)
+        self.cancel_button = ttk.Button(batch_frame, text="Cancel", command=self.cancel_modification, state='disabled')
+        self.cancel_button.pack(side='left', padx=5)
         
         self.progress = ttk.Progressbar(modify_frame, mode='determinate')
         self.progress.pack(fill='x', pady=5)
@@ -172,9 +202,17 @@ class AudioModifierGUI(BaseAudioGUI):
         if busy:
             self.root.config(cursor="wait")
             self.progress_label.config(text=message)
+            self.cancel_button.config(state='normal')
         else:
             self.root.config(cursor="")
             self.progress_label.config(text="")
+            self.cancel_button.config(state='disabled')
+    
+    def cancel_modification(self):
+        executor = self.job_executor
+        if executor is not None and not executor.cancelled:
+            executor.cancel()
+            self.log("[INFO] Cancelling modification...")
     
     def browse_converted_folder(self):
         folder = super().browse_folder(self.converted_folder_var.get())
@@ -308,11 +346,16 @@ class AudioModifierGUI(BaseAudioGUI):
         
         self.modification_queue = self.selected_files.copy()
         self.current_index = 0
+        self.job_executor = create_job_executor(self.workers_var.get())
+        self._incremental = self.incremental_var.get()
         
         self.log(f"[INFO] Starting modification of {len(self.modification_queue)} file(s)")
         self.log(f"[INFO] Output folder: {self.file_manager.get_folder_path('output')}")
         self.log(f"[INFO] Speed: {speed_percent:+.1f}%, Pitch: {pitch_semitones:+.1f} semitones")
         self.log(f"[INFO] Audio quality: {self.quality_var.get()}")
+        self.log(f"[INFO] Parallel jobs: {self.job_executor.max_workers}")
+        if self._incremental:
+            self.log("[INFO] Incremental mode: files already modified with the same settings are skipped")
         
         self.progress['maximum'] = len(self.modification_queue)
         self.progress['value'] = 0
@@ -323,99 +366,99 @@ class AudioModifierGUI(BaseAudioGUI):
         thread.daemon = True
         thread.start()
     
-    def _modification_thread(self, speed_percent, pitch_semitones):
-        success_count = 0
-        error_count = 0
+    def start_variant_set(self):
+        """Render every variant of the variant set for the selected files"""
+        if self.is_busy:
+            messagebox.showwarning("Warning", "Modification already in progress")
+            return
         
-        for i, input_file in enumerate(self.modification_queue):
-            self.current_index = i + 1
-            
-            input_path = Path(input_file)
-            basename = input_path.stem
-            extension = input_path.suffix
-            
-            suffix_parts = []
-            if speed_percent != 0:
-                suffix_parts.append(f"speed{speed_percent:+.0f}pct")
-            if pitch_semitones != 0:
-                suffix_parts.append(f"pitch{pitch_semitones:+.0f}st")
-            
-            suffix = "_" + "_".join(suffix_parts) if suffix_parts else "_modified"
-            output_file = os.path.join(self.file_manager.get_folder_path('output'), f"{basename}{suffix}{extension}")
-            
-            self.root.after(
-                0,
-                lambda idx=i+1, total=len(self.modification_queue), name=input_path.name:
-                self.set_busy(True, f"Modifying {idx}/{total}: {name}")
+        if not self.selected_files:
+            messagebox.showwarning("Warning", "Please select at least one audio file")
+            return
+        
+        try:
+            variants = parse_variant_set(self.variant_set_var.get(), self.quality_var.get())
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        
+        if not self.check_ffmpeg():
+            self.offer_ffmpeg_install()
+            return
+        
+        self.file_manager.set_folder_path('output', self.folder_var.get())
+        self.ensure_directory(self.file_manager.get_folder_path('output'))
+        
+        self.modification_queue = self.selected_files.copy()
+        self.current_index = 0
+        self.job_executor = create_job_executor(self.workers_var.get())
+        self._incremental = self.incremental_var.get()
+        
+        variant_desc = ", ".join(f"{speed:+.0f}%/{pitch:+.0f}st@{bitrate}" for speed, pitch, bitrate in variants)
+        self.log(f"[INFO] Rendering {len(variants)} variant(s) of {len(self.modification_queue)} file(s), one decode per file")
+        self.log(f"[INFO] Variants: {variant_desc}")
+        self.log(f"[INFO] Output folder: {self.file_manager.get_folder_path('output')}")
+        self.log(f"[INFO] Parallel jobs: {self.job_executor.max_workers}")
+        if self._incremental:
+            self.log("[INFO] Incremental mode: files already modified with the same settings are skipped")
+        
+        self.progress['maximum'] = len(self.modification_queue)
+        self.progress['value'] = 0
+        
+        self.set_busy(True, "Rendering variants...")
+        
+        thread = threading.Thread(target=self._modification_thread, kwargs={'variants': variants})
+        thread.daemon = True
+        thread.start()
+    
+    def _modification_thread(self, speed_percent=0.0, pitch_semitones=0.0, variants=None):
+        """Build the batch's jobs (one speed/pitch setting, or every variant of a variant set) and run them"""
+        executor = self.job_executor
+        output_folder = self.file_manager.get_folder_path('output')
+        ffmpeg_path = self.get_ffmpeg_command()
+        engine = prepare_pitch_engine(ffmpeg_path, self.rubberband_var.get(), self.modification_queue, executor.max_workers)
+        self.root.after(0, lambda name=engine.name: self.log(f"[INFO] Pitch engine: {name}"))
+        
+        if variants:
+            jobs = variant_set_jobs(ffmpeg_path, self.modification_queue, variants, output_folder, engine)
+        else:
+            audio_bitrate = self.quality_var.get()
+            jobs = speed_pitch_jobs(
+                self.modification_queue, output_folder, speed_percent, pitch_semitones, engine,
+                lambda input_file, output_file, filters, sample_rate: self.build_ffmpeg_command(
+                    input_file, output_file,
+                    audio_filters=filters,
+                    audio_bitrate=audio_bitrate,
+                    sample_rate=sample_rate
+                )
             )
-            
+        
+        def on_progress(finished, total, files_per_min):
+            self.current_index = finished
+            self.root.after(0, lambda v=finished, t=total: self.progress.config(maximum=max(1, t), value=v))
             self.root.after(
                 0,
-                lambda msg=f"\n[INFO] Modifying ({i+1}/{len(self.modification_queue)}): {input_path.name}":
-                self.log(msg)
+                lambda f=finished, t=total, rate=files_per_min:
+                self.progress_label.config(text=f"Modifying: {f}/{t} done ({rate:.1f} files/min, {executor.max_workers} parallel jobs)")
             )
-            
-            try:
-                filters = []
-                
-                if speed_percent != 0:
-                    speed_factor = 1.0 + (speed_percent / 100.0)
-                    filters.append(f"atempo={speed_factor}")
-                
-                if pitch_semitones != 0:
-                    pitch_factor = 2 ** (pitch_semitones / 12.0)
-                    filters.append(f"asetrate=44100*{pitch_factor},aresample=44100")
-                
-                cmd = self.build_ffmpeg_command(
-                    input_file, output_file,
-                    audio_filters=filters,
-                    audio_bitrate=self.quality_var.get()
-                )
-                
-                process = self.run_ffmpeg_command(cmd)
-                
-                if process.returncode == 0:
-                    success_count += 1
-                    self.root.after(
-                        0,
-                        lambda out=output_file:
-                        self.log(f"[SUCCESS] Saved: {os.path.basename(out)}")
-                    )
-                else:
-                    error_count += 1
-                    error_msg = process.stderr if process.stderr else "Unknown error"
-                    self.root.after(
-                        0,
-                        lambda err=error_msg:
-                        self.log(f"[ERROR] Modification failed: {err[:200]}")
-                    )
-                
-            except Exception as e:
-                error_count += 1
-                error_msg = str(e)
-                self.root.after(
-                    0,
-                    lambda msg=error_msg:
-                    self.log(f"[ERROR] Exception: {msg}")
-                )
-            
-            self.root.after(0, lambda v=i+1: self.progress.config(value=v))
         
-        self.root.after(
-            0,
-            lambda s=success_count, e=error_count:
-            self.log(f"\n[COMPLETE] Modification finished: {s} succeeded, {e} failed")
+        counts = run_modification_jobs(
+            executor, jobs, self._incremental,
+            log=lambda msg: self.root.after(0, lambda m=msg: self.log(m)),
+            on_progress=on_progress,
         )
         
-        self.root.after(
-            0,
-            lambda s=success_count, e=error_count:
-            messagebox.showinfo(
-                "Modification Complete",
-                f"Modification finished!\n\nSuccessful: {s}\nFailed: {e}"
+        if not executor.cancelled:
+            self.root.after(
+                0,
+                lambda c=counts:
+                messagebox.showinfo(
+                    "Modification Complete",
+                    f"Modification finished!\n\nSuccessful: {c['succeeded']}\nFailed: {c['failed']}\nSkipped (unchanged): {c['skipped']}"
+                )
             )
-        )
         
+        self.job_executor = None
         self.root.after(0, lambda: self.set_busy(False))
     
     def modify_all_files(self):
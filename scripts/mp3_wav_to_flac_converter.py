@@ -23,11 +23,18 @@ import os
 import sys
 import threading
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Import shared libraries
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from lib.base_gui import BaseAudioGUI
+from lib.ffmpeg_jobs import (
+    AUDIO_TARGET_CODEC_ARGS, AUDIO_TARGET_CODECS, AUDIO_TARGET_EXTENSIONS, AUDIO_TARGET_FORMATS, DEFAULT_JOB_TIMEOUT_S,
+    DEFAULT_JOB_WORKERS, MAX_JOB_WORKERS, MP3_TARGET_BITRATE, TARGET_CHANNELS, TARGET_SAMPLE_RATE,
+    BatchManifest, FFmpegJobExecutor, batch_throughput, format_throughput,
+)
+from lib.video_utils import probe_audio_stream, resolve_ffprobe_cmd
 
 
 class MP3WAVToFLACConverterGUI(BaseAudioGUI):
@@ -38,6 +45,7 @@ class MP3WAVToFLACConverterGUI(BaseAudioGUI):
         self.selected_files = []
         self.conversion_queue = []
         self.current_index = 0
+        self.job_executor = None  # FFmpegJobExecutor while a batch runs
         
         self.setup_ui()
     
@@ -126,8 +134,20 @@ class MP3WAVToFLACConverterGUI(BaseAudioGUI):
         ttk.Label(extract_frame, text="minutes").pack(side='left', padx=2)
         self._toggle_extract_minutes()
         
+        jobs_frame = ttk.Frame(settings_frame)
+        jobs_frame.grid(row=3, column=0, columnspan=3, sticky='w', pady=5)
+        ttk.Label(jobs_frame, text="Parallel jobs:").pack(side='left')
+        self.workers_var = tk.StringVar(value=str(DEFAULT_JOB_WORKERS))
+        ttk.Spinbox(jobs_frame, textvariable=self.workers_var, from_=1, to=MAX_JOB_WORKERS, width=4).pack(side='left', padx=5)
+        ttk.Label(jobs_frame, text="Timeout per file (min):").pack(side='left', padx=(10, 0))
+        self.timeout_var = tk.StringVar(value=str(DEFAULT_JOB_TIMEOUT_S // 60))
+        ttk.Spinbox(jobs_frame, textvariable=self.timeout_var, from_=0, to=240, width=4).pack(side='left', padx=5)
+        ttk.Label(jobs_frame, text="(0 = no limit)", font=('Arial', 8)).pack(side='left', padx=2)
+        self.incremental_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(jobs_frame, text="Skip unchanged files", variable=self.incremental_var).pack(side='left', padx=(10, 0))
+        
         info_frame_settings = ttk.Frame(settings_frame)
-        info_frame_settings.grid(row=3, column=0, columnspan=3, sticky='w', pady=5)
+        info_frame_settings.grid(row=4, column=0, columnspan=3, sticky='w', pady=5)
         ttk.Label(info_frame_settings, text="Output files will be saved in the same folder as input files", font=('Arial', 8)).pack(side='left')
         
         convert_frame = ttk.Frame(self.root)
@@ -139,6 +159,8 @@ class MP3WAVToFLACConverterGUI(BaseAudioGUI):
         
         ttk.Button(batch_frame, text="Convert Selected Files", command=self.start_conversion).pack(side='left', padx=5)
         ttk.Button(batch_frame, text="Convert All Files", command=self.convert_all_files).pack(side='left', padx=5)
+        self.cancel_button = ttk.Button(batch_frame, text="Cancel", command=self.cancel_conversion, state='disabled')
+        self.cancel_button.pack(side='left', padx=5)
         
         self.progress = ttk.Progressbar(convert_frame, mode='determinate')
         self.progress.pack(fill='x', pady=5)
@@ -155,7 +177,7 @@ class MP3WAVToFLACConverterGUI(BaseAudioGUI):
         info_frame = ttk.Frame(self.root)
         info_frame.pack(fill='x', padx=10, pady=5)
         
-        info_text = "Supported formats: MP3, WAV | Output: FLAC, WAV or MP3 (44.1 kHz) saved in same folder | Optional: extract first 1-5 minutes | Requires FFmpeg installed"
+        info_text = "Supported formats: MP3, WAV | Output: FLAC, WAV or MP3 (44.1 kHz) saved in same folder | Optional: extract first 1-5 minutes | Parallel jobs | Requires FFmpeg installed"
         ttk.Label(info_frame, text=info_text, font=('Arial', 8)).pack()
     
     def set_busy(self, busy=True, message=""):
@@ -163,9 +185,17 @@ class MP3WAVToFLACConverterGUI(BaseAudioGUI):
         if busy:
             self.root.config(cursor="wait")
             self.progress_label.config(text=message)
+            self.cancel_button.config(state='normal')
         else:
             self.root.config(cursor="")
             self.progress_label.config(text="")
+            self.cancel_button.config(state='disabled')
+    
+    def cancel_conversion(self):
+        executor = self.job_executor
+        if executor is not None and not executor.cancelled:
+            executor.cancel()
+            self.log("[INFO] Cancelling conversion...")
     
     def _toggle_extract_minutes(self):
         """Enable or disable the minutes selector based on checkbox state."""
@@ -285,7 +315,7 @@ class MP3WAVToFLACConverterGUI(BaseAudioGUI):
         
         # Capture settings for use in conversion thread
         self._conversion_format = self.output_format_var.get().upper()
-        if self._conversion_format not in ('FLAC', 'WAV', 'MP3'):
+        if self._conversion_format not in AUDIO_TARGET_FORMATS:
             self._conversion_format = 'FLAC'
         extract_enabled = self.extract_enabled_var.get()
         extract_minutes = 0
@@ -297,6 +327,16 @@ class MP3WAVToFLACConverterGUI(BaseAudioGUI):
             except (ValueError, TypeError):
                 extract_minutes = 1
         self._extract_seconds = extract_minutes * 60 if extract_minutes else 0
+        try:
+            workers = max(1, min(MAX_JOB_WORKERS, int(self.workers_var.get())))
+        except (ValueError, TypeError):
+            workers = DEFAULT_JOB_WORKERS
+        try:
+            timeout_minutes = max(0, int(self.timeout_var.get()))
+        except (ValueError, TypeError):
+            timeout_minutes = DEFAULT_JOB_TIMEOUT_S // 60
+        self.job_executor = FFmpegJobExecutor(max_workers=workers, timeout=timeout_minutes * 60)
+        self._incremental = self.incremental_var.get()
         
         format_desc = f"{self._conversion_format} 44.1 kHz"
         if self._conversion_format == 'FLAC':
@@ -308,6 +348,10 @@ class MP3WAVToFLACConverterGUI(BaseAudioGUI):
         self.log(f"[INFO] Output format: {format_desc}")
         if self._extract_seconds:
             self.log(f"[INFO] Extracting first {self._extract_seconds // 60} minute(s)")
+        timeout_desc = f"{timeout_minutes} min per file" if timeout_minutes else "no timeout"
+        self.log(f"[INFO] Parallel jobs: {workers} ({timeout_desc})")
+        if self._incremental:
+            self.log("[INFO] Incremental mode: files already converted with the same settings are skipped")
         
         self.progress['maximum'] = len(self.conversion_queue)
         self.progress['value'] = 0
@@ -318,107 +362,152 @@ class MP3WAVToFLACConverterGUI(BaseAudioGUI):
         thread.daemon = True
         thread.start()
     
+    def _probe_inputs(self, input_files, max_workers):
+        """Audio stream info (codec, rate, channels) per input, probed in parallel"""
+        ffmpeg_path = self.get_ffmpeg_command()
+        ffprobe_path = resolve_ffprobe_cmd(ffmpeg_path)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='ffprobe') as pool:
+            streams = list(pool.map(lambda f: probe_audio_stream(ffmpeg_path, f, ffprobe_path), input_files))
+        return dict(zip(input_files, streams))
+    
+    def _can_stream_copy(self, stream):
+        """True if the source already has the target codec, 44.1 kHz and stereo"""
+        return bool(
+            stream
+            and stream.get('codec_name') == AUDIO_TARGET_CODECS[self._conversion_format]
+            and stream.get('sample_rate') == TARGET_SAMPLE_RATE
+            and stream.get('channels') == TARGET_CHANNELS
+        )
+    
+    def _build_conversion_command(self, input_file, output_file, stream=None):
+        ffmpeg_path = self.get_ffmpeg_command()
+        cmd = [ffmpeg_path, '-i', str(input_file)]
+        if self._extract_seconds:
+            cmd.extend(['-t', str(self._extract_seconds)])
+        cmd.append('-vn')  # No video
+        
+        if self._can_stream_copy(stream):
+            # Same codec and parameters: trim/rewrap without decoding
+            cmd.extend(['-c:a', 'copy', '-y', str(output_file)])
+            return cmd
+        
+        # Only resample/remix when the source differs from 44.1 kHz stereo
+        if not stream or stream.get('sample_rate') != TARGET_SAMPLE_RATE:
+            cmd.extend(['-ar', str(TARGET_SAMPLE_RATE)])
+        if not stream or stream.get('channels') != TARGET_CHANNELS:
+            cmd.extend(['-ac', str(TARGET_CHANNELS)])
+        cmd.extend(AUDIO_TARGET_CODEC_ARGS[self._conversion_format])
+        if self._conversion_format == 'MP3':
+            cmd.extend(['-b:a', MP3_TARGET_BITRATE])
+        cmd.extend(['-y', str(output_file)])
+        return cmd
+    
     def _conversion_thread(self):
-        success_count = 0
-        error_count = 0
+        """Convert the queue on the job executor; results are logged in queue order"""
+        executor = self.job_executor
         
-        if self._conversion_format == 'FLAC':
-            out_ext = '.flac'
-        elif self._conversion_format == 'WAV':
-            out_ext = '.wav'
-        else:
-            out_ext = '.mp3'
+        out_ext = AUDIO_TARGET_EXTENSIONS[self._conversion_format]
         
-        for i, input_file in enumerate(self.conversion_queue):
-            self.current_index = i + 1
-            
+        streams = self._probe_inputs(self.conversion_queue, executor.max_workers)
+        
+        jobs = []
+        copy_count = 0
+        for input_file in self.conversion_queue:
             input_path = Path(input_file)
             basename = input_path.stem
             if self._extract_seconds:
                 minutes = self._extract_seconds // 60
                 basename = f"{basename}_{minutes}min"
             output_file = os.path.join(input_path.parent, f"{basename}{out_ext}")
-            
+            stream = streams.get(input_file)
+            if self._can_stream_copy(stream):
+                if os.path.abspath(output_file) == os.path.abspath(input_file):
+                    self.root.after(
+                        0,
+                        lambda name=input_path.name: self.log(f"[INFO] Already {self._conversion_format} 44.1 kHz stereo, nothing to do: {name}")
+                    )
+                    continue
+                copy_count += 1
+            jobs.append({
+                'input': input_file,
+                'output': output_file,
+                'cmd': self._build_conversion_command(input_file, output_file, stream),
+            })
+        
+        if copy_count:
+            self.root.after(0, lambda n=copy_count: self.log(f"[INFO] Stream copy (no re-encode) for {n} file(s) already in the target format"))
+        
+        manifest = None
+        skipped_count = 0
+        if self._incremental:
+            manifest = BatchManifest()
+            jobs, unchanged = manifest.split(jobs)
+            skipped_count = len(unchanged)
+            for job in unchanged:
+                self.root.after(0, lambda name=os.path.basename(job['output']): self.log(f"[INFO] Unchanged, skipped: {name}"))
+        self.root.after(0, lambda n=len(jobs): self.progress.config(maximum=max(1, n)))
+        
+        def on_result(result, total):
+            name = os.path.basename(result['input'])
+            if result['ok'] and manifest is not None:
+                manifest.record(jobs[result['index']])
+            if result['ok']:
+                msg = f"[SUCCESS] ({result['index'] + 1}/{total}) Saved: {os.path.basename(result['output'])} ({result['seconds']:.1f}s)"
+            elif result['cancelled']:
+                msg = f"[INFO] ({result['index'] + 1}/{total}) Cancelled: {name}"
+            elif result['timed_out']:
+                msg = f"[ERROR] ({result['index'] + 1}/{total}) {name}: {result['error']}"
+            else:
+                msg = f"[ERROR] ({result['index'] + 1}/{total}) Conversion failed for {name}: {result['error'][-200:]}"
+            self.root.after(0, lambda m=msg: self.log(m))
+        
+        def on_progress(finished, total, _done):
+            self.current_index = finished
+            self.root.after(0, lambda v=finished: self.progress.config(value=v))
             self.root.after(
                 0,
-                lambda idx=i+1, total=len(self.conversion_queue), name=input_path.name:
-                self.set_busy(True, f"Converting {idx}/{total}: {name}")
+                lambda f=finished, t=total: self.set_busy(True, f"Converting: {f}/{t} done ({executor.max_workers} parallel jobs)")
             )
-            
+        
+        try:
+            results = executor.run(jobs, on_result=on_result, on_progress=on_progress)
+        except Exception as e:
+            error_msg = str(e)
+            self.root.after(0, lambda msg=error_msg: self.log(f"[ERROR] Exception: {msg}"))
+            results = []
+        if manifest is not None:
+            manifest.flush()
+        
+        success_count = sum(1 for r in results if r['ok'])
+        cancelled_count = sum(1 for r in results if r['cancelled'])
+        error_count = len(results) - success_count - cancelled_count
+        
+        throughput = format_throughput(batch_throughput(results, executor.elapsed()))
+        self.root.after(0, lambda t=throughput: self.log(f"[INFO] Throughput: {t}"))
+        
+        if executor.cancelled:
+            self.root.after(
+                0,
+                lambda s=success_count, e=error_count, c=cancelled_count:
+                self.log(f"\n[CANCELLED] Conversion stopped: {s} succeeded, {e} failed, {c} cancelled")
+            )
+        else:
             self.root.after(
                 0,
-                lambda msg=f"\n[INFO] Converting ({i+1}/{len(self.conversion_queue)}): {input_path.name}":
-                self.log(msg)
+                lambda s=success_count, e=error_count, k=skipped_count:
+                self.log(f"\n[COMPLETE] Conversion finished: {s} succeeded, {e} failed, {k} skipped (unchanged)")
             )
             
-            try:
-                ffmpeg_path = self.get_ffmpeg_command()
-                cmd = [ffmpeg_path, '-i', str(input_file)]
-                if self._extract_seconds:
-                    cmd.extend(['-t', str(self._extract_seconds)])
-                cmd.extend([
-                    '-vn',  # No video
-                    '-ar', '44100',  # Sample rate: 44.1 kHz
-                    '-ac', '2',  # Channels: stereo
-                ])
-                if self._conversion_format == 'FLAC':
-                    cmd.extend([
-                        '-acodec', 'flac',
-                        '-compression_level', '5',
-                    ])
-                elif self._conversion_format == 'WAV':
-                    cmd.extend(['-acodec', 'pcm_s16le'])
-                else:
-                    cmd.extend([
-                        '-acodec', 'libmp3lame',
-                        '-b:a', '320k',
-                    ])
-                cmd.extend(['-y', str(output_file)])
-                
-                process = self.run_ffmpeg_command(cmd)
-                
-                if process.returncode == 0:
-                    success_count += 1
-                    self.root.after(
-                        0,
-                        lambda out=output_file:
-                        self.log(f"[SUCCESS] Saved: {os.path.basename(out)}")
-                    )
-                else:
-                    error_count += 1
-                    error_msg = process.stderr if process.stderr else "Unknown error"
-                    self.root.after(
-                        0,
-                        lambda err=error_msg:
-                        self.log(f"[ERROR] Conversion failed: {err[:200]}")
-                    )
-                
-            except Exception as e:
-                error_count += 1
-                error_msg = str(e)
-                self.root.after(
-                    0,
-                    lambda msg=error_msg:
-                    self.log(f"[ERROR] Exception: {msg}")
+            self.root.after(
+                0,
+                lambda s=success_count, e=error_count, k=skipped_count:
+                messagebox.showinfo(
+                    "Conversion Complete",
+                    f"Conversion finished!\n\nSuccessful: {s}\nFailed: {e}\nSkipped (unchanged): {k}"
                 )
-            
-            self.root.after(0, lambda v=i+1: self.progress.config(value=v))
-        
-        self.root.after(
-            0,
-            lambda s=success_count, e=error_count:
-            self.log(f"\n[COMPLETE] Conversion finished: {s} succeeded, {e} failed")
-        )
-        
-        self.root.after(
-            0,
-            lambda s=success_count, e=error_count:
-            messagebox.showinfo(
-                "Conversion Complete",
-                f"Conversion finished!\n\nSuccessful: {s}\nFailed: {e}"
             )
-        )
         
+        self.job_executor = None
         self.root.after(0, lambda: self.set_busy(False))
     
     def convert_all_files(self):
@@ -19,9 +19,10 @@ limitations under the License.
 import os
 import re
 import sys
+import time
 import threading
 import subprocess
-from itertools import islice
+from collections import deque
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 
@@ -62,6 +63,15 @@ F_MAX = 20000.0
 MAX_DECODE_BYTES = 520_000_000
 Y_TICK_MIN_ROW_GAP = 9
 
+# Render scheduling: poll audio blocks often, but only redraw when the last
+# frame's cost leaves enough of the frame budget for Tk input handling.
+POLL_MS = 25
+MIN_POLL_MS = 8
+TARGET_FPS = 60.0
+RENDER_BUSY_FRACTION = 0.6
+RENDER_REPORT_S = 5.0
+VIZ_QUEUE_MAX = 64
+
 # Per-frame relative dB (peak bin = 0 dB) so raw FFT dB does not clip the colormap.
 SPEC_DB_VMIN = -78.0
 SPEC_DB_VMAX = 0.0
@@ -116,13 +126,122 @@ def display_frequencies(n_rows, log_scale):
     return np.linspace(F_MIN, F_MAX, n_rows)
 
 
+class FrameBudgetScheduler:
+    """Decides when a new spectrum column may be drawn and tracks frame stats.
+
+    Draw time is measured per backend ("2D" / "3D"). When the smoothed draw
+    time exceeds the budget, new columns are coalesced into the next redraw;
+    every column that never got its own frame counts as a dropped frame.
+    """
+
+    def __init__(
+        self,
+        target_fps=TARGET_FPS,
+        busy_fraction=RENDER_BUSY_FRACTION,
+        smoothing=0.2,
+    ):
+        self.min_interval = 1.0 / max(1.0, float(target_fps))
+        self.busy_fraction = max(0.05, min(1.0, float(busy_fraction)))
+        self.smoothing = float(smoothing)
+        self._draw_ema = {}
+        self._last_draw = 0.0
+        self.pending = 0
+        self.reset_stats(time.perf_counter())
+
+    def reset_stats(self, now):
+        self._window_start = now
+        self._frames = 0
+        self._dropped = 0
+        self._columns = 0
+
+    def add_pending(self, n=1):
+        self.pending += n
+        self._columns += n
+
+    def frame_interval(self, backend):
+        ema = self._draw_ema.get(backend, 0.0)
+        return max(self.min_interval, ema / self.busy_fraction)
+
+    def should_draw(self, backend, now):
+        if self.pending <= 0:
+            return False
+        return now - self._last_draw >= self.frame_interval(backend)
+
+    def record_draw(self, backend, seconds, now):
+        prev = self._draw_ema.get(backend)
+        if prev is None:
+            self._draw_ema[backend] = seconds
+        else:
+            self._draw_ema[backend] = prev + self.smoothing * (seconds - prev)
+        self._dropped += max(0, self.pending - 1)
+        self.pending = 0
+        self._frames += 1
+        self._last_draw = now
+
+    def next_delay_ms(self, backend, now):
+        wait = self.frame_interval(backend) - (now - self._last_draw)
+        return int(max(MIN_POLL_MS, min(POLL_MS, wait * 1000.0)))
+
+    def report(self, backend, now, force=False):
+        """Return a one-line stats summary every RENDER_REPORT_S (or when forced)."""
+        elapsed = now - self._window_start
+        if self._frames == 0 or (not force and elapsed < RENDER_REPORT_S):
+            return None
+        fps = self._frames / max(elapsed, 1e-6)
+        ms = self._draw_ema.get(backend, 0.0) * 1000.0
+        line = (
+            f"[INFO] Render {backend}: {fps:.1f} fps, {ms:.1f} ms/frame, "
+            f"{self._columns} columns, {self._dropped} dropped frames"
+        )
+        self.reset_stats(now)
+        return line
+
+
+class ImageBlitter:
+    """Redraws one animated artist over a cached axes background.
+
+    The background (axes face, ticks, labels) is captured after every full
+    draw; resizes and explicit invalidation force the next frame to be a full
+    draw so that a stale background is never blitted.
+    """
+
+    def __init__(self, canvas, ax, artist):
+        self._canvas = canvas
+        self._ax = ax
+        self._artist = artist
+        self._background = None
+        artist.set_animated(True)
+        canvas.mpl_connect("draw_event", self._on_draw)
+        canvas.mpl_connect("resize_event", self._on_resize)
+
+    def _on_draw(self, _event):
+        self._background = self._canvas.copy_from_bbox(self._ax.bbox)
+        self._ax.draw_artist(self._artist)
+
+    def _on_resize(self, _event):
+        self._background = None
+
+    def invalidate(self, redraw=True):
+        self._background = None
+        if redraw:
+            self._canvas.draw_idle()
+
+    def draw(self):
+        if self._background is None:
+            self._canvas.draw()
+            return
+        self._canvas.restore_region(self._background)
+        self._ax.draw_artist(self._artist)
+        self._canvas.blit(self._ax.bbox)
+
+
 class SpectrumAnalyzerGUI(BaseAudioGUI):
     def __init__(self, root):
         self._pcm = np.zeros(0, dtype=np.float32)
         self._play_pos = 0
         self._play_lock = threading.Lock()
         self._viz_lock = threading.Lock()
-        self._viz_block = None
+        self._viz_blocks = deque(maxlen=VIZ_QUEUE_MAX)
         self._stream = None
         self._playing = False
         self._poll_after_id = None
@@ -133,6 +252,11 @@ class SpectrumAnalyzerGUI(BaseAudioGUI):
         self._spec = np.full((N_FREQ_ROWS, N_TIME_COLS), SPEC_DB_VMIN, dtype=np.float32)
         self._cmap = _academo_cmap()
         self._hist_columns = []
+        # Absolute index of _hist_columns[0]; lets the GL surface recognise
+        # columns it has already uploaded as the view scrolls.
+        self._hist_base = 0
+        self._view_abs_start = 0
+        self._view_width = 0
         self._follow_live = True
         self._hist_pos = tk.IntVar(value=100)
         self._suppress_scroll = False
@@ -149,6 +273,7 @@ class SpectrumAnalyzerGUI(BaseAudioGUI):
         self._gl_auto_spin_var = tk.BooleanVar(value=False)
         self._gl_track_tone_var = tk.BooleanVar(value=False)
         self._gl_anim_after = None
+        self._scheduler = FrameBudgetScheduler()
 
         super().__init__(root, "Spectrum Analyzer")
         try:
@@ -256,6 +381,7 @@ class SpectrumAnalyzerGUI(BaseAudioGUI):
         self._canvas = FigureCanvasTkAgg(self._fig, master=self._plot_container)
         self._mpl_widget = self._canvas.get_tk_widget()
         self._mpl_widget.grid(row=0, column=0, sticky="nsew")
+        self._blitter = ImageBlitter(self._canvas, self._ax, self._img)
         self._update_y_ticks()
 
         if GL_AVAILABLE and SpectrumGLSurface is not None and self._cmap_lut is not None:
@@ -366,7 +492,8 @@ class SpectrumAnalyzerGUI(BaseAudioGUI):
         self._gl_anim_after = None
         if not self._view_is_3d() or self._gl_surface is None:
             return
-        if self._gl_auto_spin_var.get() or self._playing:
+        # While playing, _poll_visual drives redraws through the scheduler.
+        if self._gl_auto_spin_var.get() and not self._playing:
             self._gl_surface.request_redraw()
         self._gl_anim_after = self.root.after(33, self._gl_animation_tick)
 
@@ -490,8 +617,7 @@ class SpectrumAnalyzerGUI(BaseAudioGUI):
         self._ax.set_yticks(rows)
         self._ax.set_yticklabels(labels)
         self._apply_chart_style()
-        if not self._view_is_3d():
-            self._canvas.draw_idle()
+        self._blitter.invalidate(redraw=not self._view_is_3d())
 
     def _on_log_toggle(self):
         self._rebuild_freq_grid()
@@ -499,6 +625,7 @@ class SpectrumAnalyzerGUI(BaseAudioGUI):
         self._refresh_hist_view()
 
     def _clear_hist_buffer(self):
+        self._hist_base += len(self._hist_columns)
         self._hist_columns.clear()
         self._follow_live = True
         self._suppress_scroll = True
@@ -522,8 +649,10 @@ class SpectrumAnalyzerGUI(BaseAudioGUI):
         self._follow_live = x >= 100
         self._refresh_hist_view()
 
-    def _refresh_hist_view(self):
+    def _rebuild_spec_view(self):
         n = len(self._hist_columns)
+        start = 0
+        w = 0
         if n == 0:
             self._spec.fill(SPEC_DB_VMIN)
         else:
@@ -535,7 +664,7 @@ class SpectrumAnalyzerGUI(BaseAudioGUI):
                 frac = (s - 10) / 90.0
                 frac = max(0.0, min(1.0, frac))
                 start = int(round((1.0 - frac) * max_start)) if max_start > 0 else 0
-            cols = list(islice(self._hist_columns, start, start + N_TIME_COLS))
+            cols = self._hist_columns[start : start + N_TIME_COLS]
             w = len(cols)
             if w == 0:
                 self._spec.fill(SPEC_DB_VMIN)
@@ -543,9 +672,14 @@ class SpectrumAnalyzerGUI(BaseAudioGUI):
                 self._spec[:, :w] = np.column_stack(cols)
                 if w < N_TIME_COLS:
                     self._spec[:, w:].fill(SPEC_DB_VMIN)
+        self._view_abs_start = self._hist_base + start
+        self._view_width = w
         self._img.set_data(self._spec)
+
+    def _refresh_hist_view(self):
+        self._rebuild_spec_view()
         if not self._view_is_3d():
-            self._canvas.draw_idle()
+            self._blitter.draw()
         if (
             self._gl_ui_ok
             and self._gl_surface is not None
@@ -607,7 +741,7 @@ class SpectrumAnalyzerGUI(BaseAudioGUI):
             finished = self._play_pos >= n_pcm
         block = np.ascontiguousarray(take, dtype=np.float32)
         with self._viz_lock:
-            self._viz_block = block
+            self._viz_blocks.append(block)
         if finished:
             self.root.after(0, self._on_playback_finished)
 
@@ -617,26 +751,52 @@ class SpectrumAnalyzerGUI(BaseAudioGUI):
         self._pause()
         self.log("[INFO] Playback finished")
 
+    def _render_backend(self):
+        if self._gl_ui_ok and self._gl_surface is not None and self._view_is_3d():
+            return "3D"
+        return "2D"
+
+    def _draw_scheduled_frame(self, backend):
+        """Rebuild the visible window and draw it synchronously so it can be timed."""
+        self._rebuild_spec_view()
+        if backend == "3D":
+            self._gl_surface.draw_now()
+        else:
+            self._blitter.draw()
+
     def _poll_visual(self):
         self._poll_after_id = None
         if not self._playing:
             return
-        block = None
         with self._viz_lock:
-            if self._viz_block is not None:
-                block = self._viz_block
-                self._viz_block = None
-        if block is not None:
-            col = self._column_relative_db(self._spectrum_column(block))
-            self._hist_columns.append(col)
-            if len(self._hist_columns) > MAX_HISTORY_COLS:
-                del self._hist_columns[: len(self._hist_columns) - MAX_HISTORY_COLS]
+            blocks = list(self._viz_blocks)
+            self._viz_blocks.clear()
+        if blocks:
+            for block in blocks:
+                col = self._column_relative_db(self._spectrum_column(block))
+                self._hist_columns.append(col)
+            excess = len(self._hist_columns) - MAX_HISTORY_COLS
+            if excess > 0:
+                del self._hist_columns[:excess]
+                self._hist_base += excess
             if self._follow_live:
                 self._suppress_scroll = True
                 self._hist_pos.set(100)
                 self._suppress_scroll = False
-            self._refresh_hist_view()
-        self._poll_after_id = self.root.after(25, self._poll_visual)
+            self._scheduler.add_pending(len(blocks))
+        backend = self._render_backend()
+        now = time.perf_counter()
+        if self._scheduler.should_draw(backend, now):
+            self._draw_scheduled_frame(backend)
+            done = time.perf_counter()
+            self._scheduler.record_draw(backend, done - now, done)
+            now = done
+        line = self._scheduler.report(backend, now)
+        if line:
+            self.log(line)
+        self._poll_after_id = self.root.after(
+            self._scheduler.next_delay_ms(backend, now), self._poll_visual
+        )
 
     def _stop_poll(self):
         if self._poll_after_id is not None:
@@ -773,6 +933,7 @@ class SpectrumAnalyzerGUI(BaseAudioGUI):
         self._playing = True
         self._play_btn.config(state=tk.DISABLED)
         self._pause_btn.config(state=tk.NORMAL)
+        self._scheduler.reset_stats(time.perf_counter())
         try:
             self._stream = sd.OutputStream(
                 samplerate=TARGET_SR,
@@ -792,11 +953,20 @@ class SpectrumAnalyzerGUI(BaseAudioGUI):
         self._poll_visual()
 
     def _pause(self):
+        was_playing = self._playing
         self._playing = False
         self._stop_poll()
         self._close_stream()
         with self._viz_lock:
-            self._viz_block = None
+            self._viz_blocks.clear()
+        if was_playing:
+            line = self._scheduler.report(self._render_backend(), time.perf_counter(), force=True)
+            if line:
+                self.log(line)
+        if self._scheduler.pending:
+            # Columns coalesced into a frame that never got drawn.
+            self._scheduler.pending = 0
+            self._refresh_hist_view()
         self._play_btn.config(state=tk.NORMAL if len(self._pcm) else tk.DISABLED)
         self._pause_btn.config(state=tk.DISABLED)
 
@@ -25,6 +25,8 @@ import sys
 import threading
 import subprocess
 import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Import shared libraries
@@ -34,6 +36,16 @@ from lib.gui_utils import GUIManager, LogManager
 from lib.file_utils import FileManager
 from lib.process_utils import ProcessManager
 from lib.ffmpeg_utils import FFmpegManager
+from lib.ffmpeg_jobs import (
+    AUDIO_TARGET_CODEC_ARGS, AUDIO_TARGET_EXTENSIONS, AUDIO_TARGET_FORMATS, DEFAULT_JOB_WORKERS,
+    DEFAULT_VARIANT_SET, MAX_JOB_WORKERS, TARGET_SAMPLE_RATE, PitchEngine, create_job_executor,
+    parse_variant_set, prepare_pitch_engine, run_modification_jobs, speed_pitch_jobs, speed_pitch_suffix,
+    variant_set_jobs,
+)
+from lib.ytdlp_utils import YtDlpRunner, last_error_line, read_reported_filepath
+
+DEFAULT_PARALLEL_DOWNLOADS = 2
+DEFAULT_CONVERSION_WORKERS = max(1, (os.cpu_count() or 2) - 1)
 
 
 class StreamDownloadConvertToolsUnifiedGUI(BaseAudioGUI):
@@ -46,6 +58,13 @@ class StreamDownloadConvertToolsUnifiedGUI(BaseAudioGUI):
         self.csv_data = []
         self.available_streams = []
         self.current_video_info = None
+        self.batch_cancelled = False
+        # Tracks the batch's yt-dlp processes so Cancel can terminate them
+        self.batch_runner = YtDlpRunner(
+            lambda args, client_type: args,
+            use_engine=lambda: False,
+            is_cancelled=lambda: self.batch_cancelled,
+        )
         
         # Direct link tab attributes
         self.direct_link_url = None
@@ -55,6 +74,7 @@ class StreamDownloadConvertToolsUnifiedGUI(BaseAudioGUI):
         # Audio Modifier attributes
         self.selected_audio_files = []
         self.modification_queue = []
+        self.job_executor = None  # FFmpegJobExecutor while a modification batch runs
         
         self.setup_ui()
         
@@ -160,7 +180,26 @@ class StreamDownloadConvertToolsUnifiedGUI(BaseAudioGUI):
         # Download frame
         download_frame = ttk.Frame(self.tab_youtube)
         download_frame.pack(fill='x', padx=10, pady=10)
-        
+
+        # Pipeline: convert each file as soon as its download finishes
+        pipeline_frame = ttk.Frame(download_frame)
+        pipeline_frame.pack(fill='x', pady=5)
+
+        self.pipeline_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(pipeline_frame, text="Convert after download", variable=self.pipeline_var).pack(side='left', padx=5)
+        self.pipeline_format_var = tk.StringVar(value='FLAC')
+        pipeline_format_combo = ttk.Combobox(pipeline_frame, textvariable=self.pipeline_format_var, width=6, state='readonly')
+        pipeline_format_combo['values'] = AUDIO_TARGET_FORMATS
+        pipeline_format_combo.pack(side='left', padx=5)
+        self.pipeline_modify_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(pipeline_frame, text="Apply speed/pitch", variable=self.pipeline_modify_var).pack(side='left', padx=5)
+        ttk.Label(pipeline_frame, text="Parallel downloads:").pack(side='left', padx=(10, 2))
+        self.parallel_downloads_var = tk.StringVar(value=str(DEFAULT_PARALLEL_DOWNLOADS))
+        ttk.Spinbox(pipeline_frame, textvariable=self.parallel_downloads_var, from_=1, to=8, width=4).pack(side='left')
+        ttk.Label(pipeline_frame, text="Converters:").pack(side='left', padx=(10, 2))
+        self.conversion_workers_var = tk.StringVar(value=str(DEFAULT_CONVERSION_WORKERS))
+        ttk.Spinbox(pipeline_frame, textvariable=self.conversion_workers_var, from_=1, to=max(16, DEFAULT_CONVERSION_WORKERS), width=4).pack(side='left')
+
         # Batch processing buttons
         batch_frame = ttk.Frame(download_frame)
         batch_frame.pack(fill='x', pady=5)
@@ -168,6 +207,8 @@ class StreamDownloadConvertToolsUnifiedGUI(BaseAudioGUI):
         ttk.Button(batch_frame, text="Download Selected Stream", command=self.download_stream).pack(side='left', padx=5)
         ttk.Button(batch_frame, text="Download Selected Videos", command=self.download_selected_videos).pack(side='left', padx=5)
         ttk.Button(batch_frame, text="Download All Videos", command=self.download_all_videos).pack(side='left', padx=5)
+        self.youtube_cancel_button = ttk.Button(batch_frame, text="Cancel", command=self.cancel_batch_download, state='disabled')
+        self.youtube_cancel_button.pack(side='left', padx=5)
         
         self.youtube_log_text = scrolledtext.ScrolledText(download_frame, height=6)
         self.youtube_log_text.pack(fill='both', expand=True)
@@ -242,6 +283,21 @@ class StreamDownloadConvertToolsUnifiedGUI(BaseAudioGUI):
         quality_combo['values'] = ('128k', '192k', '256k', '320k')
         quality_combo.grid(row=3, column=1, sticky='w', padx=5)
         
+        ttk.Label(settings_frame, text="Parallel Jobs:").grid(row=4, column=0, sticky='w', pady=5)
+        jobs_frame = ttk.Frame(settings_frame)
+        jobs_frame.grid(row=4, column=1, sticky='w', padx=5)
+        self.modifier_workers_var = tk.StringVar(value=str(DEFAULT_JOB_WORKERS))
+        ttk.Spinbox(jobs_frame, textvariable=self.modifier_workers_var, from_=1, to=MAX_JOB_WORKERS, width=10).pack(side='left')
+        ttk.Label(jobs_frame, text=" (files processed at the same time)").pack(side='left', padx=5)
+        
+        self.rubberband_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(settings_frame, text="Use rubberband for pitch (if FFmpeg has it)",
+                        variable=self.rubberband_var).grid(row=5, column=0, columnspan=2, sticky='w', pady=5)
+        
+        self.incremental_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text="Skip unchanged files (incremental re-runs)",
+                        variable=self.incremental_var).grid(row=6, column=0, columnspan=2, sticky='w', pady=5)
+        
         preset_frame = ttk.LabelFrame(self.tab_modifier, text="Quick Presets", padding=10)
         preset_frame.pack(fill='x', padx=10, pady=10)
         
@@ -254,6 +310,15 @@ class StreamDownloadConvertToolsUnifiedGUI(BaseAudioGUI):
         ttk.Button(btn_preset_frame, text="Pitch +1", command=lambda: self.apply_preset(0, 1)).pack(side='left', padx=2)
         ttk.Button(btn_preset_frame, text="Reset", command=lambda: self.apply_preset(0, 0)).pack(side='left', padx=2)
         
+        # Variant set: several speed/pitch/bitrate versions per file from a single decode
+        variant_frame = ttk.LabelFrame(self.tab_modifier, text="Variant Set", padding=10)
+        variant_frame.pack(fill='x', padx=10, pady=10)
+        
+        self.variant_set_var = tk.StringVar(value=DEFAULT_VARIANT_SET)
+        ttk.Entry(variant_frame, textvariable=self.variant_set_var, width=40).pack(side='left', padx=2)
+        ttk.Button(variant_frame, text="Render Variant Set", command=self.start_variant_set).pack(side='left', padx=5)
+        ttk.Label(variant_frame, text="speed%:pitch[:bitrate], comma separated", font=('Arial', 8)).pack(side='left', padx=5)
+        
         modify_frame = ttk.Frame(self.tab_modifier)
         modify_frame.pack(fill='x', padx=10, pady=10)
         
@@ -263,6 +328,8 @@ class StreamDownloadConvertToolsUnifiedGUI(BaseAudioGUI):
         
         ttk.Button(batch_frame, text="Modify Selected Files", command=self.start_modification).pack(side='left', padx=5)
         ttk.Button(batch_frame, text="Modify All Files", command=self.modify_all_files).pack(side='left', padx=5)
+        self.modifier_cancel_button = ttk.Button(batch_frame, text="Cancel", command=self.cancel_modification, state='disabled')
+        self.modifier_cancel_button.pack(side='left', padx=5)
         
         self.modifier_progress = ttk.Progressbar(modify_frame, mode='determinate')
         self.modifier_progress.pack(fill='x', pady=5)
@@ -400,7 +467,8 @@ class StreamDownloadConvertToolsUnifiedGUI(BaseAudioGUI):
         info_text = """Stream Download Convert Tools - Unified Application
 
 Features:
-- YouTube Downloader: Download videos from CSV lists
+- YouTube Downloader: Download videos from CSV lists (optionally converting each
+  file to FLAC/WAV/MP3 as soon as it finishes downloading)
 - Audio Modifier: Adjust speed and pitch of audio files
 - Direct Link: Download from a single URL
 - Automatic venv management via launcher scripts
@@ -425,11 +493,14 @@ Note: FFmpeg is required for audio/video processing.
                 self.youtube_progress_label.config(text=message)
             elif tab == "modifier":
                 self.modifier_progress_label.config(text=message)
+                self.modifier_cancel_button.config(state='normal')
         else:
             self.root.config(cursor="")
             self.youtube_progress.stop()
             self.youtube_progress_label.config(text="")
+            self.youtube_cancel_button.config(state='disabled')
             self.modifier_progress_label.config(text="")
+            self.modifier_cancel_button.config(state='disabled')
     
     def log(self, message, tab="youtube"):
         if tab == "youtube":
@@ -774,14 +845,13 @@ Note: FFmpeg is required for audio/video processing.
         item = stream_selection[0]
         format_id = str(self.stream_tree.item(item)['values'][0])
         
+        settings = self._pipeline_settings()
+        if settings is None:
+            return
+        
         selected_indices = list(selection)
         self.log(f"[INFO] Starting batch download of {len(selected_indices)} videos with format {format_id}", "youtube")
-        
-        self.set_busy(True, f"Downloading {len(selected_indices)} videos...", "youtube")
-        
-        thread = threading.Thread(target=self._batch_download_thread, args=(selected_indices, format_id))
-        thread.daemon = True
-        thread.start()
+        self._start_batch_download(selected_indices, format_id, settings, f"Downloading {len(selected_indices)} videos...")
     
     def download_all_videos(self):
         """Download all videos using the same stream format"""
@@ -801,99 +871,298 @@ Note: FFmpeg is required for audio/video processing.
         item = stream_selection[0]
         format_id = str(self.stream_tree.item(item)['values'][0])
         
+        settings = self._pipeline_settings()
+        if settings is None:
+            return
+        
         all_indices = list(range(len(self.csv_data)))
         self.log(f"[INFO] Starting batch download of all {len(all_indices)} videos with format {format_id}", "youtube")
+        self._start_batch_download(all_indices, format_id, settings, f"Downloading all {len(all_indices)} videos...")
+    
+    def _start_batch_download(self, video_indices, format_id, settings, message):
+        """Mark the YouTube tab busy for the whole batch and run it on a worker thread"""
+        self.batch_cancelled = False
+        self.set_busy(True, message, "youtube")
+        self.youtube_cancel_button.config(state='normal')
         
-        self.set_busy(True, f"Downloading all {len(all_indices)} videos...", "youtube")
-        
-        thread = threading.Thread(target=self._batch_download_thread, args=(all_indices, format_id))
+        thread = threading.Thread(target=self._batch_download_thread, args=(video_indices, format_id, settings))
         thread.daemon = True
         thread.start()
     
-    def _batch_download_thread(self, video_indices, format_id):
-        success_count = 0
-        error_count = 0
-        
-        for i, index in enumerate(video_indices):
-            try:
-                row = self.csv_data[index]
-                url = self.extract_youtube_url(row.get('Video Link', ''))
-                
-                if not url:
-                    error_count += 1
-                    self.root.after(0, lambda idx=index+1: self.log(f"[ERROR] Video {idx}: Could not extract URL", "youtube"))
-                    continue
-                
-                filename_pattern = self.filename_var.get()
-                filename = self.create_filename_from_pattern(filename_pattern, row)
-                
-                self.root.after(
-                    0,
-                    lambda idx=i+1, total=len(video_indices), name=row.get('Song Title', 'Unknown'):
-                    self.set_busy(True, f"Downloading {idx}/{total}: {name}", "youtube")
-                )
-                
+    def cancel_batch_download(self):
+        """Stop starting new downloads/conversions and terminate running yt-dlp processes"""
+        if self.batch_cancelled:
+            return
+        self.batch_cancelled = True
+        self.youtube_cancel_button.config(state='disabled')
+        self.batch_runner.terminate_all()
+        self.log("[INFO] Cancelling batch download (running conversions are finished first)...", "youtube")
+    
+    def _pipeline_settings(self):
+        """Read the batch download and pipeline options on the UI thread.
+        
+        Returns:
+            dict with 'parallel_downloads' and 'convert' (None unless pipeline
+            mode is on), or None if a value is invalid and an error was shown.
+        """
+        try:
+            parallel_downloads = max(1, int(self.parallel_downloads_var.get()))
+            conversion_workers = max(1, int(self.conversion_workers_var.get()))
+        except ValueError:
+            messagebox.showerror("Error", "Parallel downloads and converters must be whole numbers")
+            return None
+        
+        settings = {'parallel_downloads': parallel_downloads, 'convert': None}
+        if not self.pipeline_var.get():
+            return settings
+        
+        if not self.check_ffmpeg():
+            self.offer_ffmpeg_install()
+            return None
+        
+        speed_percent, pitch_semitones = 0.0, 0.0
+        if self.pipeline_modify_var.get():
+            values = self._read_modification_settings()
+            if values is None:
+                return None
+            speed_percent, pitch_semitones = values
+        
+        self.file_manager.set_folder_path('converted', self.converted_folder_var.get())
+        output_folder = self.file_manager.get_folder_path('converted')
+        self.ensure_directory(output_folder)
+        
+        settings['convert'] = {
+            'format': self.pipeline_format_var.get(),
+            'speed': speed_percent,
+            'pitch': pitch_semitones,
+            'bitrate': self.modifier_quality_var.get(),  # MP3 only; codecs are the converter's
+            'workers': conversion_workers,
+            'folder': output_folder,
+            'rubberband': self.rubberband_var.get(),
+        }
+        
+        target = settings['convert']['format']
+        if speed_percent or pitch_semitones:
+            target += f" (speed {speed_percent:+.1f}%, pitch {pitch_semitones:+.1f} st)"
+        self.log(f"[INFO] Pipeline mode: converting to {target} with {conversion_workers} worker(s) into {output_folder}", "youtube")
+        return settings
+    
+    def _batch_download_thread(self, video_indices, format_id, settings):
+        """Download rows with a pool of parallel downloads.
+        
+        In pipeline mode every finished download is handed straight to a
+        separate conversion pool, so ffmpeg work overlaps the remaining
+        network-bound downloads instead of running after the whole batch.
+        """
+        total = len(video_indices)
+        convert = settings['convert']
+        counts = {'success': 0, 'error': 0, 'converted': 0, 'convert_failed': 0, 'skipped': 0}
+        counts_lock = threading.Lock()
+        conversions = []
+        converter = None
+        if convert:
+            convert['engine'] = PitchEngine(self.get_ffmpeg_command(), convert['rubberband'])
+            converter = ThreadPoolExecutor(max_workers=convert['workers'], thread_name_prefix='convert')
+        
+        def convert_one(filepath):
+            if self.batch_cancelled:
+                with counts_lock:
+                    counts['skipped'] += 1
+                return
+            ok = self._pipeline_convert(filepath, convert)
+            with counts_lock:
+                counts['converted' if ok else 'convert_failed'] += 1
+        
+        def download_one(position, index):
+            if self.batch_cancelled:
+                with counts_lock:
+                    counts['skipped'] += 1
+                return
+            ok, filepath = self._batch_download_item(position, index, total, format_id)
+            with counts_lock:
+                if self.batch_cancelled and not ok:
+                    counts['skipped'] += 1
+                else:
+                    counts['success' if ok else 'error'] += 1
+            if not ok or converter is None:
+                return
+            if filepath:
+                with counts_lock:
+                    conversions.append(converter.submit(convert_one, filepath))
+            else:
+                with counts_lock:
+                    counts['convert_failed'] += 1
                 self.root.after(
                     0,
-                    lambda msg=f"\n[INFO] Downloading ({i+1}/{len(video_indices)}): {row.get('Song Title', 'Unknown')} - {row.get('Artist', 'Unknown')}":
-                    self.log(msg, "youtube")
-                )
-                
-                output_path = os.path.join(self.file_manager.get_folder_path('downloads'), filename)
-                
-                cmd = [
-                    'yt-dlp',
-                    '-f', format_id,
-                    '-o', output_path + '.%(ext)s',
-                    url
-                ]
-                
-                process = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+                    lambda idx=index+1: self.log(f"[WARNING] Video {idx}: Downloaded file not found, skipping conversion", "youtube")
                 )
-                
-                if process.returncode == 0:
-                    success_count += 1
-                    self.root.after(
-                        0,
-                        lambda out=filename: self.log(f"[SUCCESS] Downloaded: {out}", "youtube")
-                    )
-                else:
-                    error_count += 1
-                    error_msg = process.stderr if process.stderr else "Unknown error"
+        
+        try:
+            with ThreadPoolExecutor(max_workers=settings['parallel_downloads'], thread_name_prefix='download') as downloads:
+                for position, index in enumerate(video_indices):
+                    downloads.submit(download_one, position, index)
+            
+            if converter is not None:
+                with counts_lock:
+                    pending = len([f for f in conversions if not f.done()])
+                if pending and not self.batch_cancelled:
                     self.root.after(
                         0,
-                        lambda err=error_msg: self.log(f"[ERROR] Download failed: {err[:200]}", "youtube")
+                        lambda n=pending: self.youtube_progress_label.config(text=f"Downloads finished, converting {n} remaining file(s)...")
                     )
-                
-            except Exception as e:
-                error_count += 1
-                error_msg = str(e)
-                self.root.after(
-                    0,
-                    lambda msg=error_msg: self.log(f"[ERROR] Exception: {msg}", "youtube")
-                )
+        finally:
+            if converter is not None:
+                converter.shutdown(wait=True)
+        
+        summary = f"{counts['success']} succeeded, {counts['error']} failed"
+        details = f"Successful: {counts['success']}\nFailed: {counts['error']}"
+        if convert:
+            summary += f"; converted {counts['converted']}, conversion failed {counts['convert_failed']}"
+            details += f"\n\nConverted: {counts['converted']}\nConversion failed: {counts['convert_failed']}"
+        status = "finished"
+        if self.batch_cancelled:
+            status = "cancelled"
+            summary += f"; {counts['skipped']} skipped"
+            details += f"\n\nSkipped: {counts['skipped']}"
         
         self.root.after(
             0,
-            lambda s=success_count, e=error_count:
-            self.log(f"\n[COMPLETE] Batch download finished: {s} succeeded, {e} failed", "youtube")
+            lambda msg=summary: self.log(f"\n[COMPLETE] Batch download {status}: {msg}", "youtube")
         )
         
         self.root.after(
             0,
-            lambda s=success_count, e=error_count:
+            lambda msg=details:
             messagebox.showinfo(
                 "Batch Download Complete",
-                f"Batch download finished!\n\nSuccessful: {s}\nFailed: {e}"
+                f"Batch download {status}!\n\n{msg}"
             )
         )
         
         self.root.after(0, lambda: self.set_busy(False, tab="youtube"))
     
+    def _batch_download_item(self, position, index, total, format_id):
+        """Download one CSV row.
+        
+        Returns:
+            Tuple of (success, final file path reported by yt-dlp or None)
+        """
+        report_path = None
+        try:
+            row = self.csv_data[index]
+            url = self.extract_youtube_url(row.get('Video Link', ''))
+            
+            if not url:
+                self.root.after(0, lambda idx=index+1: self.log(f"[ERROR] Video {idx}: Could not extract URL", "youtube"))
+                return False, None
+            
+            filename_pattern = self.filename_var.get()
+            filename = self.create_filename_from_pattern(filename_pattern, row)
+            
+            self.root.after(
+                0,
+                lambda idx=position+1, name=row.get('Song Title', 'Unknown'):
+                self.youtube_progress_label.config(text=f"Downloading {idx}/{total}: {name}")
+            )
+            
+            self.root.after(
+                0,
+                lambda msg=f"\n[INFO] Downloading ({position+1}/{total}): {row.get('Song Title', 'Unknown')} - {row.get('Artist', 'Unknown')}":
+                self.log(msg, "youtube")
+            )
+            
+            output_path = os.path.join(self.file_manager.get_folder_path('downloads'), filename)
+            
+            fd, report_path = tempfile.mkstemp(prefix='ytdlp_', suffix='.txt')
+            os.close(fd)
+            
+            cmd = [
+                'yt-dlp',
+                '-f', format_id,
+                '-o', output_path + '.%(ext)s',
+                '--print-to-file', 'after_move:filepath', report_path,
+                url
+            ]
+            
+            returncode, _, stderr = self.batch_runner.run_subprocess(cmd)
+            
+            if returncode == 0:
+                self.root.after(
+                    0,
+                    lambda out=filename: self.log(f"[SUCCESS] Downloaded: {out}", "youtube")
+                )
+                return True, read_reported_filepath(report_path)
+            
+            if self.batch_cancelled:
+                return False, None
+            self.root.after(
+                0,
+                lambda err=last_error_line(stderr): self.log(f"[ERROR] Download failed: {err}", "youtube")
+            )
+            return False, None
+        
+        except Exception as e:
+            error_msg = str(e)
+            self.root.after(
+                0,
+                lambda msg=error_msg: self.log(f"[ERROR] Exception: {msg}", "youtube")
+            )
+            return False, None
+        finally:
+            if report_path:
+                try:
+                    os.remove(report_path)
+                except OSError:
+                    pass
+    
+    def _pipeline_convert(self, input_file, convert):
+        """Convert one downloaded file to the pipeline target format. Returns True on success."""
+        input_path = Path(input_file)
+        target_format = convert['format']
+        # Pipeline targets are always written at 44.1 kHz; asetrate works from the probed source rate
+        filters, sample_rate = convert['engine'].filters(input_file, convert['speed'], convert['pitch'], output_rate=TARGET_SAMPLE_RATE)
+        suffix = speed_pitch_suffix(convert['speed'], convert['pitch']) if filters else ""
+        output_file = os.path.join(
+            convert['folder'],
+            f"{input_path.stem}{suffix}{AUDIO_TARGET_EXTENSIONS.get(target_format, '.flac')}"
+        )
+        
+        self.root.after(
+            0,
+            lambda msg=f"[INFO] Converting to {target_format}: {input_path.name}": self.log(msg, "youtube")
+        )
+        
+        try:
+            cmd = self.build_ffmpeg_command(
+                input_file, output_file,
+                audio_filters=filters,
+                audio_bitrate=convert['bitrate'],
+                sample_rate=sample_rate,
+                codec_args=AUDIO_TARGET_CODEC_ARGS.get(target_format, AUDIO_TARGET_CODEC_ARGS['FLAC'])
+            )
+            
+            process = self.run_ffmpeg_command(cmd)
+            
+            if process.returncode == 0:
+                self.root.after(
+                    0,
+                    lambda out=output_file: self.log(f"[SUCCESS] Converted: {os.path.basename(out)}", "youtube")
+                )
+                return True
+            
+            error_msg = process.stderr if process.stderr else "Unknown error"
+            self.root.after(
+                0,
+                lambda name=input_path.name, err=error_msg: self.log(f"[ERROR] Conversion failed for {name}: {err[-200:]}", "youtube")
+            )
+        except Exception as e:
+            error_msg = str(e)
+            self.root.after(
+                0,
+                lambda msg=error_msg: self.log(f"[ERROR] Conversion exception: {msg}", "youtube")
+            )
+        return False
+    
     # Audio Modifier methods
     def select_audio_files(self):
         files = self.select_files(
@@ -931,35 +1200,50 @@ Note: FFmpeg is required for audio/video processing.
             self.modifier_folder_var.set(folder)
             self.file_manager.set_folder_path('output', folder)
     
+    def cancel_modification(self):
+        executor = self.job_executor
+        if executor is not None and not executor.cancelled:
+            executor.cancel()
+            self.log("[INFO] Cancelling modification...", "modifier")
+    
     def apply_preset(self, speed, pitch):
         self.speed_var.set(str(speed))
         self.pitch_var.set(str(pitch))
         self.log(f"[INFO] Applied preset: Speed {speed:+d}%, Pitch {pitch:+d} semitones", "modifier")
     
-    def start_modification(self):
-        if self.is_busy:
-            messagebox.showwarning("Warning", "Modification already in progress")
-            return
-        
-        if not self.selected_audio_files:
-            messagebox.showwarning("Warning", "Please select at least one audio file")
-            return
-        
+    def _read_modification_settings(self):
+        """Validated (speed_percent, pitch_semitones) from the modifier tab, or None after showing an error."""
         try:
             speed_percent = float(self.speed_var.get())
             pitch_semitones = float(self.pitch_var.get())
         except ValueError:
             messagebox.showerror("Error", "Invalid speed or pitch value. Please enter valid numbers.")
-            return
+            return None
         
         if speed_percent < -50 or speed_percent > 100:
             messagebox.showerror("Error", "Speed adjustment must be between -50% and +100%")
-            return
+            return None
         
         if pitch_semitones < -12 or pitch_semitones > 12:
             messagebox.showerror("Error", "Pitch adjustment must be between -12 and +12 semitones")
+            return None
+        
+        return speed_percent, pitch_semitones
+    
+    def start_modification(self):
+        if self.is_busy:
+            messagebox.showwarning("Warning", "Modification already in progress")
             return
         
+        if not self.selected_audio_files:
+            messagebox.showwarning("Warning", "Please select at least one audio file")
+            return
+        
+        values = self._read_modification_settings()
+        if values is None:
+            return
+        speed_percent, pitch_semitones = values
+        
         if speed_percent == 0 and pitch_semitones == 0:
             messagebox.showwarning("Warning", "No modifications specified (both speed and pitch are 0)")
             return
@@ -972,11 +1256,16 @@ Note: FFmpeg is required for audio/video processing.
         self.ensure_directory(self.file_manager.get_folder_path('output'))
         
         self.modification_queue = self.selected_audio_files.copy()
+        self.job_executor = create_job_executor(self.modifier_workers_var.get())
+        self._incremental = self.incremental_var.get()
         
         self.log(f"[INFO] Starting modification of {len(self.modification_queue)} file(s)", "modifier")
         self.log(f"[INFO] Output folder: {self.file_manager.get_folder_path('output')}", "modifier")
         self.log(f"[INFO] Speed: {speed_percent:+.1f}%, Pitch: {pitch_semitones:+.1f} semitones", "modifier")
         self.log(f"[INFO] Audio quality: {self.modifier_quality_var.get()}", "modifier")
+        self.log(f"[INFO] Parallel jobs: {self.job_executor.max_workers}", "modifier")
+        if self._incremental:
+            self.log("[INFO] Incremental mode: files already modified with the same settings are skipped", "modifier")
         
         self.modifier_progress['maximum'] = len(self.modification_queue)
         self.modifier_progress['value'] = 0
@@ -987,95 +1276,97 @@ Note: FFmpeg is required for audio/video processing.
         thread.daemon = True
         thread.start()
     
-    def _modification_thread(self, speed_percent, pitch_semitones):
-        success_count = 0
-        error_count = 0
+    def start_variant_set(self):
+        """Render every variant of the variant set for the selected files"""
+        if self.is_busy:
+            messagebox.showwarning("Warning", "Modification already in progress")
+            return
         
-        for i, input_file in enumerate(self.modification_queue):
-            input_path = Path(input_file)
-            
-            suffix_parts = []
-            if speed_percent != 0:
-                suffix_parts.append(f"speed{speed_percent:+.0f}pct")
-            if pitch_semitones != 0:
-                suffix_parts.append(f"pitch{pitch_semitones:+.0f}st")
-            
-            suffix = "_" + "_".join(suffix_parts) if suffix_parts else "_modified"
-            output_file = os.path.join(self.file_manager.get_folder_path('output'), f"{input_path.stem}{suffix}{input_path.suffix}")
-            
-            self.root.after(
-                0,
-                lambda idx=i+1, total=len(self.modification_queue), name=input_path.name:
-                self.set_busy(True, f"Modifying {idx}/{total}: {name}", "modifier")
+        if not self.selected_audio_files:
+            messagebox.showwarning("Warning", "Please select at least one audio file")
+            return
+        
+        try:
+            variants = parse_variant_set(self.variant_set_var.get(), self.modifier_quality_var.get())
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        
+        if not self.check_ffmpeg():
+            self.offer_ffmpeg_install()
+            return
+        
+        self.file_manager.set_folder_path('output', self.modifier_folder_var.get())
+        self.ensure_directory(self.file_manager.get_folder_path('output'))
+        
+        self.modification_queue = self.selected_audio_files.copy()
+        self.job_executor = create_job_executor(self.modifier_workers_var.get())
+        self._incremental = self.incremental_var.get()
+        
+        variant_desc = ", ".join(f"{speed:+.0f}%/{pitch:+.0f}st@{bitrate}" for speed, pitch, bitrate in variants)
+        self.log(f"[INFO] Rendering {len(variants)} variant(s) of {len(self.modification_queue)} file(s), one decode per file", "modifier")
+        self.log(f"[INFO] Variants: {variant_desc}", "modifier")
+        self.log(f"[INFO] Output folder: {self.file_manager.get_folder_path('output')}", "modifier")
+        self.log(f"[INFO] Parallel jobs: {self.job_executor.max_workers}", "modifier")
+        if self._incremental:
+            self.log("[INFO] Incremental mode: files already modified with the same settings are skipped", "modifier")
+        
+        self.modifier_progress['maximum'] = len(self.modification_queue)
+        self.modifier_progress['value'] = 0
+        
+        self.set_busy(True, "Rendering variants...", "modifier")
+        
+        thread = threading.Thread(target=self._modification_thread, kwargs={'variants': variants})
+        thread.daemon = True
+        thread.start()
+    
+    def _modification_thread(self, speed_percent=0.0, pitch_semitones=0.0, variants=None):
+        """Build the batch's jobs (one speed/pitch setting, or every variant of a variant set) and run them"""
+        executor = self.job_executor
+        output_folder = self.file_manager.get_folder_path('output')
+        ffmpeg_path = self.get_ffmpeg_command()
+        engine = prepare_pitch_engine(ffmpeg_path, self.rubberband_var.get(), self.modification_queue, executor.max_workers)
+        self.root.after(0, lambda name=engine.name: self.log(f"[INFO] Pitch engine: {name}", "modifier"))
+        
+        if variants:
+            jobs = variant_set_jobs(ffmpeg_path, self.modification_queue, variants, output_folder, engine)
+        else:
+            audio_bitrate = self.modifier_quality_var.get()
+            jobs = speed_pitch_jobs(
+                self.modification_queue, output_folder, speed_percent, pitch_semitones, engine,
+                lambda input_file, output_file, filters, sample_rate: self.build_ffmpeg_command(
+                    input_file, output_file,
+                    audio_filters=filters,
+                    audio_bitrate=audio_bitrate,
+                    sample_rate=sample_rate
+                )
             )
-            
+        
+        def on_progress(finished, total, files_per_min):
+            self.root.after(0, lambda v=finished, t=total: self.modifier_progress.config(maximum=max(1, t), value=v))
             self.root.after(
                 0,
-                lambda msg=f"\n[INFO] Modifying ({i+1}/{len(self.modification_queue)}): {input_path.name}":
-                self.log(msg, "modifier")
+                lambda f=finished, t=total, rate=files_per_min:
+                self.modifier_progress_label.config(text=f"Modifying: {f}/{t} done ({rate:.1f} files/min, {executor.max_workers} parallel jobs)")
             )
-            
-            try:
-                filters = []
-                
-                if speed_percent != 0:
-                    speed_factor = 1.0 + (speed_percent / 100.0)
-                    filters.append(f"atempo={speed_factor}")
-                
-                if pitch_semitones != 0:
-                    pitch_factor = 2 ** (pitch_semitones / 12.0)
-                    filters.append(f"asetrate=44100*{pitch_factor},aresample=44100")
-                
-                cmd = self.build_ffmpeg_command(
-                    input_file, output_file,
-                    audio_filters=filters,
-                    audio_bitrate=self.modifier_quality_var.get()
-                )
-                
-                process = self.run_ffmpeg_command(cmd)
-                
-                if process.returncode == 0:
-                    success_count += 1
-                    self.root.after(
-                        0,
-                        lambda out=output_file:
-                        self.log(f"[SUCCESS] Saved: {os.path.basename(out)}", "modifier")
-                    )
-                else:
-                    error_count += 1
-                    error_msg = process.stderr if process.stderr else "Unknown error"
-                    self.root.after(
-                        0,
-                        lambda err=error_msg:
-                        self.log(f"[ERROR] Modification failed: {err[:200]}", "modifier")
-                    )
-                
-            except Exception as e:
-                error_count += 1
-                error_msg = str(e)
-                self.root.after(
-                    0,
-                    lambda msg=error_msg:
-                    self.log(f"[ERROR] Exception: {msg}", "modifier")
-                )
-            
-            self.root.after(0, lambda v=i+1: self.modifier_progress.config(value=v))
         
-        self.root.after(
-            0,
-            lambda s=success_count, e=error_count:
-            self.log(f"\n[COMPLETE] Modification finished: {s} succeeded, {e} failed", "modifier")
+        counts = run_modification_jobs(
+            executor, jobs, self._incremental,
+            log=lambda msg: self.root.after(0, lambda m=msg: self.log(m, "modifier")),
+            on_progress=on_progress,
         )
         
-        self.root.after(
-            0,
-            lambda s=success_count, e=error_count:
-            messagebox.showinfo(
-                "Modification Complete",
-                f"Modification finished!\n\nSuccessful: {s}\nFailed: {e}"
+        if not executor.cancelled:
+            self.root.after(
+                0,
+                lambda c=counts:
+                messagebox.showinfo(
+                    "Modification Complete",
+                    f"Modification finished!\n\nSuccessful: {c['succeeded']}\nFailed: {c['failed']}\nSkipped (unchanged): {c['skipped']}"
+                )
             )
-        )
         
+        self.job_executor = None
         self.root.after(0, lambda: self.set_busy(False, tab="modifier"))
     
     def modify_all_files(self):
@@ -23,6 +23,7 @@ import sys
 import threading
 import subprocess
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image, ImageTk
 
@@ -37,7 +38,9 @@ except ImportError:
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from lib.video_encode_settings import ffmpeg_video_encode_args
-from lib.video_utils import parse_dropped_paths
+from lib.video_utils import (
+    DEFAULT_PARALLEL_ENCODES, DEFAULT_THREAD_BUDGET, parse_dropped_paths, split_thread_budget, with_thread_limit,
+)
 
 
 class FormatCropTab:
@@ -65,6 +68,11 @@ class FormatCropTab:
         self.video_max_duration = 0  # Will be set when video is selected
         self.last_selected_video_file = None  # Track last selected video file
         self.truncate_only_var = tk.BooleanVar(value=False)
+        self.parallel_jobs_var = tk.StringVar(value=str(DEFAULT_PARALLEL_ENCODES))
+        
+        # Probe results (resolution, duration) shared by the UI and the batch workers
+        self._probe_cache = {}
+        self._probe_cache_lock = threading.Lock()
         
         self.settings_loaded = False  # Flag to prevent saving during load
         
@@ -121,6 +129,42 @@ class FormatCropTab:
     def _ffmpeg_video_encode_args(self):
         """Global Codec / Quality / Preset for MP4 re-encodes."""
         return ffmpeg_video_encode_args(self.app.get_video_encode_opts())
+
+    def _read_parallel_jobs(self):
+        """Parallel job count from the settings, with the default for invalid input."""
+        try:
+            return max(1, int(self.parallel_jobs_var.get()))
+        except (ValueError, TypeError):
+            return DEFAULT_PARALLEL_ENCODES
+
+    def _batch_settings(self, output_format="MP4", job_count=1):
+        """
+        Snapshot the UI settings a batch needs, read once on the main thread.
+        
+        Worker threads only use this dict, never the Tk variables. For a
+        parallel batch the CPU threads are split between the jobs.
+        """
+        batch = {
+            'video_mode': self.video_mode_var.get() if output_format == "MP4" else "forward",
+            'trim_duration': self.get_requested_trim_duration(),
+            'encode_args': self._ffmpeg_video_encode_args(),
+            'ffmpeg_ok': self.ffmpeg_manager.check_ffmpeg(),
+            'jobs': 1,
+            'threads': None,
+        }
+        if job_count > 1:
+            batch['jobs'], batch['threads'] = split_thread_budget(
+                DEFAULT_THREAD_BUDGET, self._read_parallel_jobs(), job_count
+            )
+            if batch['jobs'] == 1:
+                batch['threads'] = None
+        return batch
+
+    def _limit_threads(self, cmd, batch):
+        """Cap ffmpeg's -threads when the batch runs several jobs at once."""
+        if batch['threads']:
+            return with_thread_limit(cmd, batch['threads'])
+        return cmd
     
     def setup_ui(self):
         # File selection frame
@@ -254,6 +298,12 @@ class FormatCropTab:
         self.input_format_label = ttk.Label(settings_frame, text="No file selected", foreground="gray")
         self.input_format_label.grid(row=6, column=1, sticky='w', padx=5)
         
+        ttk.Label(settings_frame, text="Parallel Jobs:").grid(row=9, column=0, sticky='w', pady=5)
+        jobs_frame = ttk.Frame(settings_frame)
+        jobs_frame.grid(row=9, column=1, columnspan=2, sticky='w', padx=5)
+        ttk.Spinbox(jobs_frame, textvariable=self.parallel_jobs_var, from_=1, to=32, width=5).pack(side='left')
+        ttk.Label(jobs_frame, text="(files converted at the same time)", font=('Arial', 8), foreground='gray').pack(side='left', padx=5)
+        
         # Processing frame
         process_frame = ttk.Frame(self.parent)
         process_frame.pack(fill='x', padx=10, pady=10)
@@ -331,39 +381,37 @@ class FormatCropTab:
         ext = os.path.splitext(file_path)[1].lower()
         return ext in video_extensions
     
-    def get_video_resolution(self, video_file):
-        """Get video resolution (width, height) from video file."""
+    def _probe_cache_key(self, video_file):
+        """Cache key for a probe: path plus size and mtime, so edited files are re-probed."""
         try:
-            ffmpeg_cmd = self.ffmpeg_manager.get_ffmpeg_command()
-            probe_cmd = [ffmpeg_cmd, '-i', video_file, '-f', 'null', '-']
-            probe_result = subprocess.run(probe_cmd, capture_output=True, text=True, timeout=10)
-            
-            for line in probe_result.stderr.split('\n'):
-                if 'Video:' in line and 'x' in line:
-                    try:
-                        parts = line.split('Video:')[1].split(',')
-                        for part in parts:
-                            if 'x' in part:
-                                res_part = part.strip().split()[0]
-                                if 'x' in res_part and res_part.replace('x', '').replace('-', '').isdigit():
-                                    w, h = res_part.split('x')
-                                    return int(w), int(h)
-                    except:
-                        pass
-            return None, None
-        except Exception as e:
-            self.log(f"[WARNING] Could not get resolution for {os.path.basename(video_file)}: {e}")
-            return None, None
-    
-    def get_video_duration(self, video_file):
-        """Get video duration in seconds from video file."""
+            st = os.stat(video_file)
+        except OSError:
+            return None
+        return os.path.abspath(video_file), st.st_size, st.st_mtime_ns
+
+    def _probe_video(self, video_file):
+        """
+        Probe resolution and duration with a single header read, cached per file.
+
+        Returns a dict with 'width', 'height' and 'duration' (None when unknown).
+        Safe to call from worker threads; the cache is shared by the whole tab.
+        """
+        key = self._probe_cache_key(video_file)
+        if key is not None:
+            with self._probe_cache_lock:
+                cached = self._probe_cache.get(key)
+            if cached is not None:
+                return cached
+
+        info = {'width': None, 'height': None, 'duration': None}
         try:
             ffmpeg_cmd = self.ffmpeg_manager.get_ffmpeg_command()
-            probe_cmd = [ffmpeg_cmd, '-i', video_file, '-f', 'null', '-']
+            # Header only: without an output ffmpeg exits right after printing the stream info
+            probe_cmd = [ffmpeg_cmd, '-hide_banner', '-i', video_file]
             probe_result = subprocess.run(probe_cmd, capture_output=True, text=True, timeout=10)
             
             for line in probe_result.stderr.split('\n'):
-                if 'Duration:' in line:
+                if info['duration'] is None and 'Duration:' in line:
                     try:
                         # Extract duration string like "00:00:06.00"
                         duration_str = line.split('Duration:')[1].split(',')[0].strip()
@@ -373,14 +421,50 @@ class FormatCropTab:
                             hours = float(time_parts[0])
                             minutes = float(time_parts[1])
                             seconds = float(time_parts[2])
-                            total_seconds = hours * 3600 + minutes * 60 + seconds
-                            return total_seconds
-                    except Exception as e:
+                            info['duration'] = hours * 3600 + minutes * 60 + seconds
+                    except Exception:
+                        pass
+                if info['width'] is None and 'Video:' in line and 'x' in line:
+                    try:
+                        parts = line.split('Video:')[1].split(',')
+                        for part in parts:
+                            if 'x' in part:
+                                res_part = part.strip().split()[0]
+                                if 'x' in res_part and res_part.replace('x', '').replace('-', '').isdigit():
+                                    w, h = res_part.split('x')
+                                    info['width'], info['height'] = int(w), int(h)
+                                    break
+                    except Exception:
                         pass
-            return None
         except Exception as e:
-            self.log(f"[WARNING] Could not get duration for {os.path.basename(video_file)}: {e}")
-        return None
+            self.root.after(
+                0,
+                lambda name=os.path.basename(video_file), err=e:
+                self.log(f"[WARNING] Could not probe {name}: {err}")
+            )
+            return info
+
+        if key is not None:
+            with self._probe_cache_lock:
+                self._probe_cache[key] = info
+        return info
+
+    def prefetch_video_probes(self, files, max_workers):
+        """Probe every video in a batch once, in parallel, before the jobs start."""
+        videos = list(dict.fromkeys(f for f in files if self.is_video_file(f)))
+        if not videos:
+            return
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(videos)))) as pool:
+            list(pool.map(self._probe_video, videos))
+
+    def get_video_resolution(self, video_file):
+        """Get video resolution (width, height) from video file."""
+        info = self._probe_video(video_file)
+        return info['width'], info['height']
+    
+    def get_video_duration(self, video_file):
+        """Get video duration in seconds from video file."""
+        return self._probe_video(video_file)['duration']
 
     def _get_active_video_file(self):
         """Return the currently selected video file path, if any."""
@@ -678,7 +762,7 @@ class FormatCropTab:
         # Default to highest quality (first in list)
         return resolutions[0]
     
-    def convert_image(self, input_path, output_path, target_ratio, crop_position, output_format):
+    def convert_image(self, input_path, output_path, target_ratio, crop_position, output_format, batch=None):
         """Convert a single image to target aspect ratio and format"""
         try:
             with Image.open(input_path) as img:
@@ -745,8 +829,11 @@ class FormatCropTab:
                 # Save with appropriate format
                 if output_format == "MP4":
                     # Convert image to MP4 video (single frame, 1 second duration)
-                    video_mode = self.video_mode_var.get()
-                    return self._convert_image_to_mp4(cropped_img, output_path, target_ratio, video_mode)
+                    if batch is None:
+                        batch = self._batch_settings(output_format)
+                    return self._convert_image_to_mp4(
+                        cropped_img, output_path, target_ratio, batch['video_mode'], batch
+                    )
                 elif output_format == "JPG":
                     cropped_img.save(output_path, "JPEG", quality=95)
                 else:
@@ -756,11 +843,13 @@ class FormatCropTab:
         except Exception as e:
             return False, str(e)
     
-    def _convert_image_to_mp4(self, img, output_path, target_ratio=None, video_mode="forward"):
+    def _convert_image_to_mp4(self, img, output_path, target_ratio=None, video_mode="forward", batch=None):
         """Convert a PIL Image to MP4 video (single frame, 1 second)"""
+        if batch is None:
+            batch = self._batch_settings("MP4")
         try:
             ffmpeg_cmd = self.ffmpeg_manager.get_ffmpeg_command()
-            if not ffmpeg_cmd or not self.ffmpeg_manager.check_ffmpeg():
+            if not ffmpeg_cmd or not batch['ffmpeg_ok']:
                 return False, "FFmpeg not available. Please install FFmpeg."
             
             # Save image to temporary file
@@ -787,8 +876,9 @@ class FormatCropTab:
                                '-filter_complex', 
                                f'[0:v]{scale_filter}[v_scaled];[0:v]{scale_filter}[v_scaled2];[v_scaled2]reverse[v_rev];[v_scaled][v_rev]concat=n=2:v=1:a=0[v_final]',
                                '-map', '[v_final]']
-                    temp_cmd.extend(self._ffmpeg_video_encode_args())
+                    temp_cmd.extend(batch['encode_args'])
                     temp_cmd.extend(['-pix_fmt', 'yuv420p', temp_video])
+                    temp_cmd = self._limit_threads(temp_cmd, batch)
                     
                     result = subprocess.run(temp_cmd, capture_output=True, text=True, timeout=30)
                     
@@ -819,8 +909,9 @@ class FormatCropTab:
                     # Forward only - create 1-second video from image
                     cmd = [ffmpeg_cmd, '-loop', '1', '-i', temp_img.name,
                           '-t', '1', '-vf', f'scale={output_width}:{output_height}']
-                    cmd.extend(self._ffmpeg_video_encode_args())
+                    cmd.extend(batch['encode_args'])
                     cmd.extend(['-pix_fmt', 'yuv420p', '-y', output_path])
+                    cmd = self._limit_threads(cmd, batch)
                     
                     result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
                     
@@ -838,11 +929,18 @@ class FormatCropTab:
         except Exception as e:
             return False, str(e)
     
-    def convert_video(self, input_path, output_path, target_ratio, crop_position, output_format):
-        """Convert a video to target aspect ratio and format using FFmpeg"""
+    def convert_video(self, input_path, output_path, target_ratio, crop_position, output_format, batch=None):
+        """
+        Convert a video to target aspect ratio and format using FFmpeg.
+        
+        batch is the settings snapshot from _batch_settings(); without it the
+        current UI values are read (single-file use from the main thread).
+        """
+        if batch is None:
+            batch = self._batch_settings(output_format)
         try:
             ffmpeg_cmd = self.ffmpeg_manager.get_ffmpeg_command()
-            if not ffmpeg_cmd or not self.ffmpeg_manager.check_ffmpeg():
+            if not ffmpeg_cmd or not batch['ffmpeg_ok']:
                 return False, "FFmpeg not available. Please install FFmpeg."
             
             # Get video resolution
@@ -890,10 +988,8 @@ class FormatCropTab:
             # This ensures the final output has exact aspect ratio
             scale_filter = f"crop={crop_width}:{crop_height}:{crop_x}:{crop_y},scale={output_width}:{output_height}"
             
-            # Get video mode for MP4 output
-            video_mode = self.video_mode_var.get() if output_format == "MP4" else "forward"
-            
-            selected_duration = self.get_requested_trim_duration()
+            video_mode = batch['video_mode']
+            selected_duration = batch['trim_duration']
             
             if video_mode == "forward_reverse":
                 # Create forward-reverse video
@@ -930,9 +1026,10 @@ class FormatCropTab:
                     temp_cmd.extend(['-filter:a', f'atrim=duration={selected_duration},asetpts=PTS-STARTPTS'])
                 temp_cmd.extend(['-map', '0:a?'])
                 
-                temp_cmd.extend(self._ffmpeg_video_encode_args())
+                temp_cmd.extend(batch['encode_args'])
                 temp_cmd.extend(['-c:a', 'aac', '-b:a', '192k'])
                 temp_cmd.append(temp_video)
+                temp_cmd = self._limit_threads(temp_cmd, batch)
                 
                 result = subprocess.run(temp_cmd, capture_output=True, text=True, timeout=300)
                 
@@ -965,11 +1062,12 @@ class FormatCropTab:
                     cmd.extend(['-t', str(selected_duration)])
                 
                 # Set output format and codec (videos always output as MP4)
-                cmd.extend(self._ffmpeg_video_encode_args())
+                cmd.extend(batch['encode_args'])
                 # Try to copy audio, fallback to AAC if copy fails
                 cmd.extend(['-c:a', 'aac', '-b:a', '192k'])
                 
                 cmd.extend(['-y', output_path])  # -y to overwrite
+                cmd = self._limit_threads(cmd, batch)
                 
                 # Run FFmpeg
                 result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
@@ -985,11 +1083,13 @@ class FormatCropTab:
         except Exception as e:
             return False, str(e)
 
-    def truncate_video(self, input_path, duration_seconds):
+    def truncate_video(self, input_path, duration_seconds, batch=None):
         """Shorten a video to the first N seconds without cropping or resizing."""
+        if batch is None:
+            batch = self._batch_settings()
         try:
             ffmpeg_cmd = self.ffmpeg_manager.get_ffmpeg_command()
-            if not ffmpeg_cmd or not self.ffmpeg_manager.check_ffmpeg():
+            if not ffmpeg_cmd or not batch['ffmpeg_ok']:
                 return False, "FFmpeg not available. Please install FFmpeg."
 
             output_path = self.get_trim_output_path(input_path, duration_seconds)
@@ -997,12 +1097,13 @@ class FormatCropTab:
                 ffmpeg_cmd, '-y', '-i', input_path,
                 '-t', str(duration_seconds),
             ]
-            cmd.extend(self._ffmpeg_video_encode_args())
+            cmd.extend(batch['encode_args'])
             cmd.extend([
                 '-c:a', 'aac', '-b:a', '192k',
                 '-movflags', '+faststart',
                 output_path,
             ])
+            cmd = self._limit_threads(cmd, batch)
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
             if result.returncode == 0 and os.path.exists(output_path):
                 return True, None
@@ -1062,51 +1163,42 @@ class FormatCropTab:
                 self.log("[INFO] Truncate cancelled by user (overwrite declined)")
                 return
 
+        batch = self._batch_settings(job_count=len(files_to_process))
         thread = threading.Thread(
             target=self._truncate_files_thread,
-            args=(files_to_process, duration_seconds)
+            args=(files_to_process, duration_seconds, batch)
         )
         thread.daemon = True
         thread.start()
 
-    def _truncate_files_thread(self, files_to_process, duration_seconds):
+    def _truncate_files_thread(self, files_to_process, duration_seconds, batch):
         self.is_busy = True
-        self.set_busy(True, "Truncating videos...")
-
-        total = len(files_to_process)
-        success_count = 0
-        error_count = 0
-
-        self.progress['maximum'] = total
-        self.progress['value'] = 0
-        self.app.set_progress(value=0, maximum=total, message='Truncating videos...')
+        self.root.after(0, lambda: self.set_busy(True, "Truncating videos..."))
 
-        for idx, (input_path, expected_output_path) in enumerate(files_to_process):
-            self.progress['value'] = idx + 1
-            msg = f"Truncating {idx + 1}/{total}: {os.path.basename(input_path)}"
-            self.progress_label.config(text=msg)
-            self.app.set_progress(value=idx + 1, maximum=total, message=msg)
-            self.root.update_idletasks()
+        def truncate_one(input_path, output_path):
+            return self.truncate_video(input_path, duration_seconds, batch)
 
-            success, result = self.truncate_video(input_path, duration_seconds)
+        def log_result(input_path, output_path, success, error):
             if success:
-                success_count += 1
-                output_name = os.path.basename(expected_output_path)
                 self.log(
                     f"[SUCCESS] Truncated to {duration_seconds:g}s: "
-                    f"{os.path.basename(input_path)} -> {output_name}"
+                    f"{os.path.basename(input_path)} -> {os.path.basename(output_path)}"
                 )
             else:
-                error_count += 1
-                self.log(f"[ERROR] Failed to truncate {os.path.basename(input_path)}: {result}")
+                self.log(f"[ERROR] Failed to truncate {os.path.basename(input_path)}: {error}")
 
-        self.is_busy = False
-        self.set_busy(False)
-        self.progress_label.config(text=f"Truncate done: {success_count} ok, {error_count} errors")
-        messagebox.showinfo(
-            "Truncate Complete",
-            f"Truncation finished!\n\nSuccess: {success_count}\nErrors: {error_count}"
+        success_count, error_count = self._run_batch(
+            files_to_process, batch, truncate_one, log_result, "Truncating"
         )
+
+        def finish():
+            self.set_busy(False)
+            self.progress_label.config(text=f"Truncate done: {success_count} ok, {error_count} errors")
+            messagebox.showinfo(
+                "Truncate Complete",
+                f"Truncation finished!\n\nSuccess: {success_count}\nErrors: {error_count}"
+            )
+        self.root.after(0, finish)
     
     def convert_selected(self):
         selection = self.file_listbox.curselection()
@@ -1200,53 +1292,105 @@ class FormatCropTab:
             return
         
         # Start conversion in thread
+        batch = self._batch_settings(output_format, len(files_to_process))
         thread = threading.Thread(
             target=self._convert_files_thread,
-            args=(files_to_process, target_ratio, crop_position, output_format, truncate_duration)
+            args=(files_to_process, target_ratio, crop_position, output_format, batch, truncate_duration)
         )
         thread.daemon = True
         thread.start()
     
-    def _convert_files_thread(self, files_to_process, target_ratio, crop_position, output_format, truncate_duration=None):
+    def _convert_files_thread(self, files_to_process, target_ratio, crop_position, output_format, batch, truncate_duration=None):
         self.is_busy = True
-        self.set_busy(True, "Converting files...")
-        
-        total = len(files_to_process)
-        success_count = 0
-        error_count = 0
+        self.root.after(0, lambda: self.set_busy(True, "Converting files..."))
         
-        self.progress['maximum'] = total
-        self.progress['value'] = 0
-        self.app.set_progress(value=0, maximum=total, message='Converting files...')
+        # Probe every video that gets cropped once, in parallel, before the jobs start
+        if truncate_duration is None:
+            self.root.after(0, lambda: self.progress_label.config(text="Probing videos..."))
+            self.prefetch_video_probes([input_path for input_path, _ in files_to_process], batch['jobs'])
         
-        for idx, (input_path, output_path) in enumerate(files_to_process):
-            self.progress['value'] = idx + 1
-            msg = f"Processing {idx + 1}/{total}: {os.path.basename(input_path)}"
-            self.progress_label.config(text=msg)
-            self.app.set_progress(value=idx + 1, maximum=total, message=msg)
-            self.root.update_idletasks()
-            
+        def convert_one(input_path, output_path):
             if truncate_duration is not None and self.is_video_file(input_path):
-                success, error = self.truncate_video(input_path, truncate_duration)
-            elif self.is_video_file(input_path):
-                success, error = self.convert_video(input_path, output_path, target_ratio, crop_position, output_format)
-            else:
-                success, error = self.convert_image(input_path, output_path, target_ratio, crop_position, output_format)
-            
+                return self.truncate_video(input_path, truncate_duration, batch)
+            if self.is_video_file(input_path):
+                return self.convert_video(input_path, output_path, target_ratio, crop_position, output_format, batch)
+            return self.convert_image(input_path, output_path, target_ratio, crop_position, output_format, batch)
+        
+        def log_result(input_path, output_path, success, error):
             if success:
-                success_count += 1
                 self.log(f"[SUCCESS] Converted: {os.path.basename(input_path)} -> {os.path.basename(output_path)}")
             else:
-                error_count += 1
                 self.log(f"[ERROR] Failed to convert {os.path.basename(input_path)}: {error}")
         
-        self.set_busy(False)
-        self.progress_label.config(text=f"Completed: {success_count} successful, {error_count} errors")
-        
-        messagebox.showinfo(
-            "Conversion Complete",
-            f"Conversion finished!\n\nSuccess: {success_count}\nErrors: {error_count}"
+        success_count, error_count = self._run_batch(
+            files_to_process, batch, convert_one, log_result, "Processing"
         )
+        
+        def finish():
+            self.set_busy(False)
+            self.progress_label.config(text=f"Completed: {success_count} successful, {error_count} errors")
+            messagebox.showinfo(
+                "Conversion Complete",
+                f"Conversion finished!\n\nSuccess: {success_count}\nErrors: {error_count}"
+            )
+        self.root.after(0, finish)
+    
+    def _run_batch(self, files_to_process, batch, process_one, log_result, verb):
+        """
+        Run process_one(input_path, output_path) -> (success, error) on batch['jobs'] threads.
+        
+        Progress counts finished files, so app.set_progress always climbs
+        0..total in steps of one whatever order the jobs finish in. Results
+        are logged in input order. Returns (success_count, error_count).
+        """
+        total = len(files_to_process)
+        results = [None] * total
+        lock = threading.Lock()
+        state = {'finished': 0, 'logged': 0}
+        
+        def show_progress(finished, name):
+            msg = f"{verb} {finished}/{total}: {name}"
+            self.progress.config(maximum=total, value=finished)
+            self.progress_label.config(text=msg)
+            self.app.set_progress(value=finished, maximum=total, message=msg)
+        
+        def run_one(index):
+            input_path, output_path = files_to_process[index]
+            try:
+                success, error = process_one(input_path, output_path)
+            except Exception as e:
+                success, error = False, str(e)
+            # Queue the UI updates under the lock so they reach the Tk loop in order
+            with lock:
+                results[index] = (success, error)
+                state['finished'] += 1
+                self.root.after(
+                    0,
+                    lambda f=state['finished'], name=os.path.basename(input_path): show_progress(f, name)
+                )
+                while state['logged'] < total and results[state['logged']] is not None:
+                    i = state['logged']
+                    self.root.after(
+                        0,
+                        lambda paths=files_to_process[i], result=results[i]: log_result(*paths, *result)
+                    )
+                    state['logged'] += 1
+        
+        self.root.after(0, lambda: (
+            self.progress.config(maximum=total, value=0),
+            self.app.set_progress(value=0, maximum=total, message=f"{verb} files..."),
+        ))
+        if batch['jobs'] > 1:
+            self.root.after(
+                0,
+                lambda j=batch['jobs'], t=batch['threads']:
+                self.log(f"[INFO] Parallel jobs: {j} x {t} thread(s)")
+            )
+        with ThreadPoolExecutor(max_workers=batch['jobs'], thread_name_prefix='format-crop') as pool:
+            list(pool.map(run_one, range(total)))
+        
+        success_count = sum(1 for success, _ in results if success)
+        return success_count, total - success_count
     
     def set_busy(self, busy=True, message=""):
         self.is_busy = busy
@@ -1300,6 +1444,9 @@ class FormatCropTab:
                 if 'truncate_only' in settings:
                     self.truncate_only_var.set(bool(settings['truncate_only']))
                 
+                if 'parallel_jobs' in settings:
+                    self.parallel_jobs_var.set(str(settings['parallel_jobs']))
+                
                 self.log("[INFO] Settings loaded from file")
         except Exception as e:
             self.log(f"[WARNING] Could not load settings: {e}")
@@ -1322,7 +1469,8 @@ class FormatCropTab:
                 'output_format': self.output_format_var.get(),
                 'video_mode': self.video_mode_var.get(),
                 'video_duration': self.video_duration_var.get(),
-                'truncate_only': self.truncate_only_var.get()
+                'truncate_only': self.truncate_only_var.get(),
+                'parallel_jobs': self.parallel_jobs_var.get()
             }
             
             self.app.set_tab_settings(self._settings_key, settings)
@@ -1340,6 +1488,7 @@ class FormatCropTab:
         self.video_mode_var.trace('w', lambda *args: self.save_settings())
         self.video_duration_var.trace('w', lambda *args: self.save_settings())
         self.truncate_only_var.trace('w', lambda *args: self.save_settings())
+        self.parallel_jobs_var.trace('w', lambda *args: self.save_settings())
     
     def save_on_exit(self):
         self.save_settings()
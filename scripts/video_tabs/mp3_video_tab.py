@@ -31,6 +31,10 @@ import subprocess
 import json
 import random
 import hashlib
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image
 
@@ -41,6 +45,14 @@ from lib.gui_utils import GUIManager, LogManager
 from lib.file_utils import FileManager
 from lib.process_utils import ProcessManager
 from lib.ffmpeg_utils import FFmpegManager
+from lib.video_utils import (
+    DEFAULT_PARALLEL_ENCODES, DEFAULT_THREAD_BUDGET, STILL_IMAGE_FPS, STILL_IMAGE_GOP_S, build_concat_mux_command, build_loop_intro_filter,
+    build_loop_unit_filter, build_still_image_prescale_command, build_visual_loop_mux_command,
+    escape_for_concat, loop_unit_count, probe_duration, resolve_ffprobe_cmd, run_ffmpeg,
+    run_ffmpeg_with_progress, split_thread_budget, still_image_encode_args, transition_input_filter, with_thread_limit,
+)
+
+MP3_VIDEO_JOB_TIMEOUT_S = 3 * 60 * 60
 
 
 class Mp3ToVideoTab:
@@ -76,6 +88,12 @@ class Mp3ToVideoTab:
         self.video_width = None
         self.video_height = None
         
+        # Pre-scaled images and rendered visual tracks for the current batch
+        # (see _prescaled_still_image and _cached_visual_track)
+        self._visual_cache = {}
+        self._visual_cache_dir = None
+        self._visual_cache_lock = threading.RLock()
+        
         # Scaling mode for aspect ratio handling
         self.scaling_mode = tk.StringVar(value="stretch")
         
@@ -336,6 +354,16 @@ class Mp3ToVideoTab:
         ttk.Label(scaling_desc_frame, text="Expand: Fit with black bars", font=('Arial', 8), foreground='gray').pack()
         ttk.Label(scaling_desc_frame, text="Truncate: Crop to fit", font=('Arial', 8), foreground='gray').pack()
         
+        ttk.Label(settings_frame, text="Parallel Jobs:").grid(row=5, column=0, sticky='w', pady=5)
+        jobs_frame = ttk.Frame(settings_frame)
+        jobs_frame.grid(row=5, column=1, columnspan=2, sticky='w', padx=5)
+        self.parallel_jobs_var = tk.StringVar(value=str(DEFAULT_PARALLEL_ENCODES))
+        ttk.Spinbox(jobs_frame, textvariable=self.parallel_jobs_var, from_=1, to=32, width=5).pack(side='left')
+        ttk.Label(jobs_frame, text="Thread budget:").pack(side='left', padx=(10, 0))
+        self.thread_budget_var = tk.StringVar(value=str(DEFAULT_THREAD_BUDGET))
+        ttk.Spinbox(jobs_frame, textvariable=self.thread_budget_var, from_=1, to=256, width=5).pack(side='left', padx=5)
+        ttk.Label(jobs_frame, text="(threads shared by all jobs)", font=('Arial', 8), foreground='gray').pack(side='left')
+        
         # Transition Settings (only shown when multiple files selected)
         self.transition_frame = ttk.LabelFrame(main_frame, text="Transition Settings", padding=10)
         self.transition_frame.pack(fill='x', pady=(0, 10))
@@ -407,6 +435,8 @@ class Mp3ToVideoTab:
         self.video_codec_var.trace('w', self.save_settings)
         self.video_bitrate_var.trace('w', self.save_settings)
         self.scaling_mode_var.trace('w', self.save_settings)
+        self.parallel_jobs_var.trace('w', self.save_settings)
+        self.thread_budget_var.trace('w', self.save_settings)
         self.video_source_type.trace('w', self.save_settings)
         self.loop_mode.trace('w', self.save_settings)
         if hasattr(self, 'transition_enabled_var'):
@@ -848,6 +878,7 @@ class Mp3ToVideoTab:
         self.progress_label.config(text='Converting...')
         self.app.set_progress(value=0, maximum=len(self.conversion_queue), message='Converting...')
         
+        self._thread_budget = self._read_thread_budget()
         self.set_busy(True, "Converting...")
         
         thread = threading.Thread(target=self._conversion_thread)
@@ -860,70 +891,131 @@ class Mp3ToVideoTab:
         if hasattr(self, 'transition_enabled_var'):
             self.transition_enabled = self.transition_enabled_var.get()
         
-        success_count = 0
-        error_count = 0
+        results = self._convert_files(self.conversion_queue, len(self.conversion_queue))
+        success_count = sum(1 for _, _, ok in results if ok)
+        error_count = len(results) - success_count
+        
+        self.root.after(
+            0,
+            lambda s=success_count, e=error_count:
+            self.log(f"\n[COMPLETE] Conversion finished: {s} succeeded, {e} failed")
+        )
+        
+        self.root.after(
+            0,
+            lambda s=success_count, e=error_count:
+            messagebox.showinfo(
+                "Conversion Complete",
+                f"Conversion finished!\n\nSuccessful: {s}\nFailed: {e}"
+            )
+        )
         
+        self._clear_visual_cache()
+        self.root.after(0, lambda: self.set_busy(False))
+    
+    def _read_thread_budget(self):
+        """(thread budget, parallel jobs) from the settings, with defaults for invalid input."""
+        try:
+            budget = max(1, int(self.thread_budget_var.get()))
+        except (ValueError, TypeError):
+            budget = DEFAULT_THREAD_BUDGET
+        try:
+            jobs = max(1, int(self.parallel_jobs_var.get()))
+        except (ValueError, TypeError):
+            jobs = DEFAULT_PARALLEL_ENCODES
+        return budget, jobs
+    
+    def _convert_files(self, input_files, progress_maximum):
+        """
+        Convert MP3s to videos on a pool of parallel ffmpeg jobs.
+        
+        The thread budget is split between the jobs (-threads per job) so the
+        machine is not oversubscribed. Progress is the sum of every job's
+        encode percentage, so the bar moves smoothly while jobs overlap.
+        Returns (input, output, ok) per file, in input order.
+        """
         source_type = self.video_source_type.get()
         loop_mode = self.loop_mode.get()
         video_quality = self.video_quality_var.get()
         video_codec = self.video_codec_var.get()
         video_bitrate = self.video_bitrate_var.get()
         scaling_mode = self.scaling_mode_var.get()
+        output_folder = self.file_manager.get_folder_path('output')
+        ffmpeg_cmd = self.get_ffmpeg_command()
+        ffprobe_cmd = resolve_ffprobe_cmd(ffmpeg_cmd)
         
-        for i, input_file in enumerate(self.conversion_queue):
+        total = len(input_files)
+        budget, requested_jobs = self._thread_budget
+        parallel_jobs, threads_per_job = split_thread_budget(budget, requested_jobs, total)
+        self.root.after(
+            0,
+            lambda j=parallel_jobs, t=threads_per_job, b=budget:
+            self.log(f"[INFO] Parallel jobs: {j} x {t} thread(s) (budget {b} threads)")
+        )
+        
+        lock = threading.Lock()
+        state = {'done': 0, 'last_update': 0.0}
+        job_percent = {}
+        
+        def report(force=False):
+            # Called from worker threads; throttled so the UI queue is not flooded
+            with lock:
+                now = time.monotonic()
+                if not force and now - state['last_update'] < 0.5:
+                    return
+                state['last_update'] = now
+                value = state['done'] + sum(job_percent.values()) / 100.0
+                running = len(job_percent)
+                done = state['done']
+            message = f'Converting: {done}/{total} done, {running} running'
+            self.root.after(0, lambda v=value, m=message: (
+                self.progress.config(value=v),
+                self.progress_label.config(text=m),
+                self.app.set_progress(value=v, maximum=progress_maximum, message=m),
+            ))
+        
+        def convert_one(index, input_file):
             input_path = Path(input_file)
-            output_file = os.path.join(
-                self.file_manager.get_folder_path('output'), 
-                f"{input_path.stem}_video.mp4"
-            )
-            
-            self.root.after(
-                0,
-                lambda idx=i+1, total=len(self.conversion_queue), name=input_path.name:
-                self.set_busy(True, f"Converting {idx}/{total}: {name}")
-            )
-            
+            output_file = os.path.join(output_folder, f"{input_path.stem}_video.mp4")
             self.root.after(
                 0,
-                lambda msg=f"\n[INFO] Converting ({i+1}/{len(self.conversion_queue)}): {input_path.name}":
-                self.log(msg)
+                lambda msg=f"\n[INFO] Converting ({index + 1}/{total}): {input_path.name}": self.log(msg)
             )
-            
+            ok = False
+            with lock:
+                job_percent[index] = 0.0
             try:
                 cmd = self._build_conversion_command(
                     input_file, output_file, source_type, loop_mode, video_quality, video_codec, video_bitrate, scaling_mode
                 )
+                cmd = with_thread_limit(cmd, threads_per_job)
                 
                 # Debug: Log the FFmpeg command
                 self.root.after(0, lambda cmd_str=' '.join(cmd): self.log(f"[DEBUG] FFmpeg command: {cmd_str}"))
                 
-                process = self.run_ffmpeg_command(cmd)
+                def on_progress(percent, _message, i=index):
+                    with lock:
+                        job_percent[i] = percent
+                    report()
                 
-                # Log stdout and stderr
-                if process.stdout:
-                    self.root.after(0, lambda out=process.stdout: self.log(f"[DEBUG] FFmpeg stdout: {out}"))
-                if process.stderr:
-                    self.root.after(0, lambda err=process.stderr: self.log(f"[DEBUG] FFmpeg stderr: {err}"))
-                self.root.after(0, lambda code=process.returncode: self.log(f"[DEBUG] FFmpeg return code: {code}"))
+                duration = probe_duration(ffmpeg_cmd, input_file, ffprobe_cmd)
+                ok, error_msg = run_ffmpeg_with_progress(
+                    cmd, duration, on_progress, timeout=MP3_VIDEO_JOB_TIMEOUT_S
+                )
                 
-                if process.returncode == 0:
-                    success_count += 1
+                if ok:
                     self.root.after(
                         0,
                         lambda out=output_file:
                         self.log(f"[SUCCESS] Saved: {os.path.basename(out)}")
                     )
                 else:
-                    error_count += 1
-                    error_msg = process.stderr if process.stderr else "Unknown error"
                     self.root.after(
                         0,
-                        lambda err=error_msg:
-                        self.log(f"[ERROR] Conversion failed: {err[:500]}")
+                        lambda name=input_path.name, err=error_msg:
+                        self.log(f"[ERROR] Conversion failed for {name}: {err[:500]}")
                     )
-                
             except Exception as e:
-                error_count += 1
                 error_msg = str(e)
                 self.root.after(
                     0,
@@ -931,29 +1023,15 @@ class Mp3ToVideoTab:
                     self.log(f"[ERROR] Exception: {msg}")
                 )
             
-            total = len(self.conversion_queue)
-            self.root.after(0, lambda v=i+1, t=total, name=input_path.name: (
-                self.progress.config(value=v),
-                self.progress_label.config(text=f'Converting {v}/{t}: {name}'),
-                self.app.set_progress(value=v, maximum=t, message=f'Converting {v}/{t}: {name}'),
-            ))
-        
-        self.root.after(
-            0,
-            lambda s=success_count, e=error_count:
-            self.log(f"\n[COMPLETE] Conversion finished: {s} succeeded, {e} failed")
-        )
-        
-        self.root.after(
-            0,
-            lambda s=success_count, e=error_count:
-            messagebox.showinfo(
-                "Conversion Complete",
-                f"Conversion finished!\n\nSuccessful: {s}\nFailed: {e}"
-            )
-        )
-        
-        self.root.after(0, lambda: self.set_busy(False))
+            with lock:
+                job_percent.pop(index, None)
+                state['done'] += 1
+            report(force=True)
+            return input_file, output_file, ok
+        
+        with ThreadPoolExecutor(max_workers=parallel_jobs, thread_name_prefix='mp3-video') as pool:
+            futures = [pool.submit(convert_one, i, f) for i, f in enumerate(input_files)]
+            return [future.result() for future in futures]
     
     def _get_scaling_filter(self, target_width, target_height, scaling_mode):
         """Get FFmpeg scaling filter based on scaling mode."""
@@ -993,6 +1071,169 @@ class Mp3ToVideoTab:
         else:
             return base_crf
     
+    def _image_scale_filter(self, video_quality, scaling_mode):
+        """Scaling filter for the selected image and output resolution, or None to keep the image size."""
+        if video_quality == "480p (854x480)" or video_quality == "480p":
+            return self._get_scaling_filter(854, 480, scaling_mode)
+        elif video_quality == "720p HD (1280x720)" or video_quality == "720p":
+            return self._get_scaling_filter(1280, 720, scaling_mode)
+        elif video_quality == "1080p Full HD (1920x1080)" or video_quality == "1080p":
+            return self._get_scaling_filter(1920, 1080, scaling_mode)
+        elif video_quality == "Mobile Portrait 9:16 (720x1280)" or "Mobile Portrait" in video_quality:
+            return self._get_scaling_filter(720, 1280, scaling_mode)
+        elif video_quality == "Mobile Landscape 16:9 (1280x720)" or "Mobile Landscape" in video_quality:
+            return self._get_scaling_filter(1280, 720, scaling_mode)
+        elif video_quality == "Instagram Square 1:1 (1080x1080)" or "Instagram Square" in video_quality:
+            return self._get_scaling_filter(1080, 1080, scaling_mode)
+        elif video_quality == "Instagram Story 9:16 (1080x1920)" or "Instagram Story" in video_quality:
+            return self._get_scaling_filter(1080, 1920, scaling_mode)
+        elif video_quality == "Portrait 2:3 (720x1080)" or "Portrait 2:3" in video_quality:
+            return self._get_scaling_filter(720, 1080, scaling_mode)
+        elif video_quality == "Landscape 3:2 (1080x720)" or "Landscape 3:2" in video_quality:
+            return self._get_scaling_filter(1080, 720, scaling_mode)
+        elif video_quality in ("Source Size (Match Input)", "Source Size", "Auto (720p default)", "Auto"):
+            # Use source dimensions (image for image source) - detect if not already detected
+            if not (self.image_width and self.image_height) and self.selected_image_file:
+                # Try to detect dimensions on-the-fly
+                try:
+                    with Image.open(self.selected_image_file) as img:
+                        self.image_width, self.image_height = img.size
+                except:
+                    pass
+            
+            if self.image_width and self.image_height:
+                return self._get_scaling_filter(self.image_width, self.image_height, scaling_mode)
+            # Fallback to 720p if dimensions not available
+            return self._get_scaling_filter(1280, 720, scaling_mode)
+        return None
+    
+    def _visual_cache_key(self, *parts):
+        return hashlib.md5("|".join(str(p) for p in parts).encode()).hexdigest()[:16]
+    
+    def _visual_cache_path(self, name):
+        """Path for a cache file; creates the batch cache folder on first use. Call with the cache lock held."""
+        if self._visual_cache_dir is None or not os.path.isdir(self._visual_cache_dir):
+            self._visual_cache_dir = tempfile.mkdtemp(prefix='mp3_video_cache_')
+        return os.path.join(self._visual_cache_dir, name)
+    
+    def _prescaled_still_image(self, scale_filter):
+        """
+        Path of the selected image scaled once to the output size, or None if that fails.
+        
+        Cached per image and filter, so a batch of MP3s with one background
+        scales the image a single time.
+        """
+        image_file = self.selected_image_file
+        try:
+            mtime = os.path.getmtime(image_file)
+        except (OSError, TypeError):
+            return None
+        key = self._visual_cache_key('still', image_file, mtime, scale_filter)
+        
+        with self._visual_cache_lock:
+            cached = self._visual_cache.get(key)
+            if cached and os.path.exists(cached):
+                return cached
+            still_image = self._visual_cache_path(f"still_{key}.png")
+            ok, err = run_ffmpeg(
+                build_still_image_prescale_command(self.get_ffmpeg_command(), image_file, still_image, scale_filter),
+                timeout=120,
+            )
+            if not ok:
+                self.root.after(0, lambda e=err: self.log(f"[WARNING] Could not pre-scale image, scaling per frame instead: {e}"))
+                return None
+            self._visual_cache[key] = still_image
+            self.root.after(0, lambda: self.log("[INFO] Still image pre-scaled once for this batch"))
+            return still_image
+    
+    def _video_quality_args(self, video_codec, video_bitrate):
+        """-crf/-preset (or -b:v 0 for VP9) for the selected codec and quality."""
+        crf_value = self._get_crf_value(video_bitrate, video_codec)
+        if video_codec in ('libx264', 'libx265'):
+            return ['-crf', str(crf_value), '-preset', 'medium']
+        elif video_codec == 'libvpx-vp9':
+            return ['-crf', str(crf_value), '-b:v', '0']
+        return []
+    
+    def _cached_visual_track(self, source_type, loop_mode, scale_filter, video_codec, video_bitrate):
+        """
+        Video-only track that a batch loops under every MP3, rendered once per batch.
+        
+        Keyed by source visual, output size/scaling (the scale filter), codec,
+        quality, loop mode and transition settings. Returns None when the
+        track cannot be rendered; callers then fall back to a full encode.
+        """
+        if source_type == "image":
+            source = self._prescaled_still_image(scale_filter)
+        else:
+            source = self.selected_video_file
+        if not source:
+            return None
+        try:
+            mtime = os.path.getmtime(source)
+        except OSError:
+            return None
+        key = self._visual_cache_key(
+            'track', source_type, source, mtime, scale_filter, video_codec, video_bitrate, loop_mode,
+            self.transition_enabled, sorted(self.selected_transition_types), self.transition_duration,
+        )
+        
+        def build_cmd(track):
+            ffmpeg_cmd = self.get_ffmpeg_command()
+            if source_type == "image":
+                # A short still clip; it is stream-copy-looped for the song length
+                cmd = [ffmpeg_cmd, '-y', '-loop', '1', '-framerate', str(STILL_IMAGE_FPS), '-i', source,
+                       '-t', str(STILL_IMAGE_GOP_S)]
+            elif loop_mode == "forward_reverse":
+                cmd = [ffmpeg_cmd, '-y', '-i', source, '-filter_complex',
+                       f'[0:v]{scale_filter}[v_scaled];[0:v]{scale_filter}[v_scaled2];[v_scaled2]reverse[v_rev];[v_scaled][v_rev]concat=n=2:v=1:a=0[v_final]',
+                       '-map', '[v_final]']
+            else:
+                cmd = [ffmpeg_cmd, '-y', '-i', source, '-vf', scale_filter, '-map', '0:v:0']
+            cmd.extend(['-an', '-c:v', video_codec])
+            cmd.extend(self._video_quality_args(video_codec, video_bitrate))
+            if source_type == "image":
+                cmd.extend(still_image_encode_args(video_codec))
+            cmd.append(track)
+            return cmd
+        
+        return self._render_cached_visual(
+            key, f"track_{key}.mp4", build_cmd,
+            "Visual track rendered once for this batch; each MP3 is muxed with a stream copy of it",
+        )
+    
+    def _render_cached_visual(self, key, filename, build_cmd, success_message):
+        """
+        Render a cache entry with build_cmd(output_path) unless it already exists.
+        
+        Holds the cache lock while rendering, so parallel jobs that need the
+        same entry wait for one render instead of starting their own.
+        Returns the cached path, or None if rendering failed.
+        """
+        with self._visual_cache_lock:
+            cached = self._visual_cache.get(key)
+            if cached and os.path.exists(cached):
+                return cached
+            
+            output_path = self._visual_cache_path(filename)
+            cmd = build_cmd(output_path)
+            self.root.after(0, lambda c=' '.join(cmd): self.log(f"[DEBUG] Visual cache command: {c}"))
+            ok, err = run_ffmpeg(cmd, timeout=3600)
+            if not ok:
+                self.root.after(0, lambda e=err: self.log(f"[WARNING] Could not pre-render visual, encoding per file instead: {e}"))
+                return None
+            self._visual_cache[key] = output_path
+            self.root.after(0, lambda m=success_message: self.log(f"[INFO] {m}"))
+            return output_path
+    
+    def _clear_visual_cache(self):
+        """Remove pre-scaled images and visual tracks created for the last batch."""
+        with self._visual_cache_lock:
+            if self._visual_cache_dir:
+                shutil.rmtree(self._visual_cache_dir, ignore_errors=True)
+            self._visual_cache_dir = None
+            self._visual_cache = {}
+    
     def _build_conversion_command(self, input_file, output_file, source_type, loop_mode, video_quality, video_codec, video_bitrate, scaling_mode):
         """Build FFmpeg conversion command."""
         ffmpeg_cmd = self.get_ffmpeg_command()
@@ -1002,73 +1243,25 @@ class Mp3ToVideoTab:
         
         if source_type == "image":
             # Image + MP3 = Video
-            cmd.extend(['-loop', '1', '-i', self.selected_image_file])
+            scale_filter = self._image_scale_filter(video_quality, scaling_mode)
+            track = self._cached_visual_track(source_type, loop_mode, scale_filter, video_codec, video_bitrate)
+            if track:
+                return build_visual_loop_mux_command(ffmpeg_cmd, track, input_file, output_file)
+            still_image = self._prescaled_still_image(scale_filter)
+            
+            if still_image:
+                # Still-image fast path: the image is already at output size, so it is
+                # read at a minimal frame rate and never rescaled per frame
+                cmd.extend(['-loop', '1', '-framerate', str(STILL_IMAGE_FPS), '-i', still_image])
+            else:
+                cmd.extend(['-loop', '1', '-i', self.selected_image_file])
             cmd.extend(['-i', input_file])
             
             # Map audio and video
             cmd.extend(['-map', '0:v:0', '-map', '1:a:0'])
             
-            # Video settings
-            if video_quality == "480p (854x480)" or video_quality == "480p":
-                scale_filter = self._get_scaling_filter(854, 480, scaling_mode)
-                cmd.extend(['-vf', scale_filter])
-            elif video_quality == "720p HD (1280x720)" or video_quality == "720p":
-                scale_filter = self._get_scaling_filter(1280, 720, scaling_mode)
-                cmd.extend(['-vf', scale_filter])
-            elif video_quality == "1080p Full HD (1920x1080)" or video_quality == "1080p":
-                scale_filter = self._get_scaling_filter(1920, 1080, scaling_mode)
+            if scale_filter and not still_image:
                 cmd.extend(['-vf', scale_filter])
-            elif video_quality == "Mobile Portrait 9:16 (720x1280)" or "Mobile Portrait" in video_quality:
-                scale_filter = self._get_scaling_filter(720, 1280, scaling_mode)
-                cmd.extend(['-vf', scale_filter])
-            elif video_quality == "Mobile Landscape 16:9 (1280x720)" or "Mobile Landscape" in video_quality:
-                scale_filter = self._get_scaling_filter(1280, 720, scaling_mode)
-                cmd.extend(['-vf', scale_filter])
-            elif video_quality == "Instagram Square 1:1 (1080x1080)" or "Instagram Square" in video_quality:
-                scale_filter = self._get_scaling_filter(1080, 1080, scaling_mode)
-                cmd.extend(['-vf', scale_filter])
-            elif video_quality == "Instagram Story 9:16 (1080x1920)" or "Instagram Story" in video_quality:
-                scale_filter = self._get_scaling_filter(1080, 1920, scaling_mode)
-                cmd.extend(['-vf', scale_filter])
-            elif video_quality == "Portrait 2:3 (720x1080)" or "Portrait 2:3" in video_quality:
-                scale_filter = self._get_scaling_filter(720, 1080, scaling_mode)
-                cmd.extend(['-vf', scale_filter])
-            elif video_quality == "Landscape 3:2 (1080x720)" or "Landscape 3:2" in video_quality:
-                scale_filter = self._get_scaling_filter(1080, 720, scaling_mode)
-                cmd.extend(['-vf', scale_filter])
-            elif video_quality == "Source Size (Match Input)" or video_quality == "Source Size":
-                # Use source dimensions (image for image source) - detect if not already detected
-                if not (self.image_width and self.image_height) and self.selected_image_file:
-                    # Try to detect dimensions on-the-fly
-                    try:
-                        with Image.open(self.selected_image_file) as img:
-                            self.image_width, self.image_height = img.size
-                    except:
-                        pass
-                
-                if self.image_width and self.image_height:
-                    scale_filter = self._get_scaling_filter(self.image_width, self.image_height, scaling_mode)
-                    cmd.extend(['-vf', scale_filter])
-                else:
-                    # Fallback to 720p if dimensions not available
-                    scale_filter = self._get_scaling_filter(1280, 720, scaling_mode)
-                    cmd.extend(['-vf', scale_filter])
-            elif video_quality == "Auto (720p default)" or video_quality == "Auto":
-                # Auto mode: use source dimensions if available, otherwise default to 720p
-                if not (self.image_width and self.image_height) and self.selected_image_file:
-                    # Try to detect dimensions on-the-fly
-                    try:
-                        with Image.open(self.selected_image_file) as img:
-                            self.image_width, self.image_height = img.size
-                    except:
-                        pass
-                
-                if self.image_width and self.image_height:
-                    scale_filter = self._get_scaling_filter(self.image_width, self.image_height, scaling_mode)
-                    cmd.extend(['-vf', scale_filter])
-                else:
-                    scale_filter = self._get_scaling_filter(1280, 720, scaling_mode)
-                    cmd.extend(['-vf', scale_filter])
             
             # Audio settings
             cmd.extend(['-c:a', 'aac', '-b:a', '192k'])
@@ -1088,6 +1281,9 @@ class Mp3ToVideoTab:
                 cmd.extend(['-crf', str(crf_value)])
                 cmd.extend(['-b:v', '0'])  # VP9 requires -b:v 0 when using CRF
             
+            if still_image:
+                cmd.extend(still_image_encode_args(video_codec))
+            
             # Duration (match audio length)
             cmd.extend(['-shortest'])
             
@@ -1136,6 +1332,12 @@ class Mp3ToVideoTab:
             else:
                 scale_filter = self._get_scaling_filter(1280, 720, scaling_mode)
             
+            # Without transitions every MP3 gets the same visual: render it once, then just mux
+            if not (self.transition_enabled and loop_mode != "forward_reverse"):
+                track = self._cached_visual_track(source_type, loop_mode, scale_filter, video_codec, video_bitrate)
+                if track:
+                    return build_visual_loop_mux_command(ffmpeg_cmd, track, input_file, output_file)
+            
             # Check if transitions are enabled for looping video
             if self.transition_enabled and loop_mode != "forward_reverse":
                 # Build looped video with transitions between each loop
@@ -1324,6 +1526,7 @@ class Mp3ToVideoTab:
             message='Converting and merging...',
         )
         
+        self._thread_budget = self._read_thread_budget()
         self.set_busy(True, "Converting and merging...")
         
         thread = threading.Thread(target=self._convert_and_merge_thread)
@@ -1337,69 +1540,8 @@ class Mp3ToVideoTab:
             self.transition_enabled = self.transition_enabled_var.get()
         
         # Step 1: Convert all MP3s to individual videos
-        converted_videos = []
-        source_type = self.video_source_type.get()
-        loop_mode = self.loop_mode.get()
-        video_quality = self.video_quality_var.get()
-        video_codec = self.video_codec_var.get()
-        video_bitrate = self.video_bitrate_var.get()
-        scaling_mode = self.scaling_mode_var.get()
-        
-        for i, input_file in enumerate(self.selected_mp3_files):
-            input_path = Path(input_file)
-            output_file = os.path.join(
-                self.file_manager.get_folder_path('output'), 
-                f"{input_path.stem}_video.mp4"
-            )
-            
-            self.root.after(
-                0,
-                lambda idx=i+1, total=len(self.selected_mp3_files), name=input_path.name:
-                self.set_busy(True, f"Converting {idx}/{total}: {name}")
-            )
-            
-            self.root.after(
-                0,
-                lambda msg=f"\n[INFO] Converting ({i+1}/{len(self.selected_mp3_files)}): {input_path.name}":
-                self.log(msg)
-            )
-            
-            try:
-                cmd = self._build_conversion_command(
-                    input_file, output_file, source_type, loop_mode, video_quality, video_codec, video_bitrate, scaling_mode
-                )
-                
-                process = self.run_ffmpeg_command(cmd)
-                
-                if process.returncode == 0:
-                    converted_videos.append(output_file)
-                    self.root.after(
-                        0,
-                        lambda out=output_file:
-                        self.log(f"[SUCCESS] Converted: {os.path.basename(out)}")
-                    )
-                else:
-                    error_msg = process.stderr if process.stderr else "Unknown error"
-                    self.root.after(
-                        0,
-                        lambda err=error_msg:
-                        self.log(f"[ERROR] Conversion failed: {err[:500]}")
-                    )
-                
-            except Exception as e:
-                error_msg = str(e)
-                self.root.after(
-                    0,
-                    lambda msg=error_msg:
-                    self.log(f"[ERROR] Exception: {msg}")
-                )
-            
-            total = len(self.selected_mp3_files)
-            self.root.after(0, lambda v=i+1, t=total, name=input_path.name: (
-                self.progress.config(value=v),
-                self.progress_label.config(text=f'Converting {v}/{t}: {name}'),
-                self.app.set_progress(value=v, maximum=total + 1, message=f'Converting {v}/{t}: {name}'),
-            ))
+        results = self._convert_files(self.selected_mp3_files, len(self.selected_mp3_files) + 1)
+        converted_videos = [output_file for _, output_file, ok in results if ok]
         
         # Step 2: Merge videos with transitions if enabled
         self.root.after(0, lambda: self.log(f"[DEBUG] Transition enabled state: {self.transition_enabled}"))
@@ -1493,6 +1635,7 @@ class Mp3ToVideoTab:
             )
         )
         
+        self._clear_visual_cache()
         self.root.after(0, lambda: self.set_busy(False))
     
     def set_busy(self, busy=True, message=""):
@@ -1553,6 +1696,14 @@ class Mp3ToVideoTab:
             self.log(f"[WARNING] Could not get durations, falling back to simple loop")
             return self._build_simple_loop_command(audio_file, output_file, scale_filter, video_codec, video_bitrate)
         
+        # Preferred: render one loop unit per transition type and concat them with stream copy
+        if video_duration > 2 * self.transition_duration:
+            cmd = self._build_loop_unit_command(
+                audio_file, output_file, scale_filter, video_codec, video_bitrate, audio_duration, video_duration
+            )
+            if cmd:
+                return cmd
+        
         # Calculate number of loops needed
         transition_dur = self.transition_duration
         # Account for transition overlap when calculating loops
@@ -1662,6 +1813,73 @@ class Mp3ToVideoTab:
         
         return cmd
     
+    def _build_loop_unit_command(self, audio_file, output_file, scale_filter, video_codec, video_bitrate,
+                                 audio_duration, video_duration):
+        """
+        Looped video with transitions built from pre-rendered loop units.
+        
+        Each selected transition type gets one unit (the video plus a transition
+        back into its start), rendered once per batch. The output is an intro
+        plus randomly chosen units concatenated with stream copy and trimmed to
+        the audio, so memory use and encode time do not grow with song length.
+        Returns None if a unit cannot be rendered.
+        """
+        ffmpeg_cmd = self.get_ffmpeg_command()
+        transition_dur = self.transition_duration
+        source = self.selected_video_file
+        try:
+            mtime = os.path.getmtime(source)
+        except OSError:
+            return None
+        
+        def encode_args(path):
+            return ['-an', '-c:v', video_codec] + self._video_quality_args(video_codec, video_bitrate) + [path]
+        
+        intro_key = self._visual_cache_key('intro', source, mtime, scale_filter, video_codec, video_bitrate, transition_dur)
+        intro = self._render_cached_visual(
+            intro_key, f"intro_{intro_key}.mp4",
+            lambda path: [ffmpeg_cmd, '-y', '-i', source,
+                          '-filter_complex', build_loop_intro_filter(transition_dur, scale_filter),
+                          '-map', '[vout]'] + encode_args(path),
+            "Loop intro rendered",
+        )
+        if not intro:
+            return None
+        
+        units = {}
+        for transition_type in sorted(set(self.selected_transition_types)):
+            unit_key = self._visual_cache_key(
+                'unit', source, mtime, scale_filter, video_codec, video_bitrate, transition_dur, transition_type
+            )
+            unit_filter = build_loop_unit_filter(video_duration, transition_type, transition_dur, scale_filter)
+            unit = self._render_cached_visual(
+                unit_key, f"unit_{unit_key}.mp4",
+                lambda path, f=unit_filter: [ffmpeg_cmd, '-y', '-i', source, '-i', source,
+                                             '-filter_complex', f, '-map', '[vout]'] + encode_args(path),
+                f"Loop unit rendered once for this batch ({transition_type})",
+            )
+            if not unit:
+                return None
+            units[transition_type] = unit
+        
+        num_units = loop_unit_count(audio_duration, video_duration, transition_dur)
+        selected_transitions = [random.choice(self.selected_transition_types) for _ in range(num_units)]
+        self.root.after(
+            0,
+            lambda n=num_units, a=audio_duration, v=video_duration:
+            self.log(f"[INFO] Looping {n} pre-rendered unit(s) with {transition_dur}s transitions (audio {a:.1f}s, video {v:.1f}s)")
+        )
+        
+        with self._visual_cache_lock:
+            concat_file = self._visual_cache_path(
+                f"concat_{self._visual_cache_key(output_file)}.txt"
+            )
+        with open(concat_file, 'w', encoding='utf-8', newline='\n') as f:
+            for piece in [intro] + [units[t] for t in selected_transitions]:
+                f.write(f"file '{escape_for_concat(piece)}'\n")
+        
+        return build_concat_mux_command(ffmpeg_cmd, concat_file, audio_file, output_file, audio_duration)
+    
     def _build_simple_loop_command(self, audio_file, output_file, scale_filter, video_codec, video_bitrate):
         """Build simple loop command without transitions (fallback)."""
         ffmpeg_cmd = self.get_ffmpeg_command()
@@ -1759,9 +1977,9 @@ class Mp3ToVideoTab:
         filter_parts = []
         transition_dur = self.transition_duration
         
-        # Scale and normalize all video inputs
+        # Scale and normalize all video inputs (still-image videos are 1 fps; xfade needs a common rate)
         for i in range(len(video_files)):
-            filter_parts.append(f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1[v{i}]")
+            filter_parts.append(f"[{i}:v]{transition_input_filter(width, height)}[v{i}]")
             filter_parts.append(f"[{i}:a]aformat=sample_rates=44100:channel_layouts=stereo[a{i}]")
         
         # Calculate xfade offsets for chained transitions
@@ -1845,7 +2063,7 @@ class Mp3ToVideoTab:
         
         # Scale and normalize all inputs (same file passed multiple times)
         for i in range(num_segments):
-            filter_parts.append(f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1[v{i}]")
+            filter_parts.append(f"[{i}:v]{transition_input_filter(width, height)}[v{i}]")
             filter_parts.append(f"[{i}:a]aformat=sample_rates=44100:channel_layouts=stereo[a{i}]")
         
         # Randomly select transition types
@@ -2188,6 +2406,8 @@ class Mp3ToVideoTab:
                 'video_codec': self.video_codec_var.get(),
                 'video_bitrate': self.video_bitrate_var.get(),
                 'scaling_mode': self.scaling_mode_var.get(),
+                'parallel_jobs': self.parallel_jobs_var.get(),
+                'thread_budget': self.thread_budget_var.get(),
                 'video_source_type': self.video_source_type.get(),
                 'loop_mode': self.loop_mode.get(),
                 'selected_image_file': self.selected_image_file,
@@ -2244,6 +2464,12 @@ class Mp3ToVideoTab:
                 if 'scaling_mode' in settings:
                     self.scaling_mode_var.set(settings['scaling_mode'])
                 
+                if 'parallel_jobs' in settings:
+                    self.parallel_jobs_var.set(settings['parallel_jobs'])
+                
+                if 'thread_budget' in settings:
+                    self.thread_budget_var.set(settings['thread_budget'])
+                
                 if 'video_source_type' in settings:
                     self.video_source_type.set(settings['video_source_type'])
                 
@@ -23,15 +23,28 @@ import re
 import os
 import sys
 import threading
-import subprocess
 import json
 import random
+import shutil
+import tempfile
 import time
 from pathlib import Path
 
 # Import shared libraries
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from lib.base_gui import BaseAudioGUI
+from lib.ytdlp_utils import (
+    AUDIO_TARGETS, DEFAULT_MAX_WORKERS, DEFAULT_PER_HOST_LIMIT, METADATA_CACHE_FILE,
+    DownloadArchive, DownloadScheduler, MetadataCache, YtDlpRunner,
+    audio_target_args, best_audio_format_id, categorize_quality, extract_youtube_url, format_bytes,
+    format_progress, generate_user_agent, info_video_id, is_video_only, last_error_line,
+    load_csv_rows, media_key, parse_progress_line, quality_sorted_format_ids, read_reported_filepath,
+    stealth_args, transfer_args, url_host,
+)
+
+EXTERNAL_DOWNLOADERS = ['none', 'aria2c', 'curl', 'wget', 'ffmpeg']
+PROGRESS_UI_INTERVAL_MS = 500  # Batch progress label refresh rate
+PROGRESS_LOG_INTERVAL_S = 5.0  # Progress lines are logged at most this often
 
 
 class YouTubeDownloaderGUI(BaseAudioGUI):
@@ -46,6 +59,23 @@ class YouTubeDownloaderGUI(BaseAudioGUI):
         self.current_video_info = None
         self.cancel_download = False
         self.current_process = None
+        self._process_lock = threading.Lock()
+        # In-process yt-dlp (subprocess fallback), cancel tracking and 403 client fallback
+        self.ytdlp_runner = YtDlpRunner(
+            self.build_ytdlp_args,
+            use_engine=lambda: self.inprocess_engine_var.get() if hasattr(self, 'inprocess_engine_var') else True,
+            is_cancelled=lambda: self.cancel_download,
+            on_engine_fallback=lambda: self.root.after(
+                0, lambda: self.log("[INFO] In-process yt-dlp unavailable, using subprocess")
+            ),
+        )
+        self.client_selector = self.ytdlp_runner.client_selector  # Learns which player client avoids 403s
+        self.metadata_cache = MetadataCache(os.path.join(self.root_dir, METADATA_CACHE_FILE))
+        self._archives = {}  # download folder -> DownloadArchive
+        self._downloader_warned = set()
+        self._progress_lock = threading.Lock()
+        self._worker_progress = {}  # worker thread name -> (title, parsed progress)
+        self._batch_progress = None  # {'label', 'done', 'total'} while a batch runs
         self.use_android_client = False  # Default: disabled (use web client for more formats)
         self.user_agent = self.generate_user_agent()  # Randomize user agent on startup
         self.cookie_file = None  # Path to cookies file
@@ -174,6 +204,16 @@ class YouTubeDownloaderGUI(BaseAudioGUI):
         ttk.Button(auto_frame, text="Selected Videos", command=self.auto_download_lowest_resolution_selected).pack(side='left', padx=5)
         ttk.Button(auto_frame, text="All Videos", command=self.auto_download_lowest_resolution_all).pack(side='left', padx=5)
         
+        # Audio-only download: best audio stream, converted straight to the target format
+        audio_frame = ttk.Frame(bottom_frame)
+        audio_frame.pack(fill='x', pady=5)
+        ttk.Label(audio_frame, text="Audio Only (best audio stream ->", font=('TkDefaultFont', 9, 'bold')).pack(side='left', padx=(5, 0))
+        self.audio_target_var = tk.StringVar(value='MP3')
+        ttk.Combobox(audio_frame, textvariable=self.audio_target_var, values=AUDIO_TARGETS, state='readonly', width=8).pack(side='left', padx=2)
+        ttk.Label(audio_frame, text="):", font=('TkDefaultFont', 9, 'bold')).pack(side='left')
+        ttk.Button(audio_frame, text="Selected Videos", command=self.audio_download_selected).pack(side='left', padx=5)
+        ttk.Button(audio_frame, text="All Videos", command=self.audio_download_all).pack(side='left', padx=5)
+        
         self.log_text = scrolledtext.ScrolledText(bottom_frame, height=8)
         self.log_text.pack(fill='both', expand=True)
     
@@ -302,6 +342,51 @@ class YouTubeDownloaderGUI(BaseAudioGUI):
             row=9, column=0, columnspan=3, sticky='w', padx=5
         )
         
+        ttk.Label(frame, text="Parallel Downloads:").grid(row=10, column=0, sticky='w', pady=5)
+        parallel_frame = ttk.Frame(frame)
+        parallel_frame.grid(row=10, column=1, sticky='w', padx=5)
+        self.max_workers_var = tk.IntVar(value=DEFAULT_MAX_WORKERS)
+        ttk.Spinbox(parallel_frame, from_=1, to=8, increment=1, textvariable=self.max_workers_var, width=5).pack(side='left')
+        ttk.Label(parallel_frame, text="Max per host:").pack(side='left', padx=(15, 5))
+        self.per_host_limit_var = tk.IntVar(value=DEFAULT_PER_HOST_LIMIT)
+        ttk.Spinbox(parallel_frame, from_=1, to=8, increment=1, textvariable=self.per_host_limit_var, width=5).pack(side='left')
+        ttk.Label(frame, text="(Used by batch and auto-download; stream info for upcoming videos is fetched while others download)", foreground='gray', font=('TkDefaultFont', 8)).grid(
+            row=11, column=0, columnspan=3, sticky='w', padx=5
+        )
+        
+        self.inprocess_engine_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(frame, text="Run yt-dlp in-process (faster, avoids interpreter startup per call)", variable=self.inprocess_engine_var).grid(
+            row=12, column=0, columnspan=3, sticky='w', pady=5
+        )
+        
+        ttk.Label(frame, text="Stream Info Cache:").grid(row=13, column=0, sticky='w', pady=5)
+        ttk.Button(frame, text="Clear Cache", command=self.clear_metadata_cache).grid(row=13, column=1, sticky='w', padx=5)
+        ttk.Label(frame, text="(Fetched stream lists are reused for 6 hours, also across restarts)", foreground='gray', font=('TkDefaultFont', 8)).grid(
+            row=14, column=0, columnspan=3, sticky='w', padx=5
+        )
+        
+        self.skip_archived_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(frame, text="Skip videos already downloaded to this folder (download archive)", variable=self.skip_archived_var).grid(
+            row=15, column=0, columnspan=3, sticky='w', pady=5
+        )
+        
+        ttk.Label(frame, text="Concurrent Fragments:").grid(row=16, column=0, sticky='w', pady=5)
+        fragment_frame = ttk.Frame(frame)
+        fragment_frame.grid(row=16, column=1, sticky='w', padx=5)
+        self.concurrent_fragments_var = tk.IntVar(value=4)
+        ttk.Spinbox(fragment_frame, from_=1, to=16, increment=1, textvariable=self.concurrent_fragments_var, width=5).pack(side='left')
+        self.resume_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(fragment_frame, text="Resume partial downloads", variable=self.resume_var).pack(side='left', padx=(15, 0))
+        
+        ttk.Label(frame, text="External Downloader:").grid(row=17, column=0, sticky='w', pady=5)
+        self.external_downloader_var = tk.StringVar(value='none')
+        ttk.Combobox(frame, textvariable=self.external_downloader_var, values=EXTERNAL_DOWNLOADERS, state='readonly', width=10).grid(
+            row=17, column=1, sticky='w', padx=5
+        )
+        ttk.Label(frame, text="(Fragments are fetched in parallel for DASH/HLS streams; aria2c also splits single files; must be on PATH)", foreground='gray', font=('TkDefaultFont', 8)).grid(
+            row=18, column=0, columnspan=3, sticky='w', padx=5
+        )
+        
         info_frame = ttk.LabelFrame(self.tab_settings, text="Information", padding=10)
         info_frame.pack(fill='both', expand=True, padx=10, pady=10)
         
@@ -313,6 +398,7 @@ Features:
 - Select specific quality and format
 - Download with custom filenames based on CSV fields
 - Stealth mode to avoid 403 errors
+- Audio-only downloads: best audio stream converted to MP3/FLAC/WAV
 - Multiple client types (Web, Android, iOS, TV)
 - Cookie file support for better stealth
 - Automatic venv management via launcher scripts
@@ -323,7 +409,11 @@ Stealth Mode Tips:
 - Use Android client for good balance of stealth and formats
 - Export browser cookies (Netscape format) and load them for better results
 - Increase delay between downloads if you still get 403 errors
-- The tool automatically tries alternative clients if 403 is detected
+- Lower Parallel Downloads / Max per host if you still get 403 errors
+- Clear the stream info cache if a video's formats have changed
+- Interrupted downloads resume from their .part file when Resume is enabled
+- The tool automatically tries alternative clients if 403 is detected,
+  and tries the client that worked best so far first
 
 Instructions:
 1. Load a CSV file containing YouTube links
@@ -360,6 +450,9 @@ Note: Links in CSV can be in markdown format [URL](URL) or plain URLs.
                 self.log("[INFO] Download cancelled by user")
             except Exception as e:
                 self.log(f"[WARNING] Error cancelling process: {str(e)}")
+        cancelled = self.ytdlp_runner.terminate_all()
+        if cancelled:
+            self.log(f"[INFO] Cancelled {cancelled} running download(s)")
         self.set_busy(False)
     
     def update_actual_path_label(self):
@@ -445,24 +538,11 @@ Note: Links in CSV can be in markdown format [URL](URL) or plain URLs.
                 self.set_busy(False)
                 return
             
-            # Try to read the CSV file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                self.csv_data = list(reader)
-            
-            # Validate that we got data
-            if not self.csv_data:
-                error_msg = "CSV file is empty or has no data rows"
-                messagebox.showerror("Error", error_msg)
-                self.log(f"[ERROR] {error_msg}")
-                self.set_busy(False)
-                return
-            
-            # Check for required columns
-            required_columns = ['Video Link']
-            missing_columns = [col for col in required_columns if col not in self.csv_data[0].keys()]
-            if missing_columns:
-                error_msg = f"CSV missing required columns: {', '.join(missing_columns)}. Found columns: {', '.join(self.csv_data[0].keys())}"
+            # Read the CSV file and check it has data and the required columns
+            try:
+                self.csv_data = load_csv_rows(file_path)
+            except ValueError as e:
+                error_msg = str(e)
                 messagebox.showerror("Error", error_msg)
                 self.log(f"[ERROR] {error_msg}")
                 self.set_busy(False)
@@ -610,120 +690,51 @@ Note: Links in CSV can be in markdown format [URL](URL) or plain URLs.
     
     def generate_user_agent(self):
         """Generate a randomized Chrome user agent string"""
-        # Randomize Chrome version (120-130 range)
-        chrome_major = random.randint(120, 130)
-        chrome_minor = random.randint(0, 9)
-        chrome_patch = random.randint(0, 9)
-        
-        # Randomize WebKit version slightly (537.30 - 537.40)
-        webkit_major = 537
-        webkit_minor = random.randint(30, 40)
-        
-        # Randomize Safari version to match WebKit
-        safari_major = webkit_major
-        safari_minor = webkit_minor
-        
-        user_agent = (
-            f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            f"AppleWebKit/{webkit_major}.{webkit_minor} (KHTML, like Gecko) "
-            f"Chrome/{chrome_major}.{chrome_minor}.{chrome_patch}.0 "
-            f"Safari/{safari_major}.{safari_minor}"
-        )
-        
-        return user_agent
+        return generate_user_agent()
     
-    def build_ytdlp_command(self, base_args):
+    def build_ytdlp_command(self, base_args, client_type=None):
         """Build yt-dlp command with anti-403 stealth options
         
         Args:
             base_args: List of yt-dlp arguments
+            client_type: Player client override (web/android/ios/tv); defaults to the Settings choice
         """
-        cmd = [
-            sys.executable,
-            '-m', 'yt_dlp',
-        ]
-        
-        # User agent (always set)
-        cmd.extend(['--user-agent', self.user_agent])
-        
-        # Cookie file (if provided)
+        return [sys.executable, '-m', 'yt_dlp'] + self.build_ytdlp_args(base_args, client_type)
+    
+    def build_ytdlp_args(self, base_args, client_type=None):
+        """yt-dlp arguments (without the interpreter prefix) with anti-403 stealth options"""
         cookie_file = self.cookie_file_var.get().strip() if hasattr(self, 'cookie_file_var') else self.cookie_file
-        if cookie_file and os.path.isfile(cookie_file):
-            cmd.extend(['--cookies', cookie_file])
         
         # Client type based on settings
-        client_type = self.client_type_var.get() if hasattr(self, 'client_type_var') else ('android' if self.use_android_client else 'web')
-        
-        # Stealth mode options
-        if self.use_stealth_mode:
-            # Set referer to YouTube
-            cmd.extend(['--referer', 'https://www.youtube.com/'])
-            
-            # Add extractor args for client type
-            if client_type == 'android':
-                cmd.extend(['--extractor-args', 'youtube:player_client=android'])
-            elif client_type == 'ios':
-                cmd.extend(['--extractor-args', 'youtube:player_client=ios'])
-            elif client_type == 'tv':
-                cmd.extend(['--extractor-args', 'youtube:player_client=tv'])
-            # web is default, no extractor args needed
-            
-            # Additional stealth options
-            cmd.extend([
-                '--extractor-args', 'youtube:include_live_chat=false',  # Disable live chat to reduce requests
-                '--no-check-certificate',  # Skip certificate validation (may help with some proxies)
-            ])
-            
-            # Add headers to mimic browser
-            cmd.extend([
-                '--add-header', 'Accept-Language:en-US,en;q=0.9',
-                '--add-header', 'Accept:text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                '--add-header', 'Accept-Encoding:gzip, deflate',
-                '--add-header', 'DNT:1',
-            ])
-        else:
-            # Minimal stealth when disabled
-            if client_type == 'android':
-                cmd.extend(['--extractor-args', 'youtube:player_client=android'])
+        if client_type is None:
+            client_type = self._current_client_type()
+        
+        cmd = stealth_args(self.user_agent, cookie_file, client_type, self.use_stealth_mode)
+        
+        # Transfer options only matter for downloads, not for -J metadata fetches
+        if '-J' not in base_args:
+            cmd.extend(self._download_options())
         
         return cmd + base_args
     
+    def _download_options(self):
+        """yt-dlp fragment/resume/external downloader options from Settings"""
+        try:
+            fragments = int(self.concurrent_fragments_var.get()) if hasattr(self, 'concurrent_fragments_var') else 1
+        except (tk.TclError, ValueError):
+            fragments = 1
+        resume = self.resume_var.get() if hasattr(self, 'resume_var') else True
+        
+        downloader = self.external_downloader_var.get() if hasattr(self, 'external_downloader_var') else 'none'
+        if downloader and downloader != 'none' and not shutil.which(downloader):
+            if downloader not in self._downloader_warned:
+                self._downloader_warned.add(downloader)
+                self.root.after(0, lambda d=downloader: self.log(f"[WARNING] External downloader '{d}' not found on PATH, using built-in downloader"))
+            downloader = None
+        return transfer_args(fragments, resume, downloader)
+    
     def extract_youtube_url(self, text):
-        if not text:
-            return None
-        
-        self.log(f"[DEBUG] Extracting URL from: {text[:100]}...")
-        
-        # Pattern 1: Markdown format [URL](URL)
-        markdown_pattern = r'\[(https://www\.youtube\.com/watch\?v=[\w-]+)\]\(https://www\.youtube\.com/watch\?v=[\w-]+\)'
-        match = re.search(markdown_pattern, text)
-        if match:
-            url = match.group(1)
-            self.log(f"[DEBUG] Extracted URL (markdown): {url}")
-            return url
-        
-        # Pattern 2: Direct YouTube video URL
-        url_pattern = r'https://www\.youtube\.com/watch\?v=[\w-]+'
-        match = re.search(url_pattern, text)
-        if match:
-            url = match.group(0)
-            self.log(f"[DEBUG] Extracted URL (direct): {url}")
-            return url
-        
-        # Pattern 3: YouTube search URL - extract search query and use it directly
-        search_pattern = r'https://www\.youtube\.com/results\?search_query=([^&\s]+)'
-        match = re.search(search_pattern, text)
-        if match:
-            search_query = match.group(1)
-            # URL decode the search query
-            import urllib.parse
-            decoded_query = urllib.parse.unquote_plus(search_query)
-            self.log(f"[DEBUG] Extracted search query: {decoded_query}")
-            self.log(f"[INFO] Using search query as yt-dlp input: {decoded_query}")
-            return decoded_query
-        
-        self.log(f"[ERROR] No supported URL pattern found in text")
-        return None
+        return extract_youtube_url(text, self.log)
     
     def on_video_select(self, event):
         selection = self.video_listbox.curselection()
@@ -761,61 +772,59 @@ Note: Links in CSV can be in markdown format [URL](URL) or plain URLs.
         thread.daemon = True
         thread.start()
     
+    def clear_metadata_cache(self):
+        """Forget all cached stream info"""
+        self.metadata_cache.clear()
+        self.log("[INFO] Stream info cache cleared")
+    
+    def _cached_video_info(self, url, log_fn=None):
+        """Cached -J info for url (formats, title, duration), or None"""
+        data = self.metadata_cache.get(media_key(url))
+        if data is not None and log_fn is not None:
+            self.root.after(0, lambda: log_fn("[INFO] Using cached stream info"))
+        return data
+    
     def _fetch_streams_thread(self, url):
         try:
-            # Try with current setting first (web client by default for more formats)
-            cmd = self.build_ytdlp_command(['-J', url])
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-            )
+            data = self._cached_video_info(url, self.log)
+            if data is not None:
+                self._show_fetched_streams(data)
+                return
             
-            # If web client fails with 403 and Android client is disabled, try Android client
-            if (result.returncode != 0 and 
-                ('403' in result.stderr or 'Forbidden' in result.stderr) and 
-                not self.use_android_client):
-                self.root.after(0, lambda: self.log("[INFO] Web client blocked, trying Android client..."))
-                # Temporarily enable Android client for this fetch
-                original_setting = self.use_android_client
-                self.use_android_client = True
-                cmd = self.build_ytdlp_command(['-J', url])
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-                )
-                # Restore original setting
-                self.use_android_client = original_setting
-                if result.returncode == 0:
-                    self.root.after(0, lambda: self.log("[INFO] Consider enabling Android Client Mode in Settings to avoid 403 errors"))
+            # Best known client first (the Settings choice until another one proves better)
+            returncode, stdout, stderr, client = self.run_ytdlp_with_fallback(['-J', url], log_fn=self.log)
+            if returncode == 0 and client != self._current_client_type():
+                self.root.after(0, lambda c=client: self.log(f"[INFO] Fetched with {c} client; consider selecting it in Settings to avoid 403 errors"))
             
-            if result.returncode != 0:
-                error_msg = result.stderr
+            if returncode != 0:
+                error_msg = last_error_line(stderr)
                 self.root.after(0, lambda msg=error_msg: self.log(f"[ERROR] {msg}"))
                 self.root.after(0, lambda: self.set_busy(False))
                 return
             
-            data = json.loads(result.stdout)
-            formats = data.get('formats', [])
-            
-            # Store YouTube title in current video info for filename pattern
-            if self.current_video_info:
-                youtube_title = data.get('title', '')
-                if youtube_title:
-                    self.current_video_info['YouTube Title'] = youtube_title
-            
-            self.available_streams = formats
-            self.root.after(0, lambda: self.display_streams(formats))
-            self.root.after(0, lambda: self.set_busy(False))
+            data = json.loads(stdout)
+            self.metadata_cache.put(media_key(url), data)
+            self.metadata_cache.flush()
+            self._show_fetched_streams(data)
             
         except Exception as e:
             error_msg = str(e)
             self.root.after(0, lambda msg=error_msg: self.log(f"[ERROR] Fetching streams: {msg}"))
             self.root.after(0, lambda: self.set_busy(False))
     
+    def _show_fetched_streams(self, data):
+        formats = data.get('formats', [])
+        
+        # Store YouTube title in current video info for filename pattern
+        if self.current_video_info:
+            youtube_title = data.get('title', '')
+            if youtube_title:
+                self.current_video_info['YouTube Title'] = youtube_title
+        
+        self.available_streams = formats
+        self.root.after(0, lambda: self.display_streams(formats))
+        self.root.after(0, lambda: self.set_busy(False))
+    
     def display_streams(self, formats):
         self.stream_tree.delete(*self.stream_tree.get_children())
         
@@ -922,59 +931,21 @@ Note: Links in CSV can be in markdown format [URL](URL) or plain URLs.
             # Use format_id+bestaudio to ensure audio is included for video-only streams
             download_format = f"{format_id}+bestaudio/best"
             
-            cmd = self.build_ytdlp_command([
-                '-f', download_format,
-                '-o', output_path + '.%(ext)s',
-                url
-            ])
-            
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+            returncode, _, _, filepath = self._run_download(
+                ['-f', download_format, '-o', output_path + '.%(ext)s', url],
+                log_fn=self.log,
+                line_fn=self._progress_line_handler(self.log, lambda: self.progress_label),
             )
             
-            self.current_process = process
-            
-            for line in process.stdout:
-                if self.cancel_download:
-                    process.terminate()
-                    self.root.after(0, lambda: self.log("[INFO] Download cancelled by user"))
-                    self.root.after(0, lambda: self.set_busy(False))
-                    return
-                
-                line_text = line.strip()
-                if line_text:
-                    self.root.after(0, lambda l=line_text: self.log(l))
-            
-            process.wait()
-            
             if self.cancel_download:
                 self.root.after(0, lambda: self.log("[INFO] Download cancelled"))
                 self.root.after(0, lambda: self.set_busy(False))
                 return
             
-            if process.returncode == 0:
-                # Find the actual downloaded file
+            if returncode == 0:
                 download_dir = self.get_download_path()
-                actual_file = None
-                if os.path.exists(download_dir):
-                    # Find most recently modified file matching the pattern
-                    files = [f for f in os.listdir(download_dir) if f.startswith(filename)]
-                    if files:
-                        files_with_path = [os.path.join(download_dir, f) for f in files]
-                        actual_file = max(files_with_path, key=os.path.getmtime)
-                
-                if actual_file:
-                    actual_filename = os.path.basename(actual_file)
-                    self.root.after(0, lambda f=actual_filename, p=actual_file: self.log(f"[SUCCESS] Download completed successfully!"))
-                    self.root.after(0, lambda f=actual_filename, p=actual_file: self.log(f"[DEBUG] Exported filename: {f}"))
-                    self.root.after(0, lambda f=actual_filename, p=actual_file: self.log(f"[DEBUG] Full path: {p}"))
-                else:
-                    self.root.after(0, lambda: self.log("[SUCCESS] Download completed successfully!"))
-                    self.root.after(0, lambda: self.log(f"[DEBUG] Expected filename pattern: {filename}"))
+                actual_file = self._log_downloaded(download_dir, filename, "[SUCCESS] Download completed successfully!", filepath, log_fn=self.log)
+                self._record_download(download_dir, url, actual_file, download_format)
                 self.root.after(0, lambda: messagebox.showinfo("Success", "Download completed!"))
                 self.root.after(0, lambda: self.set_busy(False))
             else:
@@ -1050,211 +1021,290 @@ Note: Links in CSV can be in markdown format [URL](URL) or plain URLs.
         thread.daemon = True
         thread.start()
     
-    def _batch_download_thread(self, video_indices, format_id):
-        success_count = 0
-        error_count = 0
+    def _create_download_scheduler(self):
+        """Scheduler for batch jobs using the parallel download settings."""
+        try:
+            workers = int(self.max_workers_var.get())
+        except (AttributeError, tk.TclError, ValueError):
+            workers = DEFAULT_MAX_WORKERS
+        try:
+            per_host = int(self.per_host_limit_var.get())
+        except (AttributeError, tk.TclError, ValueError):
+            per_host = DEFAULT_PER_HOST_LIMIT
+        return DownloadScheduler(
+            max_workers=workers,
+            per_host_limit=per_host,
+            is_cancelled=lambda: self.cancel_download,
+        )
+    
+    def run_ytdlp(self, base_args, client_type=None, line_fn=None):
+        """Run yt-dlp with the stealth options, in-process when enabled.
         
-        for i, index in enumerate(video_indices):
-            if self.cancel_download:
-                self.root.after(0, lambda: self.log("[INFO] Batch download cancelled by user"))
-                break
-            
+        Args:
+            base_args: List of yt-dlp arguments
+            client_type: Player client override (web/android/ios/tv)
+            line_fn: Optional callback receiving output/progress lines
+        
+        Returns:
+            Tuple of (returncode, stdout, stderr)
+        """
+        return self.ytdlp_runner.run(base_args, client_type, line_fn)
+    
+    def run_ytdlp_with_fallback(self, base_args, log_fn=None, line_fn=None):
+        """Run yt-dlp, retrying 403 errors with other player clients.
+        
+        Clients are tried in the order suggested by self.client_selector, so a
+        client that worked earlier in the session is tried first.
+        
+        Args:
+            base_args: List of yt-dlp arguments
+            log_fn: Log function for fallback messages (e.g. self.log)
+            line_fn: Optional callback receiving output/progress lines
+        
+        Returns:
+            Tuple of (returncode, stdout, stderr, client); on failure stderr
+            is the first error seen
+        """
+        def on_retry(client):
+            if log_fn:
+                self.root.after(0, lambda c=client: log_fn(f"[WARNING] 403 detected, trying {c} client..."))
+        return self.ytdlp_runner.run_with_fallback(
+            base_args, self._current_client_type(), on_retry=on_retry, line_fn=line_fn
+        )
+    
+    def _log_client_summary(self):
+        summary = self.client_selector.summary()
+        if summary:
+            self.root.after(0, lambda msg=summary: self.log(f"[INFO] Player client results this session (ok/tried): {msg}"))
+    
+    def _current_client_type(self):
+        return self.client_type_var.get() if hasattr(self, 'client_type_var') else ('android' if self.use_android_client else 'web')
+    
+    def _sleep_between_downloads(self):
+        """Randomized delay between downloads (80-120% of the configured delay)"""
+        delay = self.delay_var.get() if hasattr(self, 'delay_var') else self.download_delay
+        if delay <= 0:
+            return
+        deadline = time.monotonic() + delay * random.uniform(0.8, 1.2)
+        while not self.cancel_download and time.monotonic() < deadline:
+            time.sleep(min(0.2, max(0.0, deadline - time.monotonic())))
+    
+    def _find_downloaded_file(self, download_dir, filename):
+        """Most recently modified file in download_dir starting with filename (fallback when yt-dlp reported no path)"""
+        if not os.path.exists(download_dir):
+            return None
+        files = [f for f in os.listdir(download_dir) if f.startswith(filename)]
+        if not files:
+            return None
+        files_with_path = [os.path.join(download_dir, f) for f in files]
+        return max(files_with_path, key=os.path.getmtime)
+    
+    def _log_downloaded(self, download_dir, filename, success_msg, filepath=None, log_fn=None):
+        """Log a finished download; returns the output path (reported by yt-dlp when available)"""
+        log_fn = log_fn or self.log
+        actual_file = filepath if filepath and os.path.isfile(filepath) else None
+        if actual_file is None:
+            actual_file = self._find_downloaded_file(download_dir, filename)
+        self.root.after(0, lambda msg=success_msg: log_fn(msg))
+        if actual_file:
+            actual_filename = os.path.basename(actual_file)
+            self.root.after(0, lambda af=actual_filename: log_fn(f"[DEBUG] Exported filename: {af}"))
+            self.root.after(0, lambda fp=actual_file: log_fn(f"[DEBUG] Full path: {fp}"))
+        else:
+            self.root.after(0, lambda out=filename: log_fn(f"[DEBUG] Expected filename pattern: {out}"))
+        return actual_file
+    
+    def _download_archive(self, download_dir):
+        with self._process_lock:
+            archive = self._archives.get(download_dir)
+            if archive is None:
+                archive = DownloadArchive(download_dir)
+                self._archives[download_dir] = archive
+            return archive
+    
+    def _run_download(self, base_args, log_fn=None, line_fn=None):
+        """Download with run_ytdlp_with_fallback, asking yt-dlp to report the final file path.
+        
+        Returns:
+            Tuple of (returncode, stderr, client, filepath or None)
+        """
+        fd, report_path = tempfile.mkstemp(prefix='ytdlp_', suffix='.txt')
+        os.close(fd)
+        started = time.monotonic()
+        try:
+            returncode, _, stderr, client = self.run_ytdlp_with_fallback(
+                ['--print-to-file', 'after_move:filepath', report_path] + base_args,
+                log_fn=log_fn,
+                line_fn=line_fn,
+            )
+            filepath = read_reported_filepath(report_path) if returncode == 0 else None
+        finally:
             try:
-                row = self.csv_data[index]
-                url = self.extract_youtube_url(row.get('Video Link', ''))
-                
-                if not url:
-                    error_count += 1
-                    self.root.after(0, lambda idx=index+1: self.log(f"[ERROR] Video {idx}: Could not extract URL"))
-                    continue
-                
-                filename_pattern = self.filename_var.get()
-                filename = self.create_filename_from_pattern(filename_pattern, row)
-                
-                self.root.after(
-                    0,
-                    lambda idx=i+1, total=len(video_indices), name=row.get('Song Title', 'Unknown'):
-                    self.set_busy(True, f"Downloading {idx}/{total}: {name}")
-                )
-                
-                self.root.after(
-                    0,
-                    lambda msg=f"\n[INFO] Downloading ({i+1}/{len(video_indices)}): {row.get('Song Title', 'Unknown')} - {row.get('Artist', 'Unknown')}":
-                    self.log(msg)
-                )
-                
-                output_path = os.path.join(self.get_download_path(), filename)
-                
-                # Rotate user agent for each download to avoid detection
-                if i > 0 and i % 5 == 0:  # Change user agent every 5 downloads
-                    self.user_agent = self.generate_user_agent()
-                    self.root.after(0, lambda: self.log(f"[DEBUG] Rotated user agent for stealth"))
-                
-                # Use format_id+bestaudio to ensure audio is included for video-only streams
-                download_format = f"{format_id}+bestaudio/best"
-                
-                cmd = self.build_ytdlp_command([
-                    '-f', download_format,
-                    '-o', output_path + '.%(ext)s',
-                    url
-                ])
-                
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-                )
-                
-                self.current_process = process
-                
-                stdout, stderr = process.communicate()
-                
-                if self.cancel_download:
-                    try:
-                        process.terminate()
-                    except:
-                        pass
-                    self.root.after(0, lambda: self.log("[INFO] Batch download cancelled by user"))
-                    break
-                
-                if process.returncode == 0:
-                    success_count += 1
-                    
-                    # Find the actual downloaded file
-                    download_dir = self.get_download_path()
-                    actual_file = None
-                    if os.path.exists(download_dir):
-                        files = [f for f in os.listdir(download_dir) if f.startswith(filename)]
-                        if files:
-                            files_with_path = [os.path.join(download_dir, f) for f in files]
-                            actual_file = max(files_with_path, key=os.path.getmtime)
-                    
-                    if actual_file:
-                        actual_filename = os.path.basename(actual_file)
-                        self.root.after(
-                            0,
-                            lambda out=filename, af=actual_filename, fp=actual_file: self.log(f"[SUCCESS] Downloaded: {out}")
-                        )
-                        self.root.after(
-                            0,
-                            lambda af=actual_filename: self.log(f"[DEBUG] Exported filename: {af}")
-                        )
-                        self.root.after(
-                            0,
-                            lambda fp=actual_file: self.log(f"[DEBUG] Full path: {fp}")
-                        )
-                    else:
-                        self.root.after(
-                            0,
-                            lambda out=filename: self.log(f"[SUCCESS] Downloaded: {out}")
-                        )
-                        self.root.after(
-                            0,
-                            lambda out=filename: self.log(f"[DEBUG] Expected filename pattern: {out}")
-                        )
-                else:
-                    error_count += 1
-                    error_msg = stderr if stderr else "Unknown error"
-                    
-                    # If 403 error, try with different clients
-                    if '403' in error_msg or 'Forbidden' in error_msg:
-                        self.root.after(0, lambda: self.log(f"[WARNING] 403 detected, trying alternative clients..."))
-                        original_client = self.client_type_var.get() if hasattr(self, 'client_type_var') else 'web'
-                        
-                        # Try iOS, Android, TV clients in order
-                        fallback_clients = ['ios', 'android', 'tv']
-                        fallback_success = False
-                        
-                        for fallback_client in fallback_clients:
-                            if fallback_client == original_client:
-                                continue
-                            
-                            if hasattr(self, 'client_type_var'):
-                                self.client_type_var.set(fallback_client)
-                            cmd_fallback = self.build_ytdlp_command([
-                                '-f', download_format,
-                                '-o', output_path + '.%(ext)s',
-                                url
-                            ])
-                            process_fallback = subprocess.run(
-                                cmd_fallback,
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE,
-                                text=True,
-                                creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-                            )
-                            
-                            if process_fallback.returncode == 0:
-                                fallback_success = True
-                                success_count += 1
-                                error_count -= 1
-                                
-                                # Find the actual downloaded file
-                                download_dir = self.get_download_path()
-                                actual_file = None
-                                if os.path.exists(download_dir):
-                                    files = [f for f in os.listdir(download_dir) if f.startswith(filename)]
-                                    if files:
-                                        files_with_path = [os.path.join(download_dir, f) for f in files]
-                                        actual_file = max(files_with_path, key=os.path.getmtime)
-                                
-                                if actual_file:
-                                    actual_filename = os.path.basename(actual_file)
-                                    self.root.after(0, lambda fname=filename, cl=fallback_client, af=actual_filename, fp=actual_file: self.log(f"[SUCCESS] Downloaded with {cl} client: {fname}"))
-                                    self.root.after(0, lambda af=actual_filename: self.log(f"[DEBUG] Exported filename: {af}"))
-                                    self.root.after(0, lambda fp=actual_file: self.log(f"[DEBUG] Full path: {fp}"))
-                                else:
-                                    self.root.after(0, lambda fname=filename, cl=fallback_client: self.log(f"[SUCCESS] Downloaded with {cl} client: {fname}"))
-                                    self.root.after(0, lambda fname=filename: self.log(f"[DEBUG] Expected filename pattern: {fname}"))
-                                break
-                        
-                        if hasattr(self, 'client_type_var'):
-                            self.client_type_var.set(original_client)
-                        
-                        if not fallback_success:
-                            self.root.after(0, lambda err=error_msg: self.log(f"[ERROR] Download failed: {err[:200]}"))
-                    elif 'Sign in to confirm your age' in error_msg or 'inappropriate for some users' in error_msg:
-                        self.root.after(0, lambda: self.log(f"[ERROR] Age-restricted video. Configure cookies in Settings tab to download."))
-                    else:
-                        self.root.after(0, lambda err=error_msg: self.log(f"[ERROR] Download failed: {err[:200]}"))
-                
-                # Add delay between downloads to avoid rate limiting
-                if i < len(video_indices) - 1:  # Don't delay after last download
-                    delay = self.delay_var.get() if hasattr(self, 'delay_var') else self.download_delay
-                    if delay > 0:
-                        # Add some randomness to delay (80-120% of base delay)
-                        actual_delay = delay * random.uniform(0.8, 1.2)
-                        time.sleep(actual_delay)
-                
-            except Exception as e:
-                if not self.cancel_download:
-                    error_count += 1
-                    error_msg = str(e)
-                    self.root.after(
-                        0,
-                        lambda msg=error_msg: self.log(f"[ERROR] Exception: {msg}")
-                    )
-            finally:
-                self.current_process = None
+                os.remove(report_path)
+            except OSError:
+                pass
+        if filepath and log_fn:
+            self._log_throughput(filepath, time.monotonic() - started, log_fn)
+        return returncode, stderr, client, filepath
+    
+    def _progress_line_handler(self, log_fn, get_label):
+        """line_fn that logs yt-dlp output and shows parsed percent/speed/ETA in a progress label.
+        
+        Label updates are throttled to PROGRESS_UI_INTERVAL_MS and progress
+        lines are logged at most every PROGRESS_LOG_INTERVAL_S.
+        """
+        last = {'label': 0.0, 'log': 0.0}
+        
+        def handle(line):
+            progress = parse_progress_line(line)
+            if progress is None:
+                self.root.after(0, lambda l=line: log_fn(l))
+                return
+            now = time.monotonic()
+            finished = progress['percent'] >= 100.0
+            if finished or now - last['label'] >= PROGRESS_UI_INTERVAL_MS / 1000.0:
+                last['label'] = now
+                self.root.after(0, lambda t=format_progress(progress): get_label().config(text=f"Downloading... {t}"))
+            if finished or now - last['log'] >= PROGRESS_LOG_INTERVAL_S:
+                last['log'] = now
+                self.root.after(0, lambda l=line: log_fn(l))
+        return handle
+    
+    def _begin_batch_progress(self, label, total):
+        with self._progress_lock:
+            self._worker_progress = {}
+            self._batch_progress = {'label': label, 'done': 0, 'total': total}
+        self.root.after(0, self._refresh_batch_progress)
+    
+    def _end_batch_progress(self):
+        with self._progress_lock:
+            self._batch_progress = None
+            self._worker_progress = {}
+    
+    def _batch_line_handler(self, title):
+        """line_fn for batch workers: records the latest progress of the calling worker"""
+        def handle(line):
+            progress = parse_progress_line(line)
+            if progress is not None:
+                with self._progress_lock:
+                    self._worker_progress[threading.current_thread().name] = (title, progress)
+        return handle
+    
+    def _run_batch_item(self, item_fn, *args):
+        """Run one batch item and count it as done for the progress label"""
+        try:
+            return item_fn(*args)
+        finally:
+            with self._progress_lock:
+                self._worker_progress.pop(threading.current_thread().name, None)
+                if self._batch_progress is not None:
+                    self._batch_progress['done'] += 1
+    
+    def _refresh_batch_progress(self):
+        """Show per-worker percent/speed/ETA at a fixed rate while a batch runs"""
+        with self._progress_lock:
+            state = dict(self._batch_progress) if self._batch_progress else None
+            workers = list(self._worker_progress.values())
+        if state is None:
+            return
+        parts = [f"{state['label']} {state['done']}/{state['total']}"]
+        total_speed = sum(progress.get('speed') or 0 for _, progress in workers)
+        if total_speed:
+            parts.append(f"{format_bytes(total_speed)}/s")
+        for title, progress in workers:
+            parts.append(f"{title[:24]}: {format_progress(progress)}")
+        self.progress_label.config(text=" | ".join(parts))
+        self.root.after(PROGRESS_UI_INTERVAL_MS, self._refresh_batch_progress)
+    
+    def _log_throughput(self, filepath, elapsed, log_fn):
+        try:
+            size = os.path.getsize(filepath)
+        except OSError:
+            return
+        rate = size / elapsed if elapsed > 0 else 0.0
+        self.root.after(
+            0,
+            lambda msg=f"[INFO] Transferred {format_bytes(size)} in {elapsed:.1f}s ({format_bytes(rate)}/s)": log_fn(msg)
+        )
+    
+    def _archive_key(self, url, key_suffix=''):
+        """Download archive key: the video id (or normalized search query), plus a suffix for audio-only targets"""
+        key = media_key(url) if url else None
+        return f"{key}{key_suffix}" if key else None
+    
+    def _resolved_archive_key(self, url, key_suffix=''):
+        """Archive key of the video a search query resolved to (from the cached -J info), or None"""
+        video_id = info_video_id(self.metadata_cache.get(media_key(url))) if url else None
+        return f"{video_id}{key_suffix}" if video_id else None
+    
+    def _record_download(self, download_dir, url, filepath, format_id, key_suffix=''):
+        if filepath:
+            self._download_archive(download_dir).record(
+                self._archive_key(url, key_suffix), filepath, format_id,
+                resolved_key=self._resolved_archive_key(url, key_suffix),
+            )
+    
+    def _skip_archived_jobs(self, jobs, download_dir, key_suffix=''):
+        """Drop jobs whose video is already in the folder's download archive"""
+        if not (self.skip_archived_var.get() if hasattr(self, 'skip_archived_var') else True):
+            return jobs, 0
+        archive = self._download_archive(download_dir)
+        pending = []
+        for job in jobs:
+            entry = archive.completed(self._archive_key(job[2], key_suffix))
+            if entry is None:
+                pending.append(job)
+            else:
+                self.root.after(0, lambda p=entry['path']: self.log(f"[INFO] Already downloaded, skipping: {os.path.basename(p)}"))
+        archived = len(jobs) - len(pending)
+        if archived:
+            self.root.after(0, lambda n=archived: self.log(f"[INFO] Skipping {n} video(s) found in the download archive"))
+        return pending, archived
+    
+    def _batch_jobs(self, video_indices):
+        """(position, csv index, url) per row; url is None when it cannot be extracted"""
+        jobs = []
+        for i, index in enumerate(video_indices):
+            row = self.csv_data[index]
+            jobs.append((i, index, self.extract_youtube_url(row.get('Video Link', ''))))
+        return jobs
+    
+    def _batch_download_thread(self, video_indices, format_id):
+        total = len(video_indices)
+        filename_pattern = self.filename_var.get()
+        download_dir = self.get_download_path()
+        jobs, archived_count = self._skip_archived_jobs(self._batch_jobs(video_indices), download_dir)
+        
+        self._begin_batch_progress("Downloading", len(jobs))
+        scheduler = self._create_download_scheduler()
+        results = scheduler.run(
+            jobs,
+            lambda job, _meta: self._run_batch_item(self._batch_download_item, job, total, format_id, filename_pattern, download_dir),
+            host_fn=lambda job: url_host(job[2]),
+            after_job_fn=lambda _job: self._sleep_between_downloads(),
+        )
+        self._end_batch_progress()
+        self._log_client_summary()
+        success_count = results.count('success')
+        error_count = results.count('error')
         
         if not self.cancel_download:
             self.root.after(
                 0,
-                lambda s=success_count, e=error_count:
-                self.log(f"\n[COMPLETE] Batch download finished: {s} succeeded, {e} failed")
+                lambda s=success_count, e=error_count, a=archived_count:
+                self.log(f"\n[COMPLETE] Batch download finished: {s} succeeded, {e} failed, {a} already downloaded")
             )
             
             self.root.after(
                 0,
-                lambda s=success_count, e=error_count:
+                lambda s=success_count, e=error_count, a=archived_count:
                 messagebox.showinfo(
                     "Batch Download Complete",
-                    f"Batch download finished!\n\nSuccessful: {s}\nFailed: {e}"
+                    f"Batch download finished!\n\nSuccessful: {s}\nFailed: {e}\nAlready downloaded: {a}"
                 )
             )
         else:
+            self.root.after(0, lambda: self.log("[INFO] Batch download cancelled by user"))
             self.root.after(
                 0,
                 lambda s=success_count, e=error_count:
@@ -1263,6 +1313,71 @@ Note: Links in CSV can be in markdown format [URL](URL) or plain URLs.
         
         self.root.after(0, lambda: self.set_busy(False))
     
+    def _batch_download_item(self, job, total, format_id, filename_pattern, download_dir):
+        """Download one CSV row with a fixed format; returns 'success', 'error' or None if cancelled"""
+        i, index, url = job
+        try:
+            row = self.csv_data[index]
+            if not url:
+                self.root.after(0, lambda idx=index+1: self.log(f"[ERROR] Video {idx}: Could not extract URL"))
+                return 'error'
+            
+            filename = self.create_filename_from_pattern(filename_pattern, row)
+            
+            self.root.after(
+                0,
+                lambda msg=f"\n[INFO] Downloading ({i+1}/{total}): {row.get('Song Title', 'Unknown')} - {row.get('Artist', 'Unknown')}":
+                self.log(msg)
+            )
+            
+            output_path = os.path.join(download_dir, filename)
+            
+            # Rotate user agent for each download to avoid detection
+            if i > 0 and i % 5 == 0:  # Change user agent every 5 downloads
+                self.user_agent = self.generate_user_agent()
+                self.root.after(0, lambda: self.log(f"[DEBUG] Rotated user agent for stealth"))
+            
+            # Use format_id+bestaudio to ensure audio is included for video-only streams
+            download_format = f"{format_id}+bestaudio/best"
+            base_args = [
+                '-f', download_format,
+                '-o', output_path + '.%(ext)s',
+                url
+            ]
+            
+            returncode, stderr, client, filepath = self._run_download(
+                base_args, log_fn=self.log, line_fn=self._batch_line_handler(row.get('Song Title', filename))
+            )
+            if self.cancel_download:
+                return None
+            
+            if returncode == 0:
+                if client != self._current_client_type():
+                    filepath = self._log_downloaded(download_dir, filename, f"[SUCCESS] Downloaded with {client} client: {filename}", filepath)
+                else:
+                    filepath = self._log_downloaded(download_dir, filename, f"[SUCCESS] Downloaded: {filename}", filepath)
+                self._record_download(download_dir, url, filepath, download_format)
+                return 'success'
+            
+            error_msg = stderr if stderr else "Unknown error"
+            
+            if 'Sign in to confirm your age' in error_msg or 'inappropriate for some users' in error_msg:
+                self.root.after(0, lambda: self.log(f"[ERROR] Age-restricted video. Configure cookies in Settings tab to download."))
+            else:
+                # Includes 403 after all player clients were tried
+                self.root.after(0, lambda err=error_msg: self.log(f"[ERROR] Download failed: {last_error_line(err)[:200]}"))
+            return 'error'
+            
+        except Exception as e:
+            if self.cancel_download:
+                return None
+            error_msg = str(e)
+            self.root.after(
+                0,
+                lambda msg=error_msg: self.log(f"[ERROR] Exception: {msg}")
+            )
+            return 'error'
+    
     def auto_download_lowest_resolution_selected(self):
         """Auto-download lowest resolution for selected videos"""
         if self.is_busy:
@@ -1317,14 +1432,7 @@ Note: Links in CSV can be in markdown format [URL](URL) or plain URLs.
         Returns:
             Quality category: 'low' (0-360p), 'medium' (480p-720p), 'high' (1080p+)
         """
-        if not height:
-            return 'low'
-        if height <= 360:
-            return 'low'
-        elif height <= 720:
-            return 'medium'
-        else:
-            return 'high'
+        return categorize_quality(height)
     
     def _find_quality_sorted_streams(self, formats):
         """Find video streams sorted by quality priority: high -> medium -> low
@@ -1335,53 +1443,7 @@ Note: Links in CSV can be in markdown format [URL](URL) or plain URLs.
         Returns:
             List of format_ids sorted by quality priority (high first, then medium, then low), or empty list if none found
         """
-        if not formats:
-            return []
-        
-        # Filter for video streams (combined video+audio preferred, then video-only)
-        video_streams = []
-        for fmt in formats:
-            vcodec = fmt.get('vcodec', 'none')
-            if vcodec != 'none':
-                # Prefer combined streams (have both video and audio)
-                is_combined = fmt.get('acodec', 'none') != 'none'
-                resolution = fmt.get('resolution', 'unknown')
-                height = fmt.get('height', 0)
-                width = fmt.get('width', 0)
-                
-                # Extract numeric height if resolution is like "720p" or "480p"
-                if not height and resolution and resolution != 'unknown':
-                    height_match = re.search(r'(\d+)p?', str(resolution))
-                    if height_match:
-                        height = int(height_match.group(1))
-                
-                quality_category = self._categorize_quality(height)
-                
-                video_streams.append({
-                    'format_id': fmt.get('format_id'),
-                    'height': height,
-                    'width': width,
-                    'resolution': resolution,
-                    'is_combined': is_combined,
-                    'quality_category': quality_category,
-                    'format': fmt
-                })
-        
-        if not video_streams:
-            return []
-        
-        # Define quality priority: high=0, medium=1, low=2 (lower number = higher priority)
-        quality_priority = {'high': 0, 'medium': 1, 'low': 2}
-        
-        # Sort by quality priority (high first), then by height within same category, prefer combined streams
-        video_streams.sort(key=lambda x: (
-            quality_priority.get(x['quality_category'], 2),  # Quality priority
-            x['height'] or 0,  # Within same category, sort by height
-            not x['is_combined']  # Prefer combined streams
-        ))
-        
-        # Return list of format_ids sorted by quality priority
-        return [stream['format_id'] for stream in video_streams]
+        return quality_sorted_format_ids(formats)
     
     def _find_lowest_resolution_stream(self, formats):
         """Find video streams sorted from lowest to highest resolution
@@ -1430,349 +1492,408 @@ Note: Links in CSV can be in markdown format [URL](URL) or plain URLs.
         # Return list of format_ids sorted from lowest to highest
         return [stream['format_id'] for stream in video_streams]
     
+    def _fetch_video_info(self, url):
+        """Run yt-dlp -J for url (cached), retrying alternative clients on 403.
+        
+        Returns:
+            Tuple of (info dict or None, error message)
+        """
+        if self.cancel_download:
+            return None, "Cancelled"
+        data = self._cached_video_info(url)
+        if data is not None:
+            return data, ""
+        returncode, stdout, stderr, _ = self.run_ytdlp_with_fallback(['-J', url], log_fn=self.log)
+        
+        if returncode != 0:
+            return None, last_error_line(stderr)[:200]
+        try:
+            data = json.loads(stdout)
+        except json.JSONDecodeError:
+            return None, "Failed to parse stream data"
+        self.metadata_cache.put(media_key(url), data)
+        return data, ""
+    
     def _auto_download_lowest_resolution_thread(self, video_indices):
         """Thread that handles auto-download with quality fallback: tries high quality first, then medium, then low"""
-        success_count = 0
-        error_count = 0
-        skipped_count = 0
+        total = len(video_indices)
+        filename_pattern = self.filename_var.get()
+        download_dir = self.get_download_path()
+        jobs, archived_count = self._skip_archived_jobs(self._batch_jobs(video_indices), download_dir)
+        
+        # Metadata (-J) for upcoming rows is fetched while earlier rows download
+        self._begin_batch_progress("Auto-downloading", len(jobs))
+        scheduler = self._create_download_scheduler()
+        results = scheduler.run(
+            jobs,
+            lambda job, fetched: self._run_batch_item(self._auto_download_item, job, fetched, total, filename_pattern, download_dir),
+            prefetch_fn=lambda job: self._fetch_video_info(job[2]) if job[2] else None,
+            host_fn=lambda job: url_host(job[2]),
+            after_job_fn=lambda _job: self._sleep_between_downloads(),
+        )
+        self.metadata_cache.flush()
+        self._end_batch_progress()
+        self._log_client_summary()
+        success_count = results.count('success')
+        error_count = results.count('error')
+        skipped_count = results.count('skipped')
         
-        for i, index in enumerate(video_indices):
+        if not self.cancel_download:
+            self.root.after(
+                0,
+                lambda s=success_count, e=error_count, sk=skipped_count, a=archived_count:
+                self.log(f"\n[COMPLETE] Auto-download finished: {s} succeeded, {e} failed, {sk} skipped, {a} already downloaded")
+            )
+            
+            self.root.after(
+                0,
+                lambda s=success_count, e=error_count, sk=skipped_count, a=archived_count:
+                messagebox.showinfo(
+                    "Auto-Download Complete",
+                    f"Auto-download finished!\n\nSuccessful: {s}\nFailed: {e}\nSkipped: {sk}\nAlready downloaded: {a}"
+                )
+            )
+        else:
+            self.root.after(0, lambda: self.log("[INFO] Auto-download cancelled by user"))
+            self.root.after(
+                0,
+                lambda s=success_count, e=error_count, sk=skipped_count:
+                self.log(f"\n[CANCELLED] Auto-download stopped: {s} succeeded, {e} failed, {sk} skipped")
+            )
+        
+        self.root.after(0, lambda: self.set_busy(False))
+    
+    def _auto_download_item(self, job, fetched, total, filename_pattern, download_dir):
+        """Download one CSV row trying qualities high -> medium -> low.
+        
+        Returns:
+            'success', 'error', 'skipped', or None if cancelled
+        """
+        i, index, url = job
+        try:
+            row = self.csv_data[index]
+            if not url:
+                self.root.after(0, lambda idx=index+1: self.log(f"[ERROR] Video {idx}: Could not extract URL"))
+                return 'error'
+            
+            # Create initial filename (will be updated after fetching YouTube title)
+            filename = self.create_filename_from_pattern(filename_pattern, row)
+            self.root.after(0, lambda fp=filename_pattern, fn=filename: self.log(f"[DEBUG] Filename pattern: {fp} -> initial: {fn}"))
+            
+            self.root.after(
+                0,
+                lambda msg=f"\n[INFO] Processing ({i+1}/{total}): {row.get('Song Title', row.get('Movie Title', 'Unknown'))} - {row.get('Artist', 'Unknown')}":
+                self.log(msg)
+            )
+            
             if self.cancel_download:
-                self.root.after(0, lambda: self.log("[INFO] Auto-download cancelled by user"))
-                break
+                return None
+            if isinstance(fetched, Exception):
+                raise fetched
+            data, error_msg = fetched if fetched else (None, "Unknown error")
             
-            try:
-                row = self.csv_data[index]
-                url = self.extract_youtube_url(row.get('Video Link', ''))
-                
-                if not url:
-                    error_count += 1
-                    self.root.after(0, lambda idx=index+1: self.log(f"[ERROR] Video {idx}: Could not extract URL"))
-                    continue
+            if data is None:
+                self._log_fetch_error(index, error_msg)
+                return 'error'
+            
+            formats = data.get('formats', [])
+            filename = self._filename_with_youtube_title(filename_pattern, row, data, filename)
+            
+            # Find all video streams sorted by quality priority: high -> medium -> low
+            format_ids = self._find_quality_sorted_streams(formats)
+            if not format_ids:
+                self.root.after(0, lambda idx=index+1: self.log(f"[WARNING] Video {idx}: No video streams found, skipping"))
+                return 'skipped'
+            
+            # Rotate user agent periodically
+            if i > 0 and i % 5 == 0:
+                self.user_agent = self.generate_user_agent()
+                self.root.after(0, lambda: self.log(f"[DEBUG] Rotated user agent for stealth"))
+            
+            # Try each resolution in quality priority order: high -> medium -> low
+            output_path = os.path.join(download_dir, filename)
+            
+            for attempt_idx, format_id in enumerate(format_ids):
+                if self.cancel_download:
+                    return None
                 
-                filename_pattern = self.filename_var.get()
-                # Create initial filename (will be updated after fetching YouTube title)
-                filename = self.create_filename_from_pattern(filename_pattern, row)
-                self.root.after(0, lambda fp=filename_pattern, fn=filename: self.log(f"[DEBUG] Filename pattern: {fp} -> initial: {fn}"))
+                # Get stream info for logging
+                stream_info = next((f for f in formats if f.get('format_id') == format_id), None)
+                resolution = stream_info.get('resolution', 'unknown') if stream_info else 'unknown'
+                height = stream_info.get('height', 0) if stream_info else 0
+                quality_category = self._categorize_quality(height)
                 
-                self.root.after(
-                    0,
-                    lambda idx=i+1, total=len(video_indices), name=row.get('Song Title', row.get('Movie Title', 'Unknown')):
-                    self.set_busy(True, f"Auto-downloading {idx}/{total}: {name} (fetching streams...)")
-                )
+                # Use format_id+bestaudio for video-only streams to merge audio
+                if is_video_only(stream_info):
+                    download_format = f"{format_id}+bestaudio/best"
+                    format_note = f"{format_id}+bestaudio"
+                else:
+                    download_format = format_id
+                    format_note = format_id
                 
-                self.root.after(
-                    0,
-                    lambda msg=f"\n[INFO] Processing ({i+1}/{len(video_indices)}): {row.get('Song Title', row.get('Movie Title', 'Unknown'))} - {row.get('Artist', 'Unknown')}":
-                    self.log(msg)
-                )
+                if attempt_idx == 0:
+                    self.root.after(0, lambda res=resolution, fid=format_note, q=quality_category: self.log(f"[INFO] Trying {q} quality first: {res} (format {fid})"))
+                else:
+                    self.root.after(0, lambda res=resolution, fid=format_note, att=attempt_idx+1, q=quality_category: self.log(f"[INFO] Previous failed, trying next quality ({att}/{len(format_ids)}): {q} - {res} (format {fid})"))
                 
-                # Fetch available streams
-                cmd = self.build_ytdlp_command(['-J', url])
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+                # Try download with current format
+                base_args = [
+                    '-f', download_format,
+                    '-o', output_path + '.%(ext)s',
+                    url
+                ]
+                # 403 errors are retried with other player clients, best known first
+                returncode, stderr, client, filepath = self._run_download(
+                    base_args, log_fn=self.log,
+                    line_fn=self._batch_line_handler(row.get('Song Title', row.get('Movie Title', filename)))
                 )
+                if self.cancel_download:
+                    return None
                 
-                # Try alternative clients if 403 error
-                if (result.returncode != 0 and 
-                    ('403' in result.stderr or 'Forbidden' in result.stderr)):
-                    self.root.after(0, lambda: self.log(f"[WARNING] 403 detected, trying alternative clients..."))
-                    original_client = self.client_type_var.get() if hasattr(self, 'client_type_var') else 'web'
-                    
-                    # Try iOS, Android, TV clients in order
-                    fallback_clients = ['ios', 'android', 'tv']
-                    for fallback_client in fallback_clients:
-                        if fallback_client == original_client:
-                            continue
-                        
-                        if hasattr(self, 'client_type_var'):
-                            self.client_type_var.set(fallback_client)
-                        cmd = self.build_ytdlp_command(['-J', url])
-                        result = subprocess.run(
-                            cmd,
-                            capture_output=True,
-                            text=True,
-                            creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-                        )
-                        if result.returncode == 0:
-                            break  # Success, stop trying
-                    
-                    if hasattr(self, 'client_type_var'):
-                        self.client_type_var.set(original_client)
-                
-                if result.returncode != 0:
-                    error_count += 1
-                    error_msg = result.stderr[:200] if result.stderr else "Unknown error"
-                    
-                    # Better error messages for common issues
-                    if 'Sign in to confirm your age' in error_msg or 'inappropriate for some users' in error_msg:
-                        error_msg_full = f"Age-restricted video. Use --cookies-from-browser or --cookies for authentication. See https://github.com/yt-dlp/yt-dlp/wiki/FAQ#how-do-i-pass-cookies-to-yt-dlp"
-                        self.root.after(0, lambda err=error_msg_full, idx=index+1: self.log(f"[ERROR] Video {idx}: {err}"))
-                    elif 'Video unavailable' in error_msg:
-                        self.root.after(0, lambda err=error_msg, idx=index+1: self.log(f"[ERROR] Video {idx}: Video unavailable (may be deleted or private)"))
-                    else:
-                        self.root.after(0, lambda err=error_msg, idx=index+1: self.log(f"[ERROR] Video {idx}: Failed to fetch streams - {err}"))
-                    continue
-                
-                # Parse stream data
-                try:
-                    data = json.loads(result.stdout)
-                    formats = data.get('formats', [])
-                    # Store YouTube title in row data for filename pattern
-                    youtube_title = data.get('title', '')
-                    if youtube_title:
-                        row['YouTube Title'] = youtube_title
-                        # Always recreate filename after getting YouTube title
-                        filename = self.create_filename_from_pattern(filename_pattern, row)
-                        self.root.after(0, lambda yt=youtube_title, fn=filename: self.log(f"[DEBUG] YouTube title fetched: {yt[:50]}"))
-                        self.root.after(0, lambda fn=filename: self.log(f"[DEBUG] Filename pattern result: {fn}"))
-                        
-                        # Fallback: If filename is just a number or very short, use YouTube title
-                        filename_clean = filename.strip().strip('_')
-                        if filename_clean.isdigit() or len(filename_clean) < 3:
-                            # Use YouTube title as filename (sanitized)
-                            safe_title = self.file_manager.create_safe_filename(youtube_title)
-                            if filename_clean.isdigit():
-                                # Keep the number as prefix if it was just a number
-                                filename = f"{filename_clean}_{safe_title}"
-                            else:
-                                filename = safe_title
-                            self.root.after(0, lambda fn=filename: self.log(f"[DEBUG] Using YouTube title as filename: {fn}"))
-                except json.JSONDecodeError:
-                    error_count += 1
-                    self.root.after(0, lambda idx=index+1: self.log(f"[ERROR] Video {idx}: Failed to parse stream data"))
-                    continue
-                
-                # Find all video streams sorted by quality priority: high -> medium -> low
-                format_ids = self._find_quality_sorted_streams(formats)
-                if not format_ids:
-                    skipped_count += 1
-                    self.root.after(0, lambda idx=index+1: self.log(f"[WARNING] Video {idx}: No video streams found, skipping"))
-                    continue
-                
-                # Rotate user agent periodically
-                if i > 0 and i % 5 == 0:
-                    self.user_agent = self.generate_user_agent()
-                    self.root.after(0, lambda: self.log(f"[DEBUG] Rotated user agent for stealth"))
-                
-                # Try each resolution in quality priority order: high -> medium -> low
-                output_path = os.path.join(self.get_download_path(), filename)
-                download_success = False
-                
-                for attempt_idx, format_id in enumerate(format_ids):
-                    if self.cancel_download:
-                        break
-                    
-                    # Get stream info for logging
-                    stream_info = next((f for f in formats if f.get('format_id') == format_id), None)
-                    resolution = stream_info.get('resolution', 'unknown') if stream_info else 'unknown'
-                    height = stream_info.get('height', 0) if stream_info else 0
-                    quality_category = self._categorize_quality(height)
-                    
-                    # Check if stream is video-only (needs audio merge)
-                    is_video_only = False
-                    if stream_info:
-                        is_video_only = stream_info.get('acodec', 'none') == 'none' and stream_info.get('vcodec', 'none') != 'none'
-                    
-                    # Use format_id+bestaudio for video-only streams to merge audio
-                    if is_video_only:
-                        download_format = f"{format_id}+bestaudio/best"
-                        format_note = f"{format_id}+bestaudio"
-                    else:
-                        download_format = format_id
-                        format_note = format_id
-                    
-                    if attempt_idx == 0:
-                        self.root.after(0, lambda res=resolution, fid=format_note, q=quality_category: self.log(f"[INFO] Trying {q} quality first: {res} (format {fid})"))
+                if returncode == 0:
+                    # Success! Stop trying other resolutions
+                    if client != self._current_client_type():
+                        filepath = self._log_downloaded(download_dir, filename, f"[SUCCESS] Downloaded with {client} client: {filename} (resolution: {resolution})", filepath)
                     else:
-                        self.root.after(0, lambda res=resolution, fid=format_note, att=attempt_idx+1, q=quality_category: self.log(f"[INFO] Previous failed, trying next quality ({att}/{len(format_ids)}): {q} - {res} (format {fid})"))
-                    
-                    # Try download with current format
-                    cmd = self.build_ytdlp_command([
-                        '-f', download_format,
-                        '-o', output_path + '.%(ext)s',
-                        url
-                    ])
-                    
-                    process = subprocess.Popen(
-                        cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True,
-                        creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-                    )
-                    
-                    self.current_process = process
-                    
-                    stdout, stderr = process.communicate()
-                    
-                    if self.cancel_download:
-                        try:
-                            process.terminate()
-                        except:
-                            pass
-                        self.root.after(0, lambda: self.log("[INFO] Auto-download cancelled by user"))
-                        break
-                    
-                    if process.returncode == 0:
-                        # Success! Stop trying other resolutions
-                        download_success = True
-                        success_count += 1
-                        
-                        # Find the actual downloaded file
-                        download_dir = self.get_download_path()
-                        actual_file = None
-                        if os.path.exists(download_dir):
-                            files = [f for f in os.listdir(download_dir) if f.startswith(filename)]
-                            if files:
-                                files_with_path = [os.path.join(download_dir, f) for f in files]
-                                actual_file = max(files_with_path, key=os.path.getmtime)
-                        
-                        if actual_file:
-                            actual_filename = os.path.basename(actual_file)
-                            self.root.after(
-                                0,
-                                lambda out=filename, res=resolution, af=actual_filename, fp=actual_file: self.log(f"[SUCCESS] Downloaded: {out} (resolution: {res})")
-                            )
-                            self.root.after(
-                                0,
-                                lambda af=actual_filename, fp=actual_file: self.log(f"[DEBUG] Exported filename: {af}")
-                            )
-                            self.root.after(
-                                0,
-                                lambda fp=actual_file: self.log(f"[DEBUG] Full path: {fp}")
-                            )
-                        else:
-                            self.root.after(
-                                0,
-                                lambda out=filename, res=resolution: self.log(f"[SUCCESS] Downloaded: {out} (resolution: {res})")
-                            )
-                            self.root.after(
-                                0,
-                                lambda out=filename: self.log(f"[DEBUG] Expected filename pattern: {out}")
-                            )
-                        break
-                    else:
-                        error_msg = stderr[:200] if stderr else "Unknown error"
-                        
-                        # Try with alternative clients as fallback if 403
-                        if '403' in error_msg or 'Forbidden' in error_msg:
-                            self.root.after(0, lambda: self.log(f"[WARNING] 403 detected, trying iOS client fallback..."))
-                            original_client = self.client_type_var.get() if hasattr(self, 'client_type_var') else 'web'
-                            
-                            # Try iOS, Android, TV clients in order
-                            fallback_clients = ['ios', 'android', 'tv']
-                            fallback_success = False
-                            
-                            for fallback_client in fallback_clients:
-                                if fallback_client == original_client:
-                                    continue
-                                
-                                if hasattr(self, 'client_type_var'):
-                                    self.client_type_var.set(fallback_client)
-                                
-                                cmd_fallback = self.build_ytdlp_command([
-                                    '-f', download_format,
-                                    '-o', output_path + '.%(ext)s',
-                                    url
-                                ])
-                                process_fallback = subprocess.run(
-                                    cmd_fallback,
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE,
-                                    text=True,
-                                    creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-                                )
-                                
-                                if process_fallback.returncode == 0:
-                                    # Success with fallback client!
-                                    fallback_success = True
-                                    download_success = True
-                                    success_count += 1
-                                    
-                                    # Find the actual downloaded file
-                                    download_dir = self.get_download_path()
-                                    actual_file = None
-                                    if os.path.exists(download_dir):
-                                        files = [f for f in os.listdir(download_dir) if f.startswith(filename)]
-                                        if files:
-                                            files_with_path = [os.path.join(download_dir, f) for f in files]
-                                            actual_file = max(files_with_path, key=os.path.getmtime)
-                                    
-                                    if actual_file:
-                                        actual_filename = os.path.basename(actual_file)
-                                        self.root.after(0, lambda fname=filename, res=resolution, cl=fallback_client, af=actual_filename, fp=actual_file: self.log(f"[SUCCESS] Downloaded with {cl} client: {fname} (resolution: {res})"))
-                                        self.root.after(0, lambda af=actual_filename: self.log(f"[DEBUG] Exported filename: {af}"))
-                                        self.root.after(0, lambda fp=actual_file: self.log(f"[DEBUG] Full path: {fp}"))
-                                    else:
-                                        self.root.after(0, lambda fname=filename, res=resolution, cl=fallback_client: self.log(f"[SUCCESS] Downloaded with {cl} client: {fname} (resolution: {res})"))
-                                        self.root.after(0, lambda fname=filename: self.log(f"[DEBUG] Expected filename pattern: {fname}"))
-                                    break
-                            
-                            # Restore original client
-                            if hasattr(self, 'client_type_var'):
-                                self.client_type_var.set(original_client)
-                            
-                            if not fallback_success:
-                                # All fallback clients failed, continue to next resolution
-                                self.root.after(0, lambda err=error_msg, res=resolution: self.log(f"[WARNING] Resolution {res} failed: {err[:100]}"))
-                        elif 'Sign in to confirm your age' in error_msg or 'inappropriate for some users' in error_msg:
-                            # Age-restricted video - suggest cookies
-                            self.root.after(0, lambda res=resolution: self.log(f"[WARNING] Resolution {res} failed: Age-restricted video. Configure cookies in Settings tab to download."))
-                        else:
-                            # Non-403 error, continue to next resolution
-                            self.root.after(0, lambda err=error_msg, res=resolution: self.log(f"[WARNING] Resolution {res} failed: {err[:100]}"))
-                
-                # If all quality options failed, mark as error
-                if not download_success and not self.cancel_download:
-                    error_count += 1
-                    self.root.after(0, lambda idx=index+1, total=len(format_ids): self.log(f"[ERROR] Video {idx}: All {total} quality options failed (tried high -> medium -> low), skipping"))
+                        filepath = self._log_downloaded(download_dir, filename, f"[SUCCESS] Downloaded: {filename} (resolution: {resolution})", filepath)
+                    self._record_download(download_dir, url, filepath, download_format)
+                    return 'success'
                 
-                # Add delay between downloads
-                if i < len(video_indices) - 1:
-                    delay = self.delay_var.get() if hasattr(self, 'delay_var') else self.download_delay
-                    if delay > 0:
-                        actual_delay = delay * random.uniform(0.8, 1.2)
-                        time.sleep(actual_delay)
+                error_msg = stderr if stderr else "Unknown error"
                 
-            except Exception as e:
-                if not self.cancel_download:
-                    error_count += 1
-                    error_msg = str(e)
-                    self.root.after(
-                        0,
-                        lambda msg=error_msg: self.log(f"[ERROR] Exception: {msg}")
-                    )
-            finally:
-                self.current_process = None
+                if 'Sign in to confirm your age' in error_msg or 'inappropriate for some users' in error_msg:
+                    # Age-restricted video - suggest cookies
+                    self.root.after(0, lambda res=resolution: self.log(f"[WARNING] Resolution {res} failed: Age-restricted video. Configure cookies in Settings tab to download."))
+                else:
+                    # Other errors (including 403 on every client), continue to next resolution
+                    self.root.after(0, lambda err=error_msg, res=resolution: self.log(f"[WARNING] Resolution {res} failed: {last_error_line(err)[:100]}"))
+            
+            # All quality options failed, mark as error; the cached format list may be stale
+            self.metadata_cache.invalidate(media_key(url))
+            self.root.after(0, lambda idx=index+1, n=len(format_ids): self.log(f"[ERROR] Video {idx}: All {n} quality options failed (tried high -> medium -> low), skipping"))
+            return 'error'
+            
+        except Exception as e:
+            if self.cancel_download:
+                return None
+            error_msg = str(e)
+            self.root.after(
+                0,
+                lambda msg=error_msg: self.log(f"[ERROR] Exception: {msg}")
+            )
+            return 'error'
+    
+    def _log_fetch_error(self, index, error_msg):
+        """Log why the stream list of CSV row index could not be fetched"""
+        # Better error messages for common issues
+        if 'Sign in to confirm your age' in error_msg or 'inappropriate for some users' in error_msg:
+            error_msg_full = f"Age-restricted video. Use --cookies-from-browser or --cookies for authentication. See https://github.com/yt-dlp/yt-dlp/wiki/FAQ#how-do-i-pass-cookies-to-yt-dlp"
+            self.root.after(0, lambda err=error_msg_full, idx=index+1: self.log(f"[ERROR] Video {idx}: {err}"))
+        elif 'Video unavailable' in error_msg:
+            self.root.after(0, lambda err=error_msg, idx=index+1: self.log(f"[ERROR] Video {idx}: Video unavailable (may be deleted or private)"))
+        elif error_msg == "Failed to parse stream data":
+            self.root.after(0, lambda idx=index+1: self.log(f"[ERROR] Video {idx}: Failed to parse stream data"))
+        else:
+            self.root.after(0, lambda err=error_msg, idx=index+1: self.log(f"[ERROR] Video {idx}: Failed to fetch streams - {err}"))
+    
+    def _filename_with_youtube_title(self, filename_pattern, row, data, filename):
+        """Filename recreated once the YouTube title is known (stored as the 'YouTube Title' field)"""
+        youtube_title = data.get('title', '')
+        if not youtube_title:
+            return filename
+        
+        # Store YouTube title in row data for filename pattern
+        row['YouTube Title'] = youtube_title
+        # Always recreate filename after getting YouTube title
+        filename = self.create_filename_from_pattern(filename_pattern, row)
+        self.root.after(0, lambda yt=youtube_title, fn=filename: self.log(f"[DEBUG] YouTube title fetched: {yt[:50]}"))
+        self.root.after(0, lambda fn=filename: self.log(f"[DEBUG] Filename pattern result: {fn}"))
+        
+        # Fallback: If filename is just a number or very short, use YouTube title
+        filename_clean = filename.strip().strip('_')
+        if filename_clean.isdigit() or len(filename_clean) < 3:
+            # Use YouTube title as filename (sanitized)
+            safe_title = self.file_manager.create_safe_filename(youtube_title)
+            if filename_clean.isdigit():
+                # Keep the number as prefix if it was just a number
+                filename = f"{filename_clean}_{safe_title}"
+            else:
+                filename = safe_title
+            self.root.after(0, lambda fn=filename: self.log(f"[DEBUG] Using YouTube title as filename: {fn}"))
+        return filename
+    
+    def audio_download_selected(self):
+        """Download only the best audio stream of the selected videos"""
+        if self.is_busy:
+            messagebox.showwarning("Warning", "Please wait for current operation to complete")
+            return
+        
+        selection = self.video_listbox.curselection()
+        if not selection:
+            messagebox.showwarning("Warning", "Please select at least one video")
+            return
+        
+        self._start_audio_download(list(selection))
+    
+    def audio_download_all(self):
+        """Download only the best audio stream of all videos"""
+        if self.is_busy:
+            messagebox.showwarning("Warning", "Please wait for current operation to complete")
+            return
+        
+        if not self.csv_data:
+            messagebox.showwarning("Warning", "No CSV data loaded")
+            return
+        
+        self._start_audio_download(list(range(len(self.csv_data))))
+    
+    def _start_audio_download(self, video_indices):
+        target = self.audio_target_var.get()
+        if target != 'Original' and not self.check_ffmpeg():
+            self.offer_ffmpeg_install()
+            return
+        
+        self.cancel_download = False
+        self.current_process = None
+        
+        self.log(f"[INFO] Starting audio-only download of {len(video_indices)} videos (target: {target})")
+        
+        self.set_busy(True, f"Downloading audio of {len(video_indices)} videos ({target})...")
+        
+        thread = threading.Thread(target=self._audio_download_thread, args=(video_indices, target))
+        thread.daemon = True
+        thread.start()
+    
+    def _audio_download_thread(self, video_indices, target):
+        """Thread for audio-only batches: best audio-only format from the (cached) stream list, then -x to target"""
+        total = len(video_indices)
+        filename_pattern = self.filename_var.get()
+        download_dir = self.get_download_path()
+        key_suffix = f":audio-{target.lower()}"
+        jobs, archived_count = self._skip_archived_jobs(self._batch_jobs(video_indices), download_dir, key_suffix)
+        
+        self._begin_batch_progress("Downloading audio", len(jobs))
+        scheduler = self._create_download_scheduler()
+        results = scheduler.run(
+            jobs,
+            lambda job, fetched: self._run_batch_item(self._audio_download_item, job, fetched, total, filename_pattern, download_dir, target),
+            prefetch_fn=lambda job: self._fetch_video_info(job[2]) if job[2] else None,
+            host_fn=lambda job: url_host(job[2]),
+            after_job_fn=lambda _job: self._sleep_between_downloads(),
+        )
+        self.metadata_cache.flush()
+        self._end_batch_progress()
+        self._log_client_summary()
+        success_count = results.count('success')
+        error_count = results.count('error')
         
         if not self.cancel_download:
             self.root.after(
                 0,
-                lambda s=success_count, e=error_count, sk=skipped_count:
-                self.log(f"\n[COMPLETE] Auto-download finished: {s} succeeded, {e} failed, {sk} skipped")
+                lambda s=success_count, e=error_count, a=archived_count:
+                self.log(f"\n[COMPLETE] Audio download finished: {s} succeeded, {e} failed, {a} already downloaded")
             )
             
             self.root.after(
                 0,
-                lambda s=success_count, e=error_count, sk=skipped_count:
+                lambda s=success_count, e=error_count, a=archived_count:
                 messagebox.showinfo(
-                    "Auto-Download Complete",
-                    f"Auto-download finished!\n\nSuccessful: {s}\nFailed: {e}\nSkipped: {sk}"
+                    "Audio Download Complete",
+                    f"Audio download finished!\n\nSuccessful: {s}\nFailed: {e}\nAlready downloaded: {a}"
                 )
             )
         else:
+            self.root.after(0, lambda: self.log("[INFO] Audio download cancelled by user"))
             self.root.after(
                 0,
-                lambda s=success_count, e=error_count, sk=skipped_count:
-                self.log(f"\n[CANCELLED] Auto-download stopped: {s} succeeded, {e} failed, {sk} skipped")
+                lambda s=success_count, e=error_count:
+                self.log(f"\n[CANCELLED] Audio download stopped: {s} succeeded, {e} failed")
             )
         
         self.root.after(0, lambda: self.set_busy(False))
     
+    def _audio_download_item(self, job, fetched, total, filename_pattern, download_dir, target):
+        """Download the best audio-only stream of one CSV row and convert it to target.
+        
+        Returns:
+            'success', 'error', or None if cancelled
+        """
+        i, index, url = job
+        try:
+            row = self.csv_data[index]
+            if not url:
+                self.root.after(0, lambda idx=index+1: self.log(f"[ERROR] Video {idx}: Could not extract URL"))
+                return 'error'
+            
+            filename = self.create_filename_from_pattern(filename_pattern, row)
+            
+            self.root.after(
+                0,
+                lambda msg=f"\n[INFO] Processing ({i+1}/{total}): {row.get('Song Title', row.get('Movie Title', 'Unknown'))} - {row.get('Artist', 'Unknown')}":
+                self.log(msg)
+            )
+            
+            if self.cancel_download:
+                return None
+            if isinstance(fetched, Exception):
+                raise fetched
+            data, error_msg = fetched if fetched else (None, "Unknown error")
+            
+            if data is None:
+                self._log_fetch_error(index, error_msg)
+                return 'error'
+            
+            filename = self._filename_with_youtube_title(filename_pattern, row, data, filename)
+            
+            # No audio-only stream listed: let yt-dlp pick and extract the audio track
+            format_id = best_audio_format_id(data.get('formats', []))
+            download_format = format_id if format_id else 'bestaudio/best'
+            self.root.after(0, lambda fid=download_format: self.log(f"[INFO] Audio stream: format {fid} -> {target}"))
+            
+            # Rotate user agent periodically
+            if i > 0 and i % 5 == 0:
+                self.user_agent = self.generate_user_agent()
+                self.root.after(0, lambda: self.log(f"[DEBUG] Rotated user agent for stealth"))
+            
+            output_path = os.path.join(download_dir, filename)
+            base_args = ['-f', download_format] + audio_target_args(target) + [
+                '-o', output_path + '.%(ext)s',
+                url
+            ]
+            returncode, stderr, client, filepath = self._run_download(
+                base_args, log_fn=self.log,
+                line_fn=self._batch_line_handler(row.get('Song Title', row.get('Movie Title', filename)))
+            )
+            if self.cancel_download:
+                return None
+            
+            if returncode == 0:
+                if client != self._current_client_type():
+                    filepath = self._log_downloaded(download_dir, filename, f"[SUCCESS] Downloaded with {client} client: {filename} ({target})", filepath)
+                else:
+                    filepath = self._log_downloaded(download_dir, filename, f"[SUCCESS] Downloaded: {filename} ({target})", filepath)
+                self._record_download(download_dir, url, filepath, f"{download_format}->{target}", f":audio-{target.lower()}")
+                return 'success'
+            
+            error_msg = stderr if stderr else "Unknown error"
+            if 'Sign in to confirm your age' in error_msg or 'inappropriate for some users' in error_msg:
+                self.root.after(0, lambda: self.log(f"[ERROR] Age-restricted video. Configure cookies in Settings tab to download."))
+            else:
+                # The cached format list may be stale
+                self.metadata_cache.invalidate(media_key(url))
+                self.root.after(0, lambda err=error_msg: self.log(f"[ERROR] Download failed: {last_error_line(err)[:200]}"))
+            return 'error'
+            
+        except Exception as e:
+            if self.cancel_download:
+                return None
+            error_msg = str(e)
+            self.root.after(
+                0,
+                lambda msg=error_msg: self.log(f"[ERROR] Exception: {msg}")
+            )
+            return 'error'
+    
     # Direct Link Tab methods
     def fetch_direct_link_streams(self):
         if self.is_busy:
@@ -1799,58 +1920,47 @@ Note: Links in CSV can be in markdown format [URL](URL) or plain URLs.
     
     def _fetch_direct_link_streams_thread(self, url):
         try:
-            cmd = self.build_ytdlp_command(['-J', url])
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-            )
+            data = self._cached_video_info(url, self.direct_link_log)
+            if data is not None:
+                self._show_direct_link_streams(data)
+                return
             
-            if (result.returncode != 0 and 
-                ('403' in result.stderr or 'Forbidden' in result.stderr) and 
-                not self.use_android_client):
-                self.root.after(0, lambda: self.direct_link_log("[INFO] Web client blocked, trying Android client..."))
-                original_setting = self.use_android_client
-                self.use_android_client = True
-                cmd = self.build_ytdlp_command(['-J', url])
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-                )
-                self.use_android_client = original_setting
-                if result.returncode == 0:
-                    self.root.after(0, lambda: self.direct_link_log("[INFO] Consider enabling Android Client Mode in Settings to avoid 403 errors"))
+            returncode, stdout, stderr, client = self.run_ytdlp_with_fallback(['-J', url], log_fn=self.direct_link_log)
+            if returncode == 0 and client != self._current_client_type():
+                self.root.after(0, lambda c=client: self.direct_link_log(f"[INFO] Fetched with {c} client; consider selecting it in Settings to avoid 403 errors"))
             
-            if result.returncode != 0:
-                error_msg = result.stderr
+            if returncode != 0:
+                error_msg = last_error_line(stderr)
                 self.root.after(0, lambda msg=error_msg: self.direct_link_log(f"[ERROR] {msg}"))
                 self.root.after(0, lambda: self.set_direct_link_busy(False))
                 return
             
-            data = json.loads(result.stdout)
-            formats = data.get('formats', [])
-            
-            # Store video info
-            self.direct_link_video_info = {
-                'title': data.get('title', 'Unknown'),
-                'uploader': data.get('uploader', 'Unknown'),
-                'duration': data.get('duration', 0),
-                'view_count': data.get('view_count', 0),
-                'description': data.get('description', '')[:500]  # Limit description length
-            }
-            
-            self.direct_link_streams = formats
-            self.root.after(0, lambda: self.display_direct_link_streams(formats, data))
-            self.root.after(0, lambda: self.set_direct_link_busy(False))
+            data = json.loads(stdout)
+            self.metadata_cache.put(media_key(url), data)
+            self.metadata_cache.flush()
+            self._show_direct_link_streams(data)
             
         except Exception as e:
             error_msg = str(e)
             self.root.after(0, lambda msg=error_msg: self.direct_link_log(f"[ERROR] Fetching streams: {msg}"))
             self.root.after(0, lambda: self.set_direct_link_busy(False))
     
+    def _show_direct_link_streams(self, data):
+        formats = data.get('formats', [])
+        
+        # Store video info
+        self.direct_link_video_info = {
+            'title': data.get('title', 'Unknown'),
+            'uploader': data.get('uploader', 'Unknown'),
+            'duration': data.get('duration', 0),
+            'view_count': data.get('view_count', 0),
+            'description': data.get('description', '')[:500]  # Limit description length
+        }
+        
+        self.direct_link_streams = formats
+        self.root.after(0, lambda: self.display_direct_link_streams(formats, data))
+        self.root.after(0, lambda: self.set_direct_link_busy(False))
+    
     def display_direct_link_streams(self, formats, video_data):
         self.direct_link_stream_tree.delete(*self.direct_link_stream_tree.get_children())
         self.direct_link_info_text.delete('1.0', tk.END)
@@ -1961,59 +2071,21 @@ Note: Links in CSV can be in markdown format [URL](URL) or plain URLs.
             # Use format_id+bestaudio to ensure audio is included for video-only streams
             download_format = f"{format_id}+bestaudio/best"
             
-            cmd = self.build_ytdlp_command([
-                '-f', download_format,
-                '-o', output_path + '.%(ext)s',
-                url
-            ])
-            
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+            returncode, _, _, filepath = self._run_download(
+                ['-f', download_format, '-o', output_path + '.%(ext)s', url],
+                log_fn=self.direct_link_log,
+                line_fn=self._progress_line_handler(self.direct_link_log, lambda: self.direct_link_progress_label),
             )
             
-            self.current_process = process
-            
-            for line in process.stdout:
-                if self.cancel_download:
-                    process.terminate()
-                    self.root.after(0, lambda: self.direct_link_log("[INFO] Download cancelled by user"))
-                    self.root.after(0, lambda: self.set_direct_link_busy(False))
-                    return
-                
-                line_text = line.strip()
-                if line_text:
-                    self.root.after(0, lambda l=line_text: self.direct_link_log(l))
-            
-            process.wait()
-            
             if self.cancel_download:
                 self.root.after(0, lambda: self.direct_link_log("[INFO] Download cancelled"))
                 self.root.after(0, lambda: self.set_direct_link_busy(False))
                 return
             
-            if process.returncode == 0:
-                # Find the actual downloaded file
+            if returncode == 0:
                 download_dir = self.file_manager.get_folder_path('downloads')
-                actual_file = None
-                if os.path.exists(download_dir):
-                    # Find most recently modified file matching the pattern
-                    files = [f for f in os.listdir(download_dir) if f.startswith(filename)]
-                    if files:
-                        files_with_path = [os.path.join(download_dir, f) for f in files]
-                        actual_file = max(files_with_path, key=os.path.getmtime)
-                
-                if actual_file:
-                    actual_filename = os.path.basename(actual_file)
-                    self.root.after(0, lambda: self.direct_link_log("[SUCCESS] Download completed successfully!"))
-                    self.root.after(0, lambda af=actual_filename: self.direct_link_log(f"[DEBUG] Exported filename: {af}"))
-                    self.root.after(0, lambda fp=actual_file: self.direct_link_log(f"[DEBUG] Full path: {fp}"))
-                else:
-                    self.root.after(0, lambda: self.direct_link_log("[SUCCESS] Download completed successfully!"))
-                    self.root.after(0, lambda fn=filename: self.direct_link_log(f"[DEBUG] Expected filename pattern: {fn}"))
+                actual_file = self._log_downloaded(download_dir, filename, "[SUCCESS] Download completed successfully!", filepath, log_fn=self.direct_link_log)
+                self._record_download(download_dir, url, actual_file, download_format)
                 self.root.after(0, lambda: messagebox.showinfo("Success", "Download completed!"))
                 self.root.after(0, lambda: self.set_direct_link_busy(False))
             else:
@@ -0,0 +1,367 @@
+"""
+YouTube Downloader - Headless Batch CLI
+
+Copyright 2025 Andre Lorbach
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Downloads every row of a YouTube Downloader CSV without Tk, e.g. for
+scheduled batch pulls on a server. Progress is written to stdout as JSON
+lines (one object per event).
+
+Usage:
+    python scripts/youtube_downloader_cli.py songs.csv --workers 3
+    python scripts/youtube_downloader_cli.py songs.csv --format 18 --output /data/songs
+    python scripts/youtube_downloader_cli.py songs.csv --audio FLAC
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+# Import shared libraries
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from lib.file_utils import FileManager
+from lib.ytdlp_utils import (
+    AUDIO_TARGETS, DEFAULT_MAX_WORKERS, DEFAULT_PER_HOST_LIMIT, METADATA_CACHE_FILE, PLAYER_CLIENTS,
+    DownloadArchive, DownloadScheduler, MetadataCache, YtDlpRunner,
+    audio_target_args, best_audio_format_id, extract_youtube_url, generate_user_agent,
+    is_video_only, info_video_id, last_error_line, load_csv_rows, media_key, parse_progress_line, quality_sorted_format_ids,
+    read_reported_filepath, stealth_args, transfer_args, url_host,
+)
+
+DEFAULT_FILENAME_PATTERN = "{Rank}_{Song Title}_{Artist}"
+PROGRESS_EVENT_INTERVAL_S = 1.0
+
+
+class HeadlessDownloader:
+    """Batch download of CSV rows with the same options as YouTubeDownloaderGUI"""
+
+    def __init__(self, options):
+        self.options = options
+        self.root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.file_manager = FileManager(self.root_dir)
+        self.user_agent = generate_user_agent()
+        self.runner = YtDlpRunner(
+            self.build_args,
+            use_engine=lambda: not options.subprocess,
+            is_cancelled=lambda: self.cancelled,
+            on_engine_fallback=lambda: self.emit('warning', message="In-process yt-dlp unavailable, using subprocess"),
+        )
+        self.client_selector = self.runner.client_selector
+        self.metadata_cache = MetadataCache(os.path.join(self.root_dir, METADATA_CACHE_FILE))
+        self.cancelled = False
+        self._out_lock = threading.Lock()
+
+        self.downloader = options.downloader
+        if self.downloader and self.downloader != 'none' and not shutil.which(self.downloader):
+            self.emit('warning', message=f"External downloader '{self.downloader}' not found on PATH, using built-in downloader")
+            self.downloader = None
+
+    def emit(self, event, **fields):
+        """Write one JSON progress event to stdout"""
+        record = {'event': event, 'time': round(time.time(), 3)}
+        record.update(fields)
+        with self._out_lock:
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + '\n')
+            sys.stdout.flush()
+
+    # yt-dlp invocation
+
+    def build_args(self, base_args, client_type):
+        args = stealth_args(self.user_agent, self.options.cookies, client_type, not self.options.no_stealth)
+        if '-J' not in base_args:
+            args.extend(transfer_args(self.options.fragments, not self.options.no_resume, self.downloader))
+        return args + base_args
+
+    def run_with_fallback(self, base_args, row_number, line_fn=None):
+        """Run yt-dlp, retrying 403 errors with other player clients (best known first)"""
+        return self.runner.run_with_fallback(
+            base_args,
+            self.options.client,
+            on_retry=lambda client: self.emit('retry', row=row_number, client=client, reason='403'),
+            line_fn=line_fn,
+        )
+
+    def terminate_all(self):
+        self.cancelled = True
+        self.runner.terminate_all()
+
+    # Batch
+
+    def fetch_info(self, job):
+        """-J metadata for a job (cached); returns (info or None, error message)"""
+        row_number, _, url = job
+        if not url or self.cancelled:
+            return None, "No URL"
+        data = self.metadata_cache.get(media_key(url))
+        if data is not None:
+            return data, ""
+        returncode, stdout, stderr, _ = self.run_with_fallback(['-J', url], row_number)
+        if returncode != 0:
+            return None, last_error_line(stderr)[:200]
+        try:
+            data = json.loads(stdout)
+        except json.JSONDecodeError:
+            return None, "Failed to parse stream data"
+        self.metadata_cache.put(media_key(url), data)
+        return data, ""
+
+    def row_filename(self, row, youtube_title=None):
+        """Filename from the pattern; falls back to the YouTube title like the GUI"""
+        if youtube_title:
+            row['YouTube Title'] = youtube_title
+        filename = self.file_manager.create_filename_from_pattern(self.options.pattern, row)
+        filename_clean = filename.strip().strip('_')
+        if youtube_title and (filename_clean.isdigit() or len(filename_clean) < 3):
+            safe_title = self.file_manager.create_safe_filename(youtube_title)
+            filename = f"{filename_clean}_{safe_title}" if filename_clean.isdigit() else safe_title
+        return filename
+
+    def _progress_fn(self, row_number):
+        last = [0.0]
+
+        def handle(line):
+            progress = parse_progress_line(line)
+            if progress is None:
+                return
+            now = time.monotonic()
+            if progress['percent'] < 100.0 and now - last[0] < PROGRESS_EVENT_INTERVAL_S:
+                return
+            last[0] = now
+            self.emit('progress', row=row_number, worker=threading.current_thread().name, **progress)
+        return handle
+
+    def archive_key(self, url, video_id=None):
+        """Video id (or normalized search query), with a suffix in audio mode so audio and video downloads are tracked separately"""
+        key = video_id or media_key(url)
+        if key and self.options.audio:
+            return f"{key}:audio-{self.options.audio.lower()}"
+        return key
+
+    def resolved_archive_key(self, url):
+        """Archive key of the video a search query resolved to (from the cached -J info), or None"""
+        video_id = info_video_id(self.metadata_cache.get(media_key(url)))
+        return self.archive_key(url, video_id) if video_id else None
+
+    def download(self, row_number, url, download_format, output_path):
+        """One download attempt with the output path reported by yt-dlp"""
+        fd, report_path = tempfile.mkstemp(prefix='ytdlp_', suffix='.txt')
+        os.close(fd)
+        started = time.monotonic()
+        extra_args = audio_target_args(self.options.audio) if self.options.audio else []
+        try:
+            returncode, _, stderr, client = self.run_with_fallback(
+                ['--print-to-file', 'after_move:filepath', report_path,
+                 '-f', download_format] + extra_args + ['-o', output_path + '.%(ext)s', url],
+                row_number,
+                line_fn=self._progress_fn(row_number),
+            )
+            filepath = read_reported_filepath(report_path) if returncode == 0 else None
+        finally:
+            try:
+                os.remove(report_path)
+            except OSError:
+                pass
+        return returncode, stderr, client, filepath, time.monotonic() - started
+
+    def download_row(self, job, meta):
+        """Download one row; returns 'success', 'error', 'skipped' or None if cancelled"""
+        row_number, row, url = job
+        try:
+            if not url:
+                self.emit('error', row=row_number, message="Could not extract URL")
+                return 'error'
+
+            if self.options.audio:
+                if isinstance(meta, Exception):
+                    raise meta
+                data, error_msg = meta if meta else (None, "Unknown error")
+                if data is None:
+                    self.emit('error', row=row_number, url=url, message=error_msg)
+                    return 'error'
+                filename = self.row_filename(row, data.get('title', ''))
+                # Best audio-only stream; yt-dlp extracts the audio track if none is listed
+                attempts = [best_audio_format_id(data.get('formats', [])) or 'bestaudio/best']
+            elif self.options.format == 'auto':
+                if isinstance(meta, Exception):
+                    raise meta
+                data, error_msg = meta if meta else (None, "Unknown error")
+                if data is None:
+                    self.emit('error', row=row_number, url=url, message=error_msg)
+                    return 'error'
+                formats = data.get('formats', [])
+                filename = self.row_filename(row, data.get('title', ''))
+                attempts = []
+                for format_id in quality_sorted_format_ids(formats):
+                    stream_info = next((f for f in formats if f.get('format_id') == format_id), None)
+                    attempts.append(f"{format_id}+bestaudio/best" if is_video_only(stream_info) else format_id)
+                if not attempts:
+                    self.emit('skipped', row=row_number, url=url, reason="No video streams found")
+                    return 'skipped'
+            else:
+                filename = self.row_filename(row)
+                attempts = [f"{self.options.format}+bestaudio/best"]
+
+            output_path = os.path.join(self.output_dir, filename)
+            self.emit('start', row=row_number, url=url, filename=filename)
+
+            error_msg = "Unknown error"
+            for download_format in attempts:
+                if self.cancelled:
+                    return None
+                returncode, stderr, client, filepath, elapsed = self.download(row_number, url, download_format, output_path)
+                if self.cancelled:
+                    return None
+                if returncode == 0:
+                    entry = self.archive.record(
+                        self.archive_key(url), filepath, download_format,
+                        resolved_key=self.resolved_archive_key(url),
+                    ) if filepath else None
+                    size = entry['size'] if entry else None
+                    self.emit(
+                        'done', row=row_number, url=url, path=filepath, format=download_format,
+                        client=client, bytes=size, seconds=round(elapsed, 2),
+                        speed=round(size / elapsed) if size and elapsed > 0 else None,
+                    )
+                    return 'success'
+                error_msg = last_error_line(stderr)[:300]
+                self.emit('attempt_failed', row=row_number, format=download_format, message=error_msg)
+
+            if self.options.format == 'auto' or self.options.audio:
+                # The cached format list may be stale
+                self.metadata_cache.invalidate(media_key(url))
+            self.emit('error', row=row_number, url=url, message=error_msg)
+            return 'error'
+        except Exception as e:
+            if self.cancelled:
+                return None
+            self.emit('error', row=row_number, url=url, message=str(e))
+            return 'error'
+
+    def _delay(self, _job):
+        if self.options.delay <= 0:
+            return
+        deadline = time.monotonic() + self.options.delay * random.uniform(0.8, 1.2)
+        while not self.cancelled and time.monotonic() < deadline:
+            time.sleep(min(0.2, max(0.0, deadline - time.monotonic())))
+
+    def run(self, rows, csv_path):
+        """Download all rows; returns the process exit code"""
+        csv_basename = os.path.splitext(os.path.basename(csv_path))[0]
+        self.output_dir = self.options.output or os.path.join(self.file_manager.get_folder_path('downloads'), csv_basename)
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.archive = DownloadArchive(self.output_dir)
+
+        jobs = []
+        already = 0
+        for index, row in enumerate(rows):
+            url = extract_youtube_url(row.get('Video Link', ''))
+            entry = self.archive.completed(self.archive_key(url)) if url and not self.options.no_archive else None
+            if entry is not None:
+                already += 1
+                self.emit('skipped', row=index + 1, url=url, reason="Already downloaded", path=entry['path'])
+                continue
+            jobs.append((index + 1, row, url))
+
+        self.emit('batch_start', csv=csv_path, rows=len(rows), pending=len(jobs), output=self.output_dir)
+        started = time.monotonic()
+        scheduler = DownloadScheduler(
+            max_workers=self.options.workers,
+            per_host_limit=self.options.per_host,
+            is_cancelled=lambda: self.cancelled,
+        )
+        results = scheduler.run(
+            jobs,
+            self.download_row,
+            prefetch_fn=self.fetch_info if self.options.format == 'auto' or self.options.audio else None,
+            host_fn=lambda job: url_host(job[2]),
+            after_job_fn=self._delay,
+        )
+        self.metadata_cache.flush()
+
+        failed = results.count('error')
+        self.emit(
+            'summary',
+            succeeded=results.count('success'),
+            failed=failed,
+            skipped=results.count('skipped'),
+            already_downloaded=already,
+            cancelled=self.cancelled,
+            seconds=round(time.monotonic() - started, 2),
+            clients=self.client_selector.summary(),
+        )
+        return 1 if failed else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Download all videos listed in a YouTube Downloader CSV without the GUI. "
+                    "Progress is printed as JSON lines."
+    )
+    parser.add_argument('csv', help="CSV file with a 'Video Link' column")
+    parser.add_argument('-o', '--output', help="Output folder (default: downloads/<csv name>)")
+    parser.add_argument('-p', '--pattern', default=DEFAULT_FILENAME_PATTERN,
+                        help=f"Filename pattern using CSV columns (default: {DEFAULT_FILENAME_PATTERN})")
+    parser.add_argument('-f', '--format', default='auto',
+                        help="yt-dlp format id, or 'auto' to try qualities high -> medium -> low (default: auto)")
+    parser.add_argument('-a', '--audio', choices=AUDIO_TARGETS,
+                        help="Download only the best audio stream and convert it to this format "
+                             "('Original' keeps the codec); overrides --format")
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f"Parallel downloads (default: {DEFAULT_MAX_WORKERS})")
+    parser.add_argument('--per-host', type=int, default=DEFAULT_PER_HOST_LIMIT,
+                        help=f"Max parallel downloads per host (default: {DEFAULT_PER_HOST_LIMIT})")
+    parser.add_argument('--fragments', type=int, default=4, help="Concurrent fragments per download (default: 4)")
+    parser.add_argument('--no-resume', action='store_true', help="Restart partial downloads instead of resuming")
+    parser.add_argument('--downloader', choices=['none', 'aria2c', 'curl', 'wget', 'ffmpeg'], default='none',
+                        help="External downloader (default: none)")
+    parser.add_argument('--client', choices=PLAYER_CLIENTS, default='web', help="Preferred player client (default: web)")
+    parser.add_argument('--cookies', help="Cookies file (Netscape format)")
+    parser.add_argument('--no-stealth', action='store_true', help="Disable stealth headers")
+    parser.add_argument('--delay', type=float, default=2.0, help="Delay between downloads per worker in seconds (default: 2.0)")
+    parser.add_argument('--no-archive', action='store_true', help="Download rows even if they are in the download archive")
+    parser.add_argument('--subprocess', action='store_true', help="Run yt-dlp as a subprocess instead of in-process")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    downloader = HeadlessDownloader(options)
+
+    try:
+        try:
+            rows = load_csv_rows(options.csv)
+        except UnicodeDecodeError:
+            # Same fallback as the GUI
+            rows = load_csv_rows(options.csv, encoding='latin-1')
+    except (OSError, ValueError) as e:
+        downloader.emit('error', message=str(e))
+        return 2
+
+    try:
+        return downloader.run(rows, options.csv)
+    except KeyboardInterrupt:
+        downloader.terminate_all()
+        downloader.emit('summary', cancelled=True)
+        return 130
+
+
+if __name__ == '__main__':
+    sys.exit(main())
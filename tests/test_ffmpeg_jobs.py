@@ -0,0 +1,38 @@
+"""Regression checks for lib.ffmpeg_jobs (stdlib only; run with pytest)."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from lib.ffmpeg_jobs import create_job_executor, run_modification_jobs  # noqa: E402
+
+
+def _job(name, code):
+    return {'input': name, 'output': name + '.out', 'cmd': [sys.executable, '-c', code]}
+
+
+def test_run_modification_jobs_logs_in_queue_order():
+    jobs = [
+        _job('slow.mp3', 'import time; time.sleep(0.3)'),
+        _job('fails.mp3', 'import sys; sys.exit("bad input")'),
+        _job('fast.mp3', 'pass'),
+    ]
+    messages = []
+    progress = []
+
+    counts = run_modification_jobs(
+        create_job_executor(3), jobs, incremental=False,
+        log=messages.append, on_progress=lambda f, t, rate: progress.append((f, t)),
+    )
+
+    assert counts == {'succeeded': 2, 'failed': 1, 'cancelled': 0, 'skipped': 0}
+    results = [m for m in messages if m.startswith(('[SUCCESS]', '[ERROR]'))]
+    assert [m.split()[1] for m in results] == ['(1/3)', '(2/3)', '(3/3)']
+    assert 'bad input' in results[1]
+    assert progress[0] == (0, 3) and progress[-1] == (3, 3)
+    assert messages[-1].startswith('\n[COMPLETE]')
+
+
+def test_create_job_executor_falls_back_on_invalid_input():
+    assert create_job_executor('abc').max_workers >= 1
+    assert create_job_executor('0').max_workers == 1
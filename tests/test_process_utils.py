@@ -0,0 +1,25 @@
+"""Regression checks for lib.process_utils (stdlib only; run with pytest)."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from lib.ffmpeg_jobs import AUDIO_TARGET_CODEC_ARGS  # noqa: E402
+from lib.process_utils import ProcessManager  # noqa: E402
+
+
+def test_codec_args_precede_output():
+    cmd = ProcessManager().build_ffmpeg_command(
+        'ffmpeg', 'in.webm', 'out.flac', audio_filters=['atempo=1.1'],
+        codec_args=AUDIO_TARGET_CODEC_ARGS['FLAC'],
+    )
+
+    assert cmd[-2:] == ['-y', 'out.flac']
+    assert cmd[-6:-2] == ['-acodec', 'flac', '-compression_level', '5']
+
+
+def test_no_codec_args_keeps_command():
+    cmd = ProcessManager().build_ffmpeg_command('ffmpeg', 'in.mp3', 'out.mp3')
+
+    assert '-acodec' not in cmd
+    assert cmd[-2:] == ['-y', 'out.mp3']
@@ -0,0 +1,16 @@
+"""Regression checks for lib.video_utils (stdlib only; run with pytest)."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from lib.video_utils import STILL_IMAGE_FPS, TRANSITION_FPS, transition_input_filter  # noqa: E402
+
+
+def test_transition_inputs_leave_the_still_image_rate():
+    # Still-image videos are 1 fps; xfade inputs must share a usable rate
+    chain = transition_input_filter(1280, 720)
+
+    assert chain.endswith(f",fps={TRANSITION_FPS}")
+    assert TRANSITION_FPS > STILL_IMAGE_FPS
+    assert chain.startswith("scale=1280:720:")
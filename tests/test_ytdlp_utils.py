@@ -0,0 +1,55 @@
+"""Regression checks for lib.ytdlp_utils (stdlib only; run with pytest)."""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from lib.ytdlp_utils import (  # noqa: E402
+    MetadataCache, error_output, is_forbidden_error, last_error_line, stealth_args,
+)
+
+
+def test_metadata_cache_alias_with_expired_entry(tmp_path):
+    cache = MetadataCache(str(tmp_path / 'cache.json'), ttl=1)
+    cache.put('aaaaaaaaaaa', {'id': 'aaaaaaaaaaa', 'title': 'old', 'formats': []})
+    # Age the first entry past the TTL so put() purges it
+    cache._entries['aaaaaaaaaaa']['fetched_at'] = time.time() - 10
+
+    cache.put('query:some song', {'id': 'bbbbbbbbbbb', 'title': 'new', 'formats': []})
+
+    assert cache.get('query:some song')['title'] == 'new'
+    assert cache.get('bbbbbbbbbbb')['title'] == 'new'
+    assert 'aaaaaaaaaaa' not in cache._entries
+
+
+def _extractor_args(args):
+    return [args[i + 1] for i, arg in enumerate(args) if arg == '--extractor-args']
+
+
+def test_stealth_args_keep_player_client():
+    for client in ('android', 'ios', 'tv'):
+        args = stealth_args('UA', client_type=client, stealth_mode=True)
+        # yt-dlp keeps only the last --extractor-args per extractor
+        assert _extractor_args(args) == [f'youtube:player_client={client};include_live_chat=false']
+    assert _extractor_args(stealth_args('UA', client_type='web')) == ['youtube:include_live_chat=false']
+
+
+def test_stealth_args_parsed_by_ytdlp():
+    yt_dlp = pytest.importorskip('yt_dlp')
+    opts = yt_dlp.parse_options(stealth_args('UA', client_type='ios') + ['https://youtu.be/xxxxxxxxxxx'])
+    youtube = opts.ydl_opts['extractor_args']['youtube']
+    assert youtube['player_client'] == ['ios']
+    assert youtube['include_live_chat'] == ['false']
+
+
+def test_forbidden_detection_ignores_progress_output():
+    lines = ['[download]  12.0% of 403.21MiB at 2.00MiB/s ETA 03:10', 'ERROR: Unable to download: Read timed out']
+    stderr = error_output(lines, 1)
+    assert stderr == 'ERROR: Unable to download: Read timed out'
+    assert not is_forbidden_error(stderr)
+    assert not is_forbidden_error(lines[0])
+    assert is_forbidden_error(error_output(lines + ['ERROR: unable to download video data: HTTP Error 403: Forbidden'], 1))
+    assert last_error_line('ERROR: first\nERROR: last\n') == 'ERROR: last'